@@ -0,0 +1,128 @@
+"""
+Rendering the full /kaypoh report of a 500-member roster in which one member changes between renders.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/attendance_render.py
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+from unittest.mock import AsyncMock
+
+from command_handlers.conversations.get_team_attendance_conversation import GetTeamAttendanceConversation
+from custom_components.PaginatedText import PaginatedText
+from models.enums import AccessCategory
+from models.models import Event
+from models.records import RosterRecord
+from models.responses.responses import AttendanceResponse, UserAttendance, UserAttendanceResponse
+
+MEMBERS = 500
+RENDERS = 100
+PASSES = 5
+REASONS = [None, "Late 2pm", "Work", "Injured, will watch", "Coming after class"]
+
+
+class UncachedConversation(GetTeamAttendanceConversation):
+    # how roster lines were rendered before the render cache: every line formatted again
+    def _render_user_lines(self, users, include_reason, unindicated=False) -> Iterator[str]:
+        if not users:
+            yield "-"
+            return
+        for user in users:
+            yield self._format_user_line(user, include_reason=include_reason, unindicated=unindicated)
+
+
+def make_members(rng: random.Random) -> List[UserAttendance]:
+    return [
+        UserAttendance(
+            name=f"Member {index:03d}",
+            telegram_user=f"member{index:03d}",
+            gender=rng.choice("MF"),
+            access=AccessCategory.GUEST if index % 25 == 0 else AccessCategory.MEMBER,
+            attendance=AttendanceResponse(status=rng.choice([True, False, None]), reason=rng.choice(REASONS)),
+        )
+        for index in range(MEMBERS)
+    ]
+
+
+def group(members: List[UserAttendance]) -> RosterRecord:
+    return RosterRecord.from_model(UserAttendanceResponse(
+        male=[member for member in members if member.attendance.status and member.gender == "M"],
+        female=[member for member in members if member.attendance.status and member.gender == "F"],
+        absent=[member for member in members if member.attendance.status is False],
+        unindicated=[member for member in members if member.attendance.status is None],
+    ))
+
+
+def snapshots(rng: random.Random) -> List[RosterRecord]:
+    """Attendance as returned by the controller for consecutive renders, one member changing each time."""
+    members = make_members(rng)
+    results = []
+    for _ in range(RENDERS):
+        index = rng.randrange(MEMBERS)
+        changed = members[index].model_copy(deep=True)
+        changed.attendance = AttendanceResponse(status=rng.choice([True, False, None]), reason=rng.choice(REASONS))
+        members[index] = changed
+        # every render gets freshly parsed models, as from the backend
+        results.append(group([member.model_copy(deep=True) for member in members]))
+    return results
+
+
+def render_lines(conversation: GetTeamAttendanceConversation, event: Event,
+                 attendance: RosterRecord) -> List[str]:
+    sections = conversation._report_sections(event, attendance, "11-Oct 2:58PM")
+    return [line for section in sections for line in section]
+
+
+def render_all_pages(conversation: GetTeamAttendanceConversation, event: Event,
+                     attendance: RosterRecord) -> List[str]:
+    sections = conversation._report_sections(event, attendance, "11-Oct 2:58PM")
+    return [page.text for page in PaginatedText.pages(sections)]
+
+
+def time_renders(render, conversation: GetTeamAttendanceConversation, event: Event,
+                 attendances: List[RosterRecord]) -> Tuple[float, List[List[str]]]:
+    """Seconds per render over ``attendances``, after rendering the first one to warm up."""
+    render(conversation, event, attendances[0])
+    started = time.perf_counter()
+    output = [render(conversation, event, attendance) for attendance in attendances[1:]]
+    return (time.perf_counter() - started) / (len(attendances) - 1), output
+
+
+def main() -> None:
+    start = datetime.now() + timedelta(days=1)
+    event = Event(
+        id=1,
+        title="Field Training",
+        start=start,
+        end=start + timedelta(hours=2),
+        is_accountable=True,
+        access_category=AccessCategory.MEMBER,
+    )
+
+    print(f"{MEMBERS} members, one change per render")
+    hits = misses = 0
+    for label, render in [("roster lines", render_lines), ("paginated report", render_all_pages)]:
+        before = after = float("inf")
+        # best of five passes, each over its own changes and starting from an empty cache
+        for seed in range(PASSES):
+            attendances = snapshots(random.Random(seed))
+            uncached = UncachedConversation(controller=AsyncMock())
+            cached = GetTeamAttendanceConversation(controller=AsyncMock())
+
+            uncached_seconds, expected = time_renders(render, uncached, event, attendances)
+            cached_seconds, output = time_renders(render, cached, event, attendances)
+            assert output == expected
+            before, after = min(before, uncached_seconds), min(after, cached_seconds)
+            hits, misses = hits + cached.render_cache.hits, misses + cached.render_cache.misses
+
+        print(f"{label:<18} uncached {before * 1e6:8.1f} us   cached {after * 1e6:8.1f} us   "
+              f"speed-up {before / after:.1f}x")
+
+    print(f"render cache: {hits / (hits + misses):.1%} of lookups hit")
+
+
+if __name__ == "__main__":
+    main()
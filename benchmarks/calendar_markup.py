@@ -0,0 +1,54 @@
+"""
+Cost of one step through the event date picker, as `select_date` handles a month navigation tap.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/calendar_markup.py
+"""
+import timeit
+from datetime import date
+
+from custom_components.CalendarKeyboardMarkup import CalendarKeyboardMarkup
+
+START = date(2025, 10, 11)
+STEPS = 12
+NUMBER = 200
+
+
+def walk_uncached() -> None:
+    # what every tap did before markups were cached: the month rendered from scratch
+    year, month = START.year, START.month
+    for _ in range(STEPS):
+        CalendarKeyboardMarkup._build(year, month, START, None, ())
+        year, month = CalendarKeyboardMarkup._step_month(year, month, 1)
+
+
+def walk_cached() -> None:
+    # open the calendar, then step forward a year, prefetching around each month shown
+    year, month = START.year, START.month
+    for _ in range(STEPS):
+        CalendarKeyboardMarkup.build(year=year, month=month, start_date=START)
+        CalendarKeyboardMarkup.prefetch(year, month, start_date=START)
+        year, month = CalendarKeyboardMarkup._step_month(year, month, 1)
+
+
+def lookup() -> None:
+    CalendarKeyboardMarkup.build(year=2026, month=3, start_date=START)
+
+
+def main() -> None:
+    before = min(timeit.repeat(walk_uncached, number=NUMBER, repeat=3)) / (NUMBER * STEPS)
+    CalendarKeyboardMarkup.clear_cache()
+    walk_cached()
+    stats = CalendarKeyboardMarkup.cache_stats()
+    after = min(timeit.repeat(lookup, number=NUMBER * STEPS, repeat=3)) / (NUMBER * STEPS)
+
+    print(f"{'render month':<24} {before * 1e6:8.1f} us/step")
+    print(f"{'cached month':<24} {after * 1e6:8.1f} us/step")
+    print(f"first walk: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['prefetched']} prefetched ({stats['hit_rate']:.0%} hit rate)")
+    print(f"speed-up: {before / after:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
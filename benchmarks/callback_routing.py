@@ -0,0 +1,102 @@
+"""
+Finding the handler of a callback query in a conversation state: regex `CallbackQueryHandler`s tried
+in turn, as ConversationHandler does, against one `CallbackRouter`.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/callback_routing.py
+"""
+import timeit
+from typing import Dict, List
+
+from telegram import CallbackQuery, Chat, Message, Update, User
+from telegram.ext import CallbackQueryHandler
+
+from command_handlers.callback_router import CallbackRouter
+
+NUMBER = 20_000
+
+
+async def callback(update, context) -> None:
+    pass
+
+
+def callback_update(data: str) -> Update:
+    user = User(id=1, first_name="Aaron", is_bot=False)
+    message = Message(message_id=1, date=None, chat=Chat(id=1, type=Chat.PRIVATE))
+    return Update(update_id=1, callback_query=CallbackQuery("1", user, "instance", message=message, data=data))
+
+
+def first_match(handlers: List[CallbackQueryHandler], update: Update):
+    # how ConversationHandler picks the handler of the current state
+    for handler in handlers:
+        check = handler.check_update(update)
+        if check is not None and check is not False:
+            return handler
+    return None
+
+
+# the handlers and callback data of each state before the router, and the same state routed
+STATES: Dict[str, tuple] = {
+    "manage event menu": (
+        [
+            ("^set_title$", "set_title"),
+            ("^set_description$", "set_description"),
+            (r"^set_datetime_.+", "set_datetime_deadline"),
+            ("^set_accountability$", "set_accountability"),
+            ("^set_access$", "set_access"),
+            ("^confirm_changes$", "confirm_changes"),
+        ],
+        ["event:title", "event:description", "event:date:deadline", "event:accountable", "event:access",
+         "event:confirm"],
+    ),
+    "manage event date": (
+        [
+            ("^use_start_date$", "use_start_date"),
+            (r"^deadline_preset:.+$", "deadline_preset:1d"),
+            (r"^date:\d{4}-\d{2}-\d{2}$", "date:2024-05-01"),
+            (r"^step:\d{4}-\d{2}$", "step:2024-06"),
+        ],
+        ["event:use_start", "event:preset:1d", "cal:date:2024-05-01", "cal:step:2024-06"],
+    ),
+    "manage access users": (
+        [("^back:categories$", "back:categories"), (r"^user:\d+$", "user:1042")],
+        ["access:back:categories", "access:user:1042"],
+    ),
+}
+
+
+def report(label: str, regex_handlers: List[CallbackQueryHandler], regex_data: List[str],
+           router: CallbackRouter, routed_data: List[str]) -> None:
+    regex_updates = [callback_update(data) for data in regex_data]
+    routed_updates = [callback_update(data) for data in routed_data]
+    assert all(first_match(regex_handlers, update) is not None for update in regex_updates)
+    assert all(router.check_update(update) is not None for update in routed_updates)
+
+    def per_query(statement) -> float:
+        return min(timeit.repeat(statement, number=NUMBER, repeat=5)) / NUMBER / len(regex_updates)
+
+    before = per_query(lambda: [first_match(regex_handlers, update) for update in regex_updates])
+    after = per_query(lambda: [router.check_update(update) for update in routed_updates])
+    print(f"{label:<22} {len(regex_handlers):>3} routes   regex {before * 1e9:7.0f} ns   "
+          f"router {after * 1e9:5.0f} ns   speed-up {before / after:4.1f}x")
+
+
+def main() -> None:
+    print("average per callback query over every button of the state")
+    for label, (regex_routes, routed_data) in STATES.items():
+        handlers = [CallbackQueryHandler(callback, pattern=pattern) for pattern, _ in regex_routes]
+        router = CallbackRouter({CallbackRouter.parse(data)[0] + ":" + CallbackRouter.parse(data)[1]: callback
+                                 for data in routed_data})
+        report(label, handlers, [data for _, data in regex_routes], router, routed_data)
+
+    print("\nsynthetic states, regex cost grows with the routes while the router stays flat")
+    for size in (4, 16, 64):
+        handlers = [CallbackQueryHandler(callback, pattern=rf"^verb{index}:\d+$") for index in range(size)]
+        router = CallbackRouter({f"ns:verb{index}": callback for index in range(size)})
+        report(f"{size} buttons", handlers, [f"verb{index}:7" for index in range(size)],
+               router, [f"ns:verb{index}:7" for index in range(size)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Per-call cost of formatting a roster line, as `_format_user_line` does once per member.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/locale_format.py
+"""
+import timeit
+
+from localization import Key, TeamKey, store
+from localization.locale_store import LocalizedText
+
+NUMBER = 200_000
+
+
+def uncompiled_format(text: LocalizedText, **kwargs) -> LocalizedText:
+    # what LocalizedText.format did before templates were compiled: str.format, then a new LocalizedText
+    return LocalizedText(
+        str.format(text, **kwargs),
+        is_multiline=text.is_multiline,
+        key=text.key,
+        locale=text.locale,
+    )
+
+
+def uncached_lookup(key: str) -> LocalizedText:
+    # what every Key.<name> access did before resolved keys were cached on the accessor
+    if store.has_key(key):
+        return store.translate(key)
+    raise KeyError(key)
+
+
+def report(label: str, statement) -> float:
+    seconds = min(timeit.repeat(statement, number=NUMBER, repeat=5)) / NUMBER
+    print(f"{label:<44} {seconds * 1e9:8.1f} ns/call")
+    return seconds
+
+
+def main() -> None:
+    text = Key.team_attendance_user
+    name, reason = "Aaron Seah", " (Late 2pm, beach)"
+    assert text.format(name=name, reason=reason) == uncompiled_format(text, name=name, reason=reason)
+
+    before = report(
+        "str.format + LocalizedText, uncached lookup",
+        lambda: uncompiled_format(uncached_lookup("team_attendance_user"), name=name, reason=reason),
+    )
+    report("str.format only", lambda: str.format(text, name=name, reason=reason))
+    after = report(
+        "Key.team_attendance_user.format",
+        lambda: Key.team_attendance_user.format(name=name, reason=reason),
+    )
+    # Key follows the locale of the current update, TeamKey is bound to the default locale
+    report(
+        "TeamKey.team_attendance_user.format",
+        lambda: TeamKey.team_attendance_user.format(name=name, reason=reason),
+    )
+    print(f"speed-up: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Memory and speed of the slotted records against the pydantic models they stand for.
+
+Measures, for roster members and events:
+- memory held by 10,000 objects
+- construction: validating a model, building a record, and converting a model to its record
+- reading the fields a roster line or event list uses
+- handing out an event list from the cache: deep copies of models against models restored from records
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/model_records.py
+"""
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from models.enums import AccessCategory
+from models.models import Event
+from models.records import AttendanceResponseRecord, EventRecord, UserAttendanceRecord
+from models.responses.responses import AttendanceResponse, UserAttendance
+
+OBJECTS = 10_000
+# objects built or read per timing, the best of REPEATS timings is kept
+NUMBER = 2_000
+REPEATS = 5
+START = datetime(2025, 10, 11, 13, 30)
+
+
+def member_fields(index: int) -> Dict:
+    return dict(
+        name=f"Member {index:05d}",
+        telegram_user=f"member{index:05d}",
+        gender="MF"[index % 2],
+        access=AccessCategory.MEMBER,
+        attendance=dict(status=(True, False, None)[index % 3], reason="Late 2pm" if index % 4 == 0 else None),
+    )
+
+
+def event_fields(index: int) -> Dict:
+    start = START + timedelta(days=index)
+    return dict(
+        id=index,
+        title=f"Field Training {index}",
+        description="Bring both jerseys",
+        start=start,
+        end=start + timedelta(hours=2),
+        attendance_deadline=start - timedelta(days=1),
+        is_accountable=True,
+        access_category=AccessCategory.MEMBER,
+    )
+
+
+def build_member_model(fields: Dict) -> UserAttendance:
+    return UserAttendance(**fields)
+
+
+def build_member_record(fields: Dict) -> UserAttendanceRecord:
+    attendance = fields["attendance"]
+    return UserAttendanceRecord(
+        fields["name"],
+        fields["telegram_user"],
+        fields["gender"],
+        fields["access"],
+        AttendanceResponseRecord(attendance["status"], attendance["reason"]),
+    )
+
+
+def build_event_model(fields: Dict) -> Event:
+    return Event(**fields)
+
+
+def build_event_record(fields: Dict) -> EventRecord:
+    return EventRecord(**fields)
+
+
+def retained_bytes(build: Callable[[int], object]) -> int:
+    """Bytes still allocated after building ``OBJECTS`` objects and keeping them in a list."""
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(index) for index in range(OBJECTS)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def best_per_call(function: Callable[[object], object], arguments: List) -> float:
+    """Best seconds per call of ``function`` over ``arguments``."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for argument in arguments:
+            function(argument)
+        best = min(best, (time.perf_counter() - started) / len(arguments))
+    return best
+
+
+def read_member(member) -> tuple:
+    return member.name, member.telegram_user, member.access, member.attendance.status, member.attendance.reason
+
+
+def read_event(event) -> tuple:
+    return event.id, event.title, event.start, event.access_category
+
+
+def report(label: str, model: float, record: float, unit: str = "us") -> None:
+    scale = 1e6 if unit == "us" else 1
+    print(f"  {label:<26} model {model * scale:9.2f} {unit}   record {record * scale:9.2f} {unit}   "
+          f"{model / record:5.1f}x")
+
+
+def main() -> None:
+    member_inputs = [member_fields(index) for index in range(NUMBER)]
+    event_inputs = [event_fields(index) for index in range(NUMBER)]
+    member_models = [build_member_model(fields) for fields in member_inputs]
+    event_models = [build_event_model(fields) for fields in event_inputs]
+    member_records = [UserAttendanceRecord.from_model(model) for model in member_models]
+    event_records = [EventRecord.from_model(model) for model in event_models]
+
+    print(f"memory of {OBJECTS:,} objects")
+    for label, build_model, build_record in [
+        ("roster members", lambda index: build_member_model(member_fields(index)),
+         lambda index: build_member_record(member_fields(index))),
+        ("events", lambda index: build_event_model(event_fields(index)),
+         lambda index: build_event_record(event_fields(index))),
+    ]:
+        model, record = retained_bytes(build_model), retained_bytes(build_record)
+        print(f"  {label:<26} model {model / 1024:9.0f} KiB  record {record / 1024:9.0f} KiB  "
+              f"{model / record:5.1f}x")
+
+    print("construction, per object")
+    report("member, validated / built", best_per_call(build_member_model, member_inputs),
+           best_per_call(build_member_record, member_inputs))
+    report("event, validated / built", best_per_call(build_event_model, event_inputs),
+           best_per_call(build_event_record, event_inputs))
+    report("member, from_model", best_per_call(build_member_model, member_inputs),
+           best_per_call(UserAttendanceRecord.from_model, member_models))
+
+    print("attribute access, per object")
+    report("roster line fields", best_per_call(read_member, member_models),
+           best_per_call(read_member, member_records))
+    report("event list fields", best_per_call(read_event, event_models),
+           best_per_call(read_event, event_records))
+
+    print("cached event handed out, per event")
+    report("deep copy / to_model", best_per_call(lambda event: event.model_copy(deep=True), event_models),
+           best_per_call(EventRecord.to_model, event_records))
+
+
+if __name__ == "__main__":
+    main()
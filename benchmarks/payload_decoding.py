@@ -0,0 +1,94 @@
+"""
+Decoding a 1,000-member team attendance roster from the backend's JSON body.
+
+Compares validating member by member, as controllers did with parsed JSON, to
+validating the whole body with a TypeAdapter, built per call or cached, from parsed
+JSON or straight from bytes as `PayloadDecoder` does.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/payload_decoding.py
+"""
+import json
+import time
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from models.enums import AccessCategory
+from models.responses.responses import AttendanceResponse, UserAttendance, UserAttendanceResponse
+from services.payload_decoder import PayloadDecoder, type_adapter
+
+MEMBERS = 1_000
+NUMBER = 20
+REPEATS = 5
+REASONS = [None, "Late 2pm", "Work", "Injured, will watch"]
+
+
+def make_body() -> bytes:
+    members = [
+        UserAttendance(
+            name=f"Member {index:04d}",
+            telegram_user=f"member{index:04d}",
+            gender="MF"[index % 2],
+            access=AccessCategory.GUEST if index % 25 == 0 else AccessCategory.MEMBER,
+            attendance=AttendanceResponse(status=(True, False, None)[index % 3], reason=REASONS[index % 4]),
+        )
+        for index in range(MEMBERS)
+    ]
+    roster = UserAttendanceResponse(
+        male=[member for member in members if member.attendance.status and member.gender == "M"],
+        female=[member for member in members if member.attendance.status and member.gender == "F"],
+        absent=[member for member in members if member.attendance.status is False],
+        unindicated=[member for member in members if member.attendance.status is None],
+    )
+    return roster.model_dump_json().encode("utf-8")
+
+
+def one_at_a_time(body: bytes) -> UserAttendanceResponse:
+    payload = json.loads(body)
+    return UserAttendanceResponse(**{
+        group: [UserAttendance(**member) for member in members] for group, members in payload.items()
+    })
+
+
+def adapter_per_call(body: bytes) -> UserAttendanceResponse:
+    return TypeAdapter(UserAttendanceResponse).validate_python(json.loads(body))
+
+
+def cached_adapter_from_python(body: bytes) -> UserAttendanceResponse:
+    return type_adapter(UserAttendanceResponse).validate_python(json.loads(body))
+
+
+def best_per_call(decode: Callable[[bytes], UserAttendanceResponse], body: bytes) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for _ in range(NUMBER):
+            decode(body)
+        best = min(best, (time.perf_counter() - started) / NUMBER)
+    return best
+
+
+def main() -> None:
+    body = make_body()
+    expected = one_at_a_time(body)
+
+    cases = [
+        ("member by member", one_at_a_time),
+        ("TypeAdapter per call", adapter_per_call),
+        ("cached adapter, parsed json", cached_adapter_from_python),
+        ("cached adapter, from bytes", lambda data: PayloadDecoder().decode(data, UserAttendanceResponse)),
+    ]
+
+    print(f"{MEMBERS} members, {len(body) / 1024:.0f} KiB body")
+    baseline = None
+    for label, decode in cases:
+        assert decode(body) == expected
+        seconds = best_per_call(decode, body)
+        baseline = baseline or seconds
+        print(f"  {label:<30} {seconds * 1e3:7.2f} ms   {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
+import secrets
+from typing import Awaitable, Callable, List, Optional
+
 from telegram import BotCommand
-from telegram.ext import Application
+from telegram.ext import Application, BasePersistence, BaseRateLimiter
 import logging
 
+from bots.update_processor import PerUserUpdateProcessor
+from config.settings import settings
+
 logger = logging.getLogger(__name__)
 
 class BotCore:
@@ -14,29 +20,102 @@ class BotCore:
     3. Basic error handling
     """
     
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        concurrent_updates: int = 1,
+        rate_limiter: Optional[BaseRateLimiter] = None,
+        persistence: Optional[BasePersistence] = None,
+    ):
         """
         Initialize the bot core.
         
         Args:
             token: Telegram bot token
+            concurrent_updates: Users whose updates are processed at the same time, 1 processes
+                all updates one by one. A user's own updates are always processed in order.
+            rate_limiter: Scheduler every Bot API request goes through, None sends requests directly
+            persistence: Storage for conversation states and user data, None keeps them in memory only
         """
         logger.info("Initializing bot core...")
         builder = Application.builder().token(token)
-        builder.post_init(self._register_bot_commands)
+        if concurrent_updates > 1:
+            builder.concurrent_updates(PerUserUpdateProcessor(concurrent_updates))
+        if rate_limiter is not None:
+            builder.rate_limiter(rate_limiter)
+        if persistence is not None:
+            builder.persistence(persistence)
+        builder.post_init(self._post_init)
+        builder.post_shutdown(self._run_shutdown_callbacks)
+        self._startup_callbacks: List[Callable[[], Awaitable[None]]] = []
+        self._shutdown_callbacks: List[Callable[[], Awaitable[None]]] = []
         self.application = builder.build()
         logger.info("Bot core initialized")
     
     def run(self):
-        """Run the bot"""
-        logger.info("Starting bot...")
+        """Run the bot, receiving updates by long polling or webhook depending on `settings.bot_mode`"""
+        if settings.bot_mode == "webhook":
+            self.run_webhook()
+            return
+
+        logger.info("Starting bot with long polling...")
         self.application.run_polling()
 
+    def run_webhook(self):
+        """
+        Serve updates pushed by Telegram on a local webhook listener.
+
+        Requests without the matching `X-Telegram-Bot-Api-Secret-Token` header are rejected
+        by the listener. A random secret is generated when none is configured.
+        """
+        if not settings.webhook_url:
+            raise ValueError("WEBHOOK_URL must be set to run the bot in webhook mode")
+
+        secret_token = settings.webhook_secret_token or secrets.token_urlsafe(32)
+        url_path = settings.webhook_path.strip("/")
+        logger.info(f"Starting bot with webhook on {settings.webhook_listen}:{settings.webhook_port}/{url_path}...")
+        self.application.run_webhook(
+            listen=settings.webhook_listen,
+            port=settings.webhook_port,
+            url_path=url_path,
+            webhook_url=f"{settings.webhook_url.rstrip('/')}/{url_path}",
+            secret_token=secret_token,
+            max_connections=settings.webhook_max_connections,
+        )
+
     def stop(self):
         """Stop the bot"""
         logger.info("Stopping bot...")
         self.application.stop()
 
+    def add_startup_callback(self, callback: Callable[[], Awaitable[None]]):
+        """Register a coroutine to run once the application is initialised, e.g. starting background workers."""
+        self._startup_callbacks.append(callback)
+
+    def add_shutdown_callback(self, callback: Callable[[], Awaitable[None]]):
+        """
+        Register a coroutine to run once the application has shut down, e.g. closing connection pools.
+
+        Callbacks run in reverse registration order, so components registered later can
+        still use the ones they were built on while shutting down.
+        """
+        self._shutdown_callbacks.append(callback)
+
+    async def _post_init(self, application: Application):
+        await self._register_bot_commands(application)
+        for callback in self._startup_callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                logger.error(f"Error in startup callback: {str(e)}", exc_info=True)
+
+    async def _run_shutdown_callbacks(self, application: Application):
+        for callback in reversed(self._shutdown_callbacks):
+            try:
+                await callback()
+            except Exception as e:
+                logger.error(f"Error in shutdown callback: {str(e)}", exc_info=True)
+
     async def _register_bot_commands(self, application: Application):
         """Register bot commands once the application is ready."""
 
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import pickle
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from telegram import Update
+from telegram.ext import Application, ContextTypes, ConversationHandler, TypeHandler
+
+from command_handlers.conversations.conversation_flow import ConversationFlow
+
+logger = logging.getLogger(__name__)
+
+
+class _ConversationStates:
+    """
+    The open conversations of a ``ConversationHandler``, which PTB keeps private.
+
+    PTB has no public way to list open conversations or to end one outside of an
+    update, so this reads ``handler._conversations`` and calls ``handler._update_state``.
+    Both were checked against python-telegram-bot 22.5, the version the bot pins;
+    the check below makes a release that renames them fail at start-up instead of
+    during a sweep.
+    """
+
+    def __init__(self, handler: ConversationHandler):
+        for attribute in ("_conversations", "_update_state"):
+            if not hasattr(handler, attribute):
+                raise RuntimeError(
+                    f"ConversationHandler.{attribute} is missing, the conversation sweeper "
+                    f"supports python-telegram-bot 22.5"
+                )
+        self.handler = handler
+
+    def open_keys(self) -> List[Tuple]:
+        return list(self.handler._conversations)
+
+    def end(self, key: Tuple) -> None:
+        self.handler._update_state(ConversationHandler.END, key)
+
+
+class ConversationSweeper:
+    """
+    Ends idle conversations and evicts the ``user_data`` they leave behind.
+
+    The activity handler, registered in a group ahead of the conversations, records
+    when each user was last seen. Every ``interval`` seconds the sweeper ends the
+    conversations of users who have been idle for longer than that conversation's
+    ``timeout`` and removes the conversation's ``user_data_keys``, both for the ended
+    conversations and for ones that finished earlier without cleaning up. Keys still
+    used by another of the user's open conversations are kept.
+
+    The reclaimed memory is reported as the pickled size of the evicted values, the
+    same bytes the persistence would have kept storing.
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        interval: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            application: Application whose conversations and user data are swept
+            interval: Seconds between two sweeps
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.application = application
+        self.interval = interval
+        self._clock = clock
+        self._conversations: List[Tuple[ConversationFlow, _ConversationStates]] = []
+        self._last_seen: Dict[int, float] = {}
+        self._started = clock()
+        self._task: Optional[asyncio.Task] = None
+        self.sweeps = 0
+        self.conversations_ended = 0
+        self.keys_evicted = 0
+        self.bytes_reclaimed = 0
+
+    @property
+    def activity_handler(self) -> TypeHandler:
+        """Handler recording user activity, add it to a group that runs before the conversations."""
+        return TypeHandler(Update, self._touch)
+
+    def register(self, conversation: ConversationFlow, handler: ConversationHandler) -> None:
+        """Sweep ``handler``, the handler built from ``conversation`` and added to the application."""
+        self._conversations.append((conversation, _ConversationStates(handler)))
+
+    async def start(self) -> None:
+        self._started = self._clock()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def sweep(self) -> int:
+        """Run one sweep and return the bytes it reclaimed."""
+        now = self._clock()
+        active = self._active_conversations()
+        user_ids = set(self._last_seen) | set(active) | set(self.application.user_data)
+        reclaimed = 0
+
+        for user_id in user_ids:
+            idle = now - self._last_seen.get(user_id, self._started)
+            open_conversations = active.get(user_id, {})
+            kept_keys: Set[str] = set()
+            stale_keys: Set[str] = set()
+
+            for conversation, states in self._conversations:
+                expired = conversation.timeout > 0 and idle > conversation.timeout
+                conversation_keys = open_conversations.get(id(states), [])
+                if conversation_keys and expired:
+                    for key in conversation_keys:
+                        states.end(key)
+                    self.conversations_ended += len(conversation_keys)
+                    conversation_keys = []
+
+                if conversation_keys:
+                    kept_keys.update(conversation.user_data_keys)
+                elif expired:
+                    stale_keys.update(conversation.user_data_keys)
+
+            user_data = self.application.user_data.get(user_id)
+            if user_data:
+                reclaimed += self._evict(user_id, user_data, stale_keys - kept_keys)
+
+            if not open_conversations and not self.application.user_data.get(user_id):
+                self._last_seen.pop(user_id, None)
+
+        self.sweeps += 1
+        self.bytes_reclaimed += reclaimed
+        return reclaimed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tracked_users": len(self._last_seen),
+            "sweeps": self.sweeps,
+            "conversations_ended": self.conversations_ended,
+            "keys_evicted": self.keys_evicted,
+            "bytes_reclaimed": self.bytes_reclaimed,
+        }
+
+    async def _touch(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        if update.effective_user is not None:
+            self._last_seen[update.effective_user.id] = self._clock()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                reclaimed = self.sweep()
+                if reclaimed:
+                    logger.info(f"Conversation sweep reclaimed {reclaimed} bytes: {self.stats()}")
+            except Exception as e:
+                logger.error(f"Error sweeping conversations: {str(e)}", exc_info=True)
+
+    def _active_conversations(self) -> Dict[int, Dict[int, List[Tuple]]]:
+        """Open conversation keys by user id, then by handler."""
+        active: Dict[int, Dict[int, List[Tuple]]] = {}
+        for _, states in self._conversations:
+            if not states.handler.per_user:
+                continue
+            for key in states.open_keys():
+                # keys of per-user conversations end with the user id
+                active.setdefault(key[-1], {}).setdefault(id(states), []).append(key)
+        return active
+
+    def _evict(self, user_id: int, user_data: Dict[str, Any], keys: Set[str]) -> int:
+        evicted = keys & user_data.keys()
+        reclaimed = sum(self._size_of(user_data.pop(key)) for key in evicted)
+        if evicted:
+            self.keys_evicted += len(evicted)
+            self.application.mark_data_for_update_persistence(user_ids=user_id)
+        return reclaimed
+
+    @staticmethod
+    def _size_of(value: Any) -> int:
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(value)
@@ -0,0 +1,242 @@
+import hashlib
+import io
+import json
+import logging
+import pickle
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+from telegram import Bot, TelegramObject
+from telegram.ext import BasePersistence, PersistenceInput
+
+from services.sqlite_database import SqliteDatabase
+
+logger = logging.getLogger(__name__)
+
+# persistent id standing for the running Bot, which cannot be pickled itself
+_BOT_ID = "bot"
+
+PERSISTENCE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_data (
+    user_id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS chat_data (
+    chat_id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS bot_data (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS conversations (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (name, key)
+) WITHOUT ROWID;
+"""
+
+ConversationKey = Tuple[int | str, ...]
+
+
+class SqlitePersistence(BasePersistence[Dict, Dict, Dict]):
+    """
+    Keeps conversation states and ``user_data``/``chat_data`` in SQLite across restarts.
+
+    Every user and chat is one row holding its zlib-compressed pickle. Nothing is
+    unpickled at start-up: ``get_user_data`` returns an empty mapping and each user's
+    data is loaded the first time one of their updates is handled (through
+    ``refresh_user_data``), so start-up time does not grow with the number of users.
+    Only users whose data actually changed since it was last written are written
+    back. Conversation states are small and are loaded eagerly.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        update_interval: float = 60,
+        compression_level: int = 6,
+        store_data: Optional[PersistenceInput] = None,
+    ):
+        """
+        Args:
+            path: Database file, separate from the attendance database
+            update_interval: Seconds between writes of changed data
+            compression_level: zlib level used for stored payloads
+            store_data: Which kinds of data to persist, everything by default
+        """
+        super().__init__(
+            store_data=store_data or PersistenceInput(callback_data=False),
+            update_interval=update_interval,
+        )
+        self.database = SqliteDatabase(path, schema=PERSISTENCE_SCHEMA)
+        self.compression_level = compression_level
+        self._loaded_users: Set[int] = set()
+        self._loaded_chats: Set[int] = set()
+        self._digests: Dict[Tuple[str, int], bytes] = {}
+        self.rows_written = 0
+        self.rows_skipped = 0
+
+    async def get_user_data(self) -> Dict[int, Dict]:
+        # loaded per user in refresh_user_data
+        return {}
+
+    async def get_chat_data(self) -> Dict[int, Dict]:
+        return {}
+
+    async def get_bot_data(self) -> Dict:
+        row = await self.database.fetchone("SELECT data FROM bot_data WHERE id = 0")
+        return self._decode(row["data"]) if row else {}
+
+    async def get_callback_data(self) -> None:
+        return None
+
+    async def get_conversations(self, name: str) -> Dict[ConversationKey, object]:
+        rows = await self.database.fetchall("SELECT key, state FROM conversations WHERE name = ?", (name,))
+        return {tuple(json.loads(row["key"])): json.loads(row["state"]) for row in rows}
+
+    async def update_conversation(self, name: str, key: ConversationKey, new_state: Optional[object]) -> None:
+        if new_state is None:
+            await self.database.execute(
+                "DELETE FROM conversations WHERE name = ? AND key = ?",
+                (name, json.dumps(key)),
+            )
+            return
+
+        await self.database.execute(
+            """
+            INSERT INTO conversations (name, key, state) VALUES (?, ?, ?)
+            ON CONFLICT (name, key) DO UPDATE SET state = excluded.state
+            """,
+            (name, json.dumps(key), json.dumps(new_state)),
+        )
+
+    async def update_user_data(self, user_id: int, data: Dict) -> None:
+        if user_id not in self._loaded_users and not data:
+            # an update we did not handle; the stored data was never loaded, so nothing changed
+            return
+        await self._write("user_data", "user_id", user_id, data)
+
+    async def update_chat_data(self, chat_id: int, data: Dict) -> None:
+        if chat_id not in self._loaded_chats and not data:
+            return
+        await self._write("chat_data", "chat_id", chat_id, data)
+
+    async def update_bot_data(self, data: Dict) -> None:
+        await self._write("bot_data", "id", 0, data)
+
+    async def update_callback_data(self, data: Any) -> None:
+        pass
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._loaded_users.discard(user_id)
+        self._digests.pop(("user_data", user_id), None)
+        await self.database.execute("DELETE FROM user_data WHERE user_id = ?", (user_id,))
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        self._loaded_chats.discard(chat_id)
+        self._digests.pop(("chat_data", chat_id), None)
+        await self.database.execute("DELETE FROM chat_data WHERE chat_id = ?", (chat_id,))
+
+    async def refresh_user_data(self, user_id: int, user_data: Dict) -> None:
+        if user_id in self._loaded_users:
+            return
+        self._loaded_users.add(user_id)
+        row = await self.database.fetchone("SELECT data FROM user_data WHERE user_id = ?", (user_id,))
+        if row:
+            self._digests[("user_data", user_id)] = hashlib.blake2b(row["data"], digest_size=16).digest()
+            user_data.update(self._decode(row["data"]))
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Dict) -> None:
+        if chat_id in self._loaded_chats:
+            return
+        self._loaded_chats.add(chat_id)
+        row = await self.database.fetchone("SELECT data FROM chat_data WHERE chat_id = ?", (chat_id,))
+        if row:
+            self._digests[("chat_data", chat_id)] = hashlib.blake2b(row["data"], digest_size=16).digest()
+            chat_data.update(self._decode(row["data"]))
+
+    async def refresh_bot_data(self, bot_data: Dict) -> None:
+        pass
+
+    async def flush(self) -> None:
+        # every update is committed as it is made, there is nothing buffered
+        pass
+
+    async def aclose(self) -> None:
+        await self.database.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "loaded_users": len(self._loaded_users),
+            "rows_written": self.rows_written,
+            "rows_skipped": self.rows_skipped,
+        }
+
+    async def _write(self, table: str, key_column: str, key: int, data: Dict) -> None:
+        blob = self._encode(data)
+        digest = hashlib.blake2b(blob, digest_size=16).digest()
+        if self._digests.get((table, key)) == digest:
+            self.rows_skipped += 1
+            return
+
+        await self.database.execute(
+            f"""
+            INSERT INTO {table} ({key_column}, data) VALUES (?, ?)
+            ON CONFLICT ({key_column}) DO UPDATE SET data = excluded.data
+            """,
+            (key, blob),
+        )
+        self._digests[(table, key)] = digest
+        self.rows_written += 1
+
+    def _encode(self, data: Any) -> bytes:
+        buffer = io.BytesIO()
+        _BotPickler(self.bot, buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(data)
+        return zlib.compress(buffer.getvalue(), self.compression_level)
+
+    def _decode(self, blob: bytes) -> Any:
+        return _BotUnpickler(self.bot, io.BytesIO(zlib.decompress(blob))).load()
+
+
+class _BotPickler(pickle.Pickler):
+    """Pickles Telegram objects without their Bot, the Bot is stored as a persistent id."""
+
+    def __init__(self, bot: Bot, *args: Any, **kwargs: Any):
+        self.bot = bot
+        super().__init__(*args, **kwargs)
+
+    def reducer_override(self, obj: Any) -> Any:
+        if not isinstance(obj, TelegramObject):
+            return NotImplemented
+        # the state leaves out the Bot, it is passed separately so it is restored on loading
+        return _restore_telegram_object, (type(obj), obj.__getstate__(), self.bot)
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        return _BOT_ID if obj is self.bot else None
+
+
+class _BotUnpickler(pickle.Unpickler):
+    """Loads what `_BotPickler` stored, with the running Bot in place of the stored one."""
+
+    def __init__(self, bot: Bot, *args: Any, **kwargs: Any):
+        self.bot = bot
+        super().__init__(*args, **kwargs)
+
+    def persistent_load(self, pid: Any) -> Bot:
+        if pid != _BOT_ID:
+            raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}")
+        return self.bot
+
+
+def _restore_telegram_object(cls: type, state: dict, bot: Optional[Bot]) -> TelegramObject:
+    obj = cls.__new__(cls)
+    obj.__setstate__(state)
+    if bot is not None:
+        obj.set_bot(bot)
+    return obj
@@ -0,0 +1,249 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import warnings
+from collections import Counter
+from datetime import timedelta
+from enum import IntEnum
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple, Union
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+from telegram.warnings import PTBDeprecationWarning
+
+logger = logging.getLogger(__name__)
+
+JSONResult = Union[bool, Dict[str, Any], List[Dict[str, Any]]]
+
+
+def retry_after_seconds(error: RetryAfter) -> float:
+    with warnings.catch_warnings():
+        # int vs timedelta transition in python-telegram-bot 22, both are handled below
+        warnings.simplefilter("ignore", PTBDeprecationWarning)
+        retry_after = error.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class SendPriority(IntEnum):
+    """
+    Priority of an outbound request, pass it as ``rate_limit_args`` on bot calls.
+
+    Requests without one are treated as interactive.
+    """
+    INTERACTIVE = 0
+    BULK = 1
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``capacity``; a request spends one token."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def delay(self) -> float:
+        """Seconds until a token is available, 0 if one is available now."""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self._refill()
+        self.tokens -= 1
+
+    async def acquire(self) -> None:
+        while (delay := self.delay()) > 0:
+            await asyncio.sleep(delay)
+        self.take()
+
+    @property
+    def full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class _ChatLane:
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.lock = asyncio.Lock()
+
+
+class PriorityRateLimiter(BaseRateLimiter[SendPriority]):
+    """
+    Central scheduler for requests to the Telegram Bot API.
+
+    Requests that target a chat first wait for that chat's token bucket, in arrival
+    order, and then for a slot in the global bucket, where interactive requests are
+    served before bulk ones. A RetryAfter from Telegram pauses all sending for the
+    requested time, after which the request is retried automatically. Requests that
+    do not target a chat (getUpdates, answerCallbackQuery, ...) are not limited.
+    """
+
+    MAX_IDLE_CHATS = 1000
+
+    def __init__(
+        self,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        chat_burst: float = 3,
+        group_rate: float = 20 / 60,
+        max_retries: int = 3,
+    ):
+        """
+        Args:
+            global_rate: Messages per second across all chats
+            chat_rate: Messages per second to a single private chat
+            chat_burst: Messages a chat may receive in a burst before being limited
+            group_rate: Messages per second to a single group or channel
+            max_retries: RetryAfter errors tolerated per request before it is raised
+        """
+        self.global_bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+        self._lanes: Dict[Union[int, str], _ChatLane] = {}
+        self._chat_depth: Counter = Counter()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._paused_until = 0.0
+        self.retry_after_count = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "PriorityRateLimiter":
+        return cls(
+            global_rate=settings.send_global_rate,
+            chat_rate=settings.send_chat_rate,
+            chat_burst=settings.send_chat_burst,
+            group_rate=settings.send_group_rate,
+            max_retries=settings.send_max_retries,
+        )
+
+    async def initialize(self) -> None:
+        self._ensure_dispatcher()
+
+    async def shutdown(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, JSONResult]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[SendPriority],
+    ) -> JSONResult:
+        chat_id = data.get("chat_id")
+        if chat_id is None:
+            return await callback(*args, **kwargs)
+
+        priority = rate_limit_args if rate_limit_args is not None else SendPriority.INTERACTIVE
+        lane = self._lane(chat_id)
+        self._chat_depth[chat_id] += 1
+        try:
+            for attempt in range(self.max_retries + 1):
+                async with lane.lock:
+                    await lane.bucket.acquire()
+                    await self._acquire_global(priority)
+                try:
+                    return await callback(*args, **kwargs)
+                except RetryAfter as e:
+                    if attempt == self.max_retries:
+                        raise
+                    seconds = retry_after_seconds(e)
+                    self.retry_after_count += 1
+                    self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+                    logger.warning(f"Telegram asked to retry {endpoint} for chat {chat_id} after {seconds}s")
+                    await asyncio.sleep(seconds)
+        finally:
+            self._chat_depth[chat_id] -= 1
+            if self._chat_depth[chat_id] <= 0:
+                del self._chat_depth[chat_id]
+
+    def chat_queue_depth(self, chat_id: Union[int, str]) -> int:
+        """Requests for ``chat_id`` that are waiting or in flight."""
+        return self._chat_depth[chat_id]
+
+    def stats(self) -> Dict[str, Any]:
+        waiting = [priority for priority, _, future in self._waiters if not future.done()]
+        return {
+            "queued": len(waiting),
+            "queued_interactive": waiting.count(SendPriority.INTERACTIVE),
+            "queued_bulk": waiting.count(SendPriority.BULK),
+            "chats_queued": len(self._chat_depth),
+            "max_chat_depth": max(self._chat_depth.values(), default=0),
+            "retry_after": self.retry_after_count,
+        }
+
+    def _lane(self, chat_id: Union[int, str]) -> _ChatLane:
+        lane = self._lanes.get(chat_id)
+        if lane is None:
+            if len(self._lanes) >= self.MAX_IDLE_CHATS:
+                self._prune_lanes()
+            # group and channel ids are negative, or a @username for public channels
+            is_private = isinstance(chat_id, int) and chat_id > 0
+            rate = self.chat_rate if is_private else self.group_rate
+            capacity = self.chat_burst if is_private else 1
+            lane = self._lanes[chat_id] = _ChatLane(TokenBucket(rate=rate, capacity=capacity))
+        return lane
+
+    def _prune_lanes(self) -> None:
+        # a full, unused bucket behaves exactly like a fresh one, so it can be dropped
+        for chat_id, lane in list(self._lanes.items()):
+            if chat_id not in self._chat_depth and not lane.lock.locked() and lane.bucket.full:
+                del self._lanes[chat_id]
+
+    async def _acquire_global(self, priority: SendPriority) -> None:
+        self._ensure_dispatcher()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._wakeup.set()
+        await future
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        while True:
+            if not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+
+            delay = self.global_bucket.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # the caller was cancelled while waiting
+                continue
+            self.global_bucket.take()
+            future.set_result(None)
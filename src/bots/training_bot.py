@@ -1,4 +1,8 @@
 from bots.bot_core import BotCore
+from bots.conversation_sweeper import ConversationSweeper
+from bots.persistence import SqlitePersistence
+from bots.rate_limiter import PriorityRateLimiter
+from bots.user_locale import UserLocaleResolver
 from command_handlers.conversations.get_team_attendance_conversation import GetTeamAttendanceConversation
 from command_handlers.conversations.manage_event_conversation import ManageEventConversation
 from command_handlers.conversations.manage_access_conversation import ManageAccessConversation
@@ -6,14 +10,59 @@ from command_handlers.start_handler import StartHandler
 from command_handlers.cancel_handler import CancelHandler
 from command_handlers.conversations.attendance_conversation import MarkAttendanceConversation
 from command_handlers.conversations.registration_conversation import RegistrationConversation
-from controllers.attendance_controller import FakeAttendanceController
-from controllers.manage_event_controller import FakeManageEventController
-from controllers.registration_controller import FakeRegistrationController
-from controllers.manage_access_controller import FakeManageAccessController
+from config.settings import settings
+from controllers.attendance_controller import (
+    AttendanceControlling,
+    AttendanceController,
+    FakeAttendanceController,
+    SqliteAttendanceController,
+)
+from controllers.batching import BatchingAttendanceController
+from controllers.caching import (
+    CachedAttendanceController,
+    CachedManageEventController,
+    CachedTeamAttendanceController,
+    UpcomingEventsCache,
+)
+from controllers.coalescing import (
+    CoalescingTeamAttendanceController,
+    RosterInvalidatingAttendanceController,
+    SingleFlight,
+)
+from controllers.outbox import OutboxAttendanceController
+from controllers.manage_event_controller import (
+    FakeManageEventController,
+    ManageEventControlling,
+    SqliteManageEventController,
+)
+from controllers.registration_controller import (
+    FakeRegistrationController,
+    RegistrationControlling,
+    SqliteRegistrationController,
+)
+from controllers.manage_access_controller import (
+    FakeManageAccessController,
+    ManageAccessControlling,
+    SqliteManageAccessController,
+)
 
 import logging
+from typing import Dict
 
-from controllers.team_attendance_controller import FakeTeamAttendanceController
+from controllers.team_attendance_controller import (
+    FakeTeamAttendanceController,
+    SqliteTeamAttendanceController,
+    TeamAttendanceController,
+    TeamAttendanceControlling,
+)
+from localization import LocaleReloader, store as locale_store
+from services.backend_client import BackendClient
+from services.broadcast import Broadcaster, BroadcastStore
+from services.callback_codec import CallbackCodec
+from services.event_registry import EventRegistry
+from services.live_attendance import LiveAttendanceBoard, LiveMessageStore
+from services.outbox import AppendOnlyOutbox
+from services.sqlite_database import SqliteDatabase
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +84,40 @@ class TrainingBot:
             token: Telegram bot token
         """
         logger.info("Initializing training bot...")
-        # Initialize core bot with just the token
-        self.core = BotCore(token=token)
+        # Initialize core bot
+        self.rate_limiter = PriorityRateLimiter.from_settings(settings) if settings.send_global_rate > 0 else None
+        self.persistence: SqlitePersistence | None = None
+        if settings.persistence_path:
+            self.persistence = SqlitePersistence(
+                settings.persistence_path,
+                update_interval=settings.persistence_update_interval,
+            )
+        self.core = BotCore(
+            token=token,
+            concurrent_updates=settings.update_concurrency,
+            rate_limiter=self.rate_limiter,
+            persistence=self.persistence,
+        )
+        if self.persistence:
+            self.core.add_shutdown_callback(self.persistence.aclose)
+        self.backend_client = BackendClient.from_settings(settings)
+        self.core.add_shutdown_callback(self.backend_client.aclose)
+        self.database: SqliteDatabase | None = None
+        if settings.controller_backend == "sqlite":
+            self.database = SqliteDatabase(settings.sqlite_path)
+            self.core.add_shutdown_callback(self.database.aclose)
+        self.event_registry = EventRegistry(max_entries=settings.event_registry_max_entries)
+        self.event_cache = UpcomingEventsCache(
+            ttl=settings.event_cache_ttl,
+            max_entries=settings.event_cache_max_entries,
+        )
+        # shared so attendance writes can drop the team attendance rosters they change
+        self.team_attendance_flight = SingleFlight(freshness=settings.team_attendance_freshness)
+        locale_store.max_locales = settings.locale_cache_size
+        if settings.locale_reload_interval > 0:
+            locale_reloader = LocaleReloader(locale_store, interval=settings.locale_reload_interval)
+            self.core.add_startup_callback(locale_reloader.start)
+            self.core.add_shutdown_callback(locale_reloader.aclose)
         self._setup_command_handlers()
         logger.info("Training bot initialized")
     
@@ -48,23 +129,184 @@ class TrainingBot:
         2. Sets up the attendance marking conversation handler
         """
         logger.info("Setting up command handlers...")
+        # serve every update in its user's locale, ahead of the activity handler in group -1
+        self.core.application.add_handler(UserLocaleResolver(locale_store).handler, group=-2)
         # Add command handlers
         self.core.application.add_handler(StartHandler.get_handler())
         self.core.application.add_handler(CancelHandler.get_handler())
         logger.info("Command handlers set up")
         
+        manage_access_controller = self._build_manage_access_controller()
+        broadcaster = self._build_broadcaster(manage_access_controller)
+
+        team_attendance_controller = self._build_team_attendance_controller()
+        team_attendance_conversation = GetTeamAttendanceConversation(
+            controller=team_attendance_controller,
+            registry=self.event_registry,
+        )
+        self.core.application.add_handler(team_attendance_conversation.pages_handler)
+        live_board = self._build_live_board(team_attendance_controller, team_attendance_conversation)
+        team_attendance_conversation.live_board = live_board
+        if live_board:
+            self.core.application.add_handler(team_attendance_conversation.live_updates_handler)
+
+        # signed callback data lets these flows run without session state
+        callback_codec = (
+            CallbackCodec(settings.callback_secret.encode("utf-8"), max_age=settings.callback_max_age)
+            if settings.callback_secret else None
+        )
+
         # Add attendance conversation handler
-        attendance_conv = MarkAttendanceConversation(controller=FakeAttendanceController())
-        team_attendance_conversation = GetTeamAttendanceConversation(controller=FakeTeamAttendanceController())
-        registration_conversation = RegistrationConversation(controller=FakeRegistrationController())
-        manage_event_conversation = ManageEventConversation(controller=FakeManageEventController())
-        manage_access_conversation = ManageAccessConversation(controller=FakeManageAccessController())
-
-        self.core.application.add_handler(attendance_conv.conversation_handler)
-        self.core.application.add_handler(team_attendance_conversation.conversation_handler)
-        self.core.application.add_handler(registration_conversation.conversation_handler)
-        self.core.application.add_handler(manage_event_conversation.conversation_handler)
-        self.core.application.add_handler(manage_access_conversation.conversation_handler)
+        attendance_conv = MarkAttendanceConversation(
+            controller=self._build_attendance_controller(),
+            broadcaster=broadcaster,
+            registry=self.event_registry,
+            live_board=live_board,
+            codec=callback_codec,
+        )
+        registration_conversation = RegistrationConversation(controller=self._build_registration_controller())
+        manage_event_conversation = ManageEventConversation(
+            controller=self._build_manage_event_controller(),
+            broadcaster=broadcaster,
+            registry=self.event_registry,
+        )
+        manage_access_conversation = ManageAccessConversation(
+            controller=manage_access_controller,
+            codec=callback_codec,
+        )
+
+        conversations = [
+            attendance_conv,
+            team_attendance_conversation,
+            registration_conversation,
+            manage_event_conversation,
+            manage_access_conversation,
+        ]
+        timeouts = self._conversation_timeouts()
+        self.sweeper = ConversationSweeper(self.core.application, interval=settings.conversation_sweep_interval)
+        for conversation in conversations:
+            conversation.persistent = self.persistence is not None
+            conversation.timeout = timeouts.get(conversation.name, settings.conversation_timeout)
+            handler = conversation.conversation_handler
+            self.core.application.add_handler(handler)
+            self.sweeper.register(conversation, handler)
+
+        if any(conversation.timeout > 0 for conversation in conversations):
+            # record activity before any conversation handles the update
+            self.core.application.add_handler(self.sweeper.activity_handler, group=-1)
+            self.core.add_startup_callback(self.sweeper.start)
+            self.core.add_shutdown_callback(self.sweeper.aclose)
+
+    @staticmethod
+    def _conversation_timeouts() -> Dict[str, float]:
+        """Per-conversation overrides of the idle timeout, parsed from `settings.conversation_timeouts`."""
+        timeouts: Dict[str, float] = {}
+        for entry in settings.conversation_timeouts.split(","):
+            if not entry.strip():
+                continue
+            name, _, seconds = entry.partition("=")
+            timeouts[name.strip()] = float(seconds)
+        return timeouts
+
+    def _build_attendance_controller(self) -> AttendanceControlling:
+        controller: AttendanceControlling = FakeAttendanceController()
+        if settings.controller_backend == "http":
+            controller = AttendanceController(client=self.backend_client)
+        elif self.database:
+            controller = SqliteAttendanceController(self.database)
+
+        if settings.attendance_batch_window > 0:
+            controller = BatchingAttendanceController(
+                controller,
+                max_delay=settings.attendance_batch_window,
+                max_batch_size=settings.attendance_batch_size,
+            )
+            self.core.add_shutdown_callback(controller.aclose)
+
+        if settings.attendance_outbox_path:
+            controller = OutboxAttendanceController(
+                controller,
+                outbox=AppendOnlyOutbox(settings.attendance_outbox_path),
+                max_batch_size=settings.outbox_batch_size,
+                max_attempts=settings.outbox_max_attempts,
+                retry_base_delay=settings.outbox_retry_base_delay,
+                retry_max_delay=settings.outbox_retry_max_delay,
+            )
+            # replay entries left over from a previous run as soon as the bot is up
+            self.core.add_startup_callback(controller.start)
+            self.core.add_shutdown_callback(controller.aclose)
+
+        if settings.event_cache_ttl > 0:
+            controller = CachedAttendanceController(controller, cache=self.event_cache)
+        return RosterInvalidatingAttendanceController(controller, single_flight=self.team_attendance_flight)
+
+    def _build_team_attendance_controller(self) -> TeamAttendanceControlling:
+        controller: TeamAttendanceControlling = FakeTeamAttendanceController()
+        if settings.controller_backend == "http":
+            controller = TeamAttendanceController(client=self.backend_client)
+        elif self.database:
+            controller = SqliteTeamAttendanceController(self.database)
+        controller = CoalescingTeamAttendanceController(controller, single_flight=self.team_attendance_flight)
+
+        if settings.event_cache_ttl > 0:
+            controller = CachedTeamAttendanceController(controller, cache=self.event_cache)
+        return controller
+
+    def _build_manage_event_controller(self) -> ManageEventControlling:
+        controller: ManageEventControlling = FakeManageEventController()
+        if self.database:
+            controller = SqliteManageEventController(self.database)
+
+        if settings.event_cache_ttl > 0:
+            controller = CachedManageEventController(controller, cache=self.event_cache)
+        return controller
+
+    def _build_registration_controller(self) -> RegistrationControlling:
+        if self.database:
+            return SqliteRegistrationController(self.database)
+        return FakeRegistrationController()
+
+    def _build_manage_access_controller(self) -> ManageAccessControlling:
+        if self.database:
+            return SqliteManageAccessController(self.database)
+        return FakeManageAccessController()
+
+    def _build_broadcaster(self, recipients: ManageAccessControlling) -> Broadcaster | None:
+        if not settings.broadcast_state_path:
+            return None
+
+        broadcaster = Broadcaster(
+            bot=self.core.application.bot,
+            recipients=recipients,
+            store=BroadcastStore(settings.broadcast_state_path),
+            batch_size=settings.broadcast_batch_size,
+            batch_interval=settings.broadcast_batch_interval,
+        )
+        # continue announcements interrupted by a restart
+        self.core.add_startup_callback(broadcaster.resume)
+        self.core.add_shutdown_callback(broadcaster.aclose)
+        return broadcaster
+
+    def _build_live_board(
+        self,
+        controller: TeamAttendanceControlling,
+        conversation: GetTeamAttendanceConversation,
+    ) -> LiveAttendanceBoard | None:
+        if not settings.live_attendance_path:
+            return None
+
+        live_board = LiveAttendanceBoard(
+            bot=self.core.application.bot,
+            controller=controller,
+            registry=self.event_registry,
+            render=conversation.build_live_message,
+            store=LiveMessageStore(settings.live_attendance_path),
+            debounce=settings.live_attendance_debounce,
+        )
+        # keep updating the messages tracked before a restart
+        self.core.add_startup_callback(live_board.resume)
+        self.core.add_shutdown_callback(live_board.aclose)
+        return live_board
 
     def run(self):
         """Run the bot"""
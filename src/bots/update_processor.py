@@ -0,0 +1,74 @@
+import logging
+from collections import deque
+from typing import Any, Awaitable, Deque, Dict, Hashable, Optional
+
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processes updates from different users concurrently while keeping each user's updates in order.
+
+    The conversation state machines assume a user's updates are handled one at a time, so
+    updates are keyed by user (falling back to the chat for updates without a user). When
+    an update arrives while an earlier one with the same key is still being processed, it
+    is queued behind it and run by the same task, without taking another concurrency slot,
+    so one busy user cannot starve everybody else. Updates without a user or chat are not
+    ordered.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        """
+        Args:
+            max_concurrent_updates: Users whose updates are processed at the same time
+        """
+        super().__init__(max_concurrent_updates)
+        self._queues: Dict[Hashable, Deque[Awaitable[Any]]] = {}
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = self._ordering_key(update)
+        if key is None:
+            await coroutine
+            return
+
+        queue = self._queues.get(key)
+        if queue is not None:
+            # an earlier update from this user is in flight, its task runs this one afterwards
+            queue.append(coroutine)
+            return
+
+        self._queues[key] = queue = deque([coroutine])
+        try:
+            while queue:
+                try:
+                    await queue.popleft()
+                except Exception as e:
+                    logger.error(f"Error processing update for {key}: {str(e)}", exc_info=True)
+        finally:
+            del self._queues[key]
+            for pending in queue:
+                # only reached when cancelled, avoid "coroutine was never awaited" warnings
+                pending.close()
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    @property
+    def queued_updates(self) -> int:
+        """Updates waiting behind an earlier update from the same user."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    @staticmethod
+    def _ordering_key(update: object) -> Optional[Hashable]:
+        user = getattr(update, "effective_user", None)
+        if user is not None:
+            return "user", user.id
+        chat = getattr(update, "effective_chat", None)
+        if chat is not None:
+            return "chat", chat.id
+        return None
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from telegram import Update
+from telegram.ext import ContextTypes, TypeHandler
+
+from localization import LocaleStore, use_locale
+
+
+class UserLocaleResolver:
+    """
+    Serves each update in the locale of the user it came from.
+
+    The handler, registered in a group ahead of every other handler, resolves the
+    ``language_code`` of the user's Telegram client to the closest available locale
+    and sets it for the rest of the update, where ``Key`` lookups are then served in
+    it. Updates without a user are served in the default locale.
+    """
+
+    def __init__(self, store: LocaleStore):
+        """
+        Args:
+            store: Store the locales are resolved against
+        """
+        self.store = store
+
+    @property
+    def handler(self) -> TypeHandler:
+        """Handler setting the locale of each update, add it to a group that runs before all others."""
+        return TypeHandler(Update, self._resolve)
+
+    def locale_for(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[str]:
+        user = update.effective_user
+        if user is None:
+            return None
+        return self.store.resolve_locale(user.language_code)
+
+    async def _resolve(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        use_locale(self.locale_for(update, context))
@@ -4,5 +4,6 @@ Command Handlers package.
 This package contains individual command handlers for Telegram bot interactions:
 - start_handler: Handles the /start command
 - cancel_handler: Handles the /cancel command
+- callback_router: Dispatches `namespace:verb:payload` callback queries of a conversation state
 - conversations/: Contains conversation handlers for different bot functionalities
 """ 
\ No newline at end of file
@@ -0,0 +1,83 @@
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from telegram import Update
+from telegram.ext import Application, BaseHandler, ContextTypes
+
+RouteCallback = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[Any]]
+
+SEPARATOR = ":"
+
+
+class CallbackRouter(BaseHandler[Update, ContextTypes.DEFAULT_TYPE, Any]):
+    """
+    Dispatches callback queries by their data, `namespace:verb:payload`.
+
+    - Routes are keyed `namespace:verb` and kept in a two-level trie, namespace then
+      verb, so finding the callback of a query is two dict lookups however many
+      routes there are. A conversation state needs one router instead of one
+      regex `CallbackQueryHandler` per button, which PTB tries in turn.
+    - The payload is everything after the verb, it may itself contain separators.
+      Data without a payload, like `event:title`, routes on its verb alone.
+    - Queries whose namespace or verb has no route are not handled, like a
+      `CallbackQueryHandler` whose pattern does not match.
+    """
+
+    __slots__ = ("_routes",)
+
+    def __init__(self, routes: Mapping[str, RouteCallback], block: bool = True):
+        """
+        Args:
+            routes: Callback of each `namespace:verb`
+            block: Whether the update is processed before the next one, as for other handlers
+        """
+        super().__init__(self._unrouted, block=block)
+        self._routes: Dict[str, Dict[str, RouteCallback]] = {}
+        for route, callback in routes.items():
+            namespace, separator, verb = route.partition(SEPARATOR)
+            if not separator or not namespace or not verb or SEPARATOR in verb:
+                raise ValueError(f"Route must be 'namespace{SEPARATOR}verb', got {route!r}")
+            self._routes.setdefault(namespace, {})[verb] = callback
+
+    @staticmethod
+    def encode(namespace: str, verb: str, payload: object = None) -> str:
+        if payload is None:
+            return f"{namespace}{SEPARATOR}{verb}"
+        return f"{namespace}{SEPARATOR}{verb}{SEPARATOR}{payload}"
+
+    @staticmethod
+    def parse(data: str) -> Tuple[str, str, str]:
+        """Namespace, verb and payload of ``data``, the payload is empty when there is none."""
+        namespace, _, rest = data.partition(SEPARATOR)
+        verb, _, payload = rest.partition(SEPARATOR)
+        return namespace, verb, payload
+
+    @staticmethod
+    def payload(data: str) -> str:
+        return data.split(SEPARATOR, 2)[2] if data.count(SEPARATOR) >= 2 else ""
+
+    def check_update(self, update: object) -> Optional[RouteCallback]:
+        if not isinstance(update, Update) or update.callback_query is None:
+            return None
+        data = update.callback_query.data
+        if not isinstance(data, str):
+            return None
+
+        namespace, _, rest = data.partition(SEPARATOR)
+        verbs = self._routes.get(namespace)
+        if verbs is None:
+            return None
+        return verbs.get(rest.partition(SEPARATOR)[0])
+
+    async def handle_update(
+        self,
+        update: Update,
+        application: Application,
+        check_result: RouteCallback,
+        context: ContextTypes.DEFAULT_TYPE,
+    ) -> Any:
+        # check_update resolved the route, the result is returned for ConversationHandler
+        return await check_result(update, context)
+
+    @staticmethod
+    async def _unrouted(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        raise AssertionError("CallbackRouter calls the callback of the matched route")
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, Optional, Tuple
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Message
 from telegram.ext import (
@@ -14,9 +14,14 @@ from datetime import datetime, date
 from controllers.attendance_controller import AttendanceControlling, AttendanceController
 from models.models import Attendance
 from models.responses import EventAttendance
+from command_handlers.callback_router import CallbackRouter
 from command_handlers.conversations.conversation_flow import ConversationFlow
 import logging
 from localization import Key
+from services.broadcast import Broadcaster
+from services.callback_codec import CallbackCodec, InvalidCallbackData
+from services.event_registry import EventRegistry
+from services.live_attendance import LiveAttendanceBoard
 
 logger = logging.getLogger(__name__)
 
@@ -35,15 +40,59 @@ class MarkAttendanceConversation(ConversationFlow):
     
     This is specifically for users to mark their own attendance, as opposed to
     viewing or managing other users' attendance.
+
+    With a ``codec`` the buttons carry the event and status in signed callback data
+    and taps are handled without conversation state, the user's attendance is
+    fetched again on each tap. Only a reason typed as a message is still waited
+    for in the conversation, as a message carries no callback data.
     """
+
+    user_data_keys = (
+        "upcoming_attendance",
+        "selected_event_id",
+        "previous_status",
+        "is_event_selected_query_handled",
+    )
     
-    def __init__(self, controller: AttendanceControlling):
+    def __init__(
+        self,
+        controller: AttendanceControlling,
+        broadcaster: Optional[Broadcaster] = None,
+        registry: Optional[EventRegistry] = None,
+        live_board: Optional[LiveAttendanceBoard] = None,
+        codec: Optional[CallbackCodec] = None,
+    ):
         self.controller = controller
+        self.broadcaster = broadcaster
+        self.registry = registry if registry is not None else EventRegistry()
+        self.live_board = live_board
+        self.codec = codec
     
     @property
     def conversation_handler(self) -> ConversationHandler:
         """The conversation handler for marking attendance flow"""
 
+        if self.codec is not None:
+            # every tap is an entry point, its callback data says which event and status
+            return ConversationHandler(
+                entry_points=[
+                    CommandHandler("attendance", self.attendance_command),
+                    CallbackRouter({
+                        "attend:event": self.event_selected_signed,
+                        "attend:status": self.status_selected_signed,
+                    }),
+                ],
+                states={
+                    INDICATING_ATTENDANCE: [
+                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.attendance_selected),
+                    ],
+                },
+                fallbacks=[CommandHandler("cancel", self.cancel)],
+                name=self.name,
+                persistent=self.persistent,
+                allow_reentry=True,
+            )
+
         return ConversationHandler(
             entry_points=[
                 CommandHandler("attendance", self.attendance_command),
@@ -58,6 +107,8 @@ class MarkAttendanceConversation(ConversationFlow):
                 ],
             },
             fallbacks=[CommandHandler("cancel", self.cancel)],
+            name=self.name,
+            persistent=self.persistent,
         )
     
     async def attendance_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -69,14 +120,22 @@ class MarkAttendanceConversation(ConversationFlow):
             from_date=date.today(),
         )
 
-        context.user_data["upcoming_events"] = upcoming_events
+        # events are shared through the registry, only this user's attendance is kept per user
+        self.registry.put_many(item.event for item in upcoming_events)
+        if self.codec is None:
+            context.user_data["upcoming_attendance"] = {item.event.id: item.attendance for item in upcoming_events}
 
         if not upcoming_events:
             await update.message.reply_text(Key.no_upcoming_events_found)
             return ConversationHandler.END
         
         keyboard = [
-            [InlineKeyboardButton(event.event.start.strftime('%-d-%b-%-y, %a @ %-I:%M%p'), callback_data=str(event.event.id))]
+            [
+                InlineKeyboardButton(
+                    event.event.start.strftime('%-d-%b-%-y, %a @ %-I:%M%p'),
+                    callback_data=self._data(update, "event", event.event.id),
+                )
+            ]
             for event in upcoming_events
 
         ]
@@ -86,38 +145,29 @@ class MarkAttendanceConversation(ConversationFlow):
             Key.choose_event_message,
             reply_markup=reply_markup
         )
-        
-        return CHOOSING_EVENT
+
+        # a signed flow keeps no conversation state, the next tap is an entry point again
+        return ConversationHandler.END if self.codec is not None else CHOOSING_EVENT
     
     async def event_selected(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Handle event selection"""
         query = update.callback_query
         await query.answer()
         event_id = int(query.data)
-        upcoming_events: List[EventAttendance] = context.user_data["upcoming_events"]
+        context.user_data["selected_event_id"] = event_id
 
-        selected_event = next(event for event in upcoming_events if event.event.id == event_id)
+        selected_event = self._selected_event(context)
+        if selected_event is None:
+            await query.edit_message_text(Key.event_not_found_retry)
+            return ConversationHandler.END
 
-        context.user_data["selected_event"] = selected_event
+        context.user_data["previous_status"] = selected_event.attendance.status
 
         if selected_event.event.is_attendance_locked():
             await query.edit_message_text(Key.attendance_locked)
             return ConversationHandler.END
 
-        keyboard = [
-            [
-                InlineKeyboardButton(Key.attendance_yes_button, callback_data=f"1"),
-                InlineKeyboardButton(Key.attendance_no_button, callback_data=f"0"),
-            ],
-            [InlineKeyboardButton(Key.attendance_comment_button, callback_data=f"2")],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
-        await query.edit_message_text(
-            Key.attendance_prompt.format(event_title=selected_event.event.title),
-            reply_markup=reply_markup
-        )
-        
+        await self._prompt_status(update, selected_event)
         return INDICATING_ATTENDANCE
 
     async def give_reason(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -127,11 +177,13 @@ class MarkAttendanceConversation(ConversationFlow):
         await query.answer()
         context.user_data["is_event_selected_query_handled"] = False
 
-        selected_event: EventAttendance = context.user_data["selected_event"]
-        attendance_indicated = int(query.data)
+        selected_event = self._selected_event(context)
+        if selected_event is None:
+            await query.edit_message_text(Key.event_not_found_retry)
+            return ConversationHandler.END
 
+        attendance_indicated = int(query.data)
         selected_event.attendance.status = bool(attendance_indicated)
-        context.user_data["selected_event"] = selected_event
 
         if attendance_indicated == 1:
             return await self.attendance_selected(update, context)
@@ -147,7 +199,11 @@ class MarkAttendanceConversation(ConversationFlow):
     async def attendance_selected(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Handle attendance selection"""
 
-        selected_event: EventAttendance = context.user_data["selected_event"]
+        selected_event = self._selected_event(context)
+        if selected_event is None:
+            await update.effective_message.reply_text(Key.event_not_found_retry)
+            return ConversationHandler.END
+
         is_event_selected_query_handled: bool = context.user_data["is_event_selected_query_handled"]
 
         text = Key.updating_attendance
@@ -163,14 +219,127 @@ class MarkAttendanceConversation(ConversationFlow):
             selected_event.attendance.status = bool(int(query.data))
             bot_message: Message = await query.edit_message_text(text)
 
-        await self.controller.update_attendance(events=[selected_event])
+        await self._save_attendance(update, selected_event, bot_message, context.user_data.get("previous_status"))
+        return ConversationHandler.END
 
-        await bot_message.edit_text(text=Key.attendance_updated)
-        # TODO resend announcement to user if previously indicated as absent
+    async def event_selected_signed(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        """Handle event selection from signed callback data"""
+        query = update.callback_query
+        await query.answer()
 
+        fields = self._signed_fields(update, 1)
+        selected_event = await self._fetch_event(update, fields[0]) if fields else None
+        if selected_event is None:
+            await query.edit_message_text(Key.menu_expired_retry if fields is None else Key.event_not_found_retry)
+            return ConversationHandler.END
+
+        if selected_event.event.is_attendance_locked():
+            await query.edit_message_text(Key.attendance_locked)
+            return ConversationHandler.END
+
+        await self._prompt_status(update, selected_event)
         return ConversationHandler.END
 
+    async def status_selected_signed(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        """Handle the attendance status from signed callback data, prompting for a reason when one is needed"""
+        query = update.callback_query
+        await query.answer()
+
+        fields = self._signed_fields(update, 2)
+        selected_event = await self._fetch_event(update, fields[0]) if fields else None
+        if selected_event is None:
+            await query.edit_message_text(Key.menu_expired_retry if fields is None else Key.event_not_found_retry)
+            return ConversationHandler.END
+        if selected_event.event.is_attendance_locked():
+            await query.edit_message_text(Key.attendance_locked)
+            return ConversationHandler.END
+
+        previous_status = selected_event.attendance.status
+        attendance_indicated = fields[1]
+        selected_event.attendance.status = bool(attendance_indicated)
+
+        if attendance_indicated == 1 or (attendance_indicated != 2 and not selected_event.event.is_accountable):
+            bot_message: Message = await query.edit_message_text(Key.updating_attendance)
+            await self._save_attendance(update, selected_event, bot_message, previous_status)
+            return ConversationHandler.END
+
+        # a reason arrives as a message, so this one step waits in the conversation
+        context.user_data["selected_event_id"] = selected_event.event.id
+        context.user_data["upcoming_attendance"] = {selected_event.event.id: selected_event.attendance}
+        context.user_data["previous_status"] = previous_status
+        context.user_data["is_event_selected_query_handled"] = True
+        await query.edit_message_text(text=Key.comment_prompt)
+
+        return INDICATING_ATTENDANCE
+
     async def cancel(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Handle the /cancel command"""
         await update.message.reply_text(Key.operation_cancelled)
         return ConversationHandler.END
+
+    async def _prompt_status(self, update: Update, selected_event: EventAttendance) -> None:
+        event_id = selected_event.event.id
+        keyboard = [
+            [
+                InlineKeyboardButton(Key.attendance_yes_button, callback_data=self._data(update, "status", event_id, 1)),
+                InlineKeyboardButton(Key.attendance_no_button, callback_data=self._data(update, "status", event_id, 0)),
+            ],
+            [InlineKeyboardButton(Key.attendance_comment_button, callback_data=self._data(update, "status", event_id, 2))],
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+
+        await update.callback_query.edit_message_text(
+            Key.attendance_prompt.format(event_title=selected_event.event.title),
+            reply_markup=reply_markup
+        )
+
+    async def _save_attendance(
+        self,
+        update: Update,
+        selected_event: EventAttendance,
+        bot_message: Message,
+        previous_status: Optional[bool],
+    ) -> None:
+        await self.controller.update_attendance(events=[selected_event])
+        if self.live_board:
+            self.live_board.attendance_changed(selected_event.event.id)
+
+        await bot_message.edit_text(text=Key.attendance_updated)
+
+        # resend the event details to users who previously said they were not coming
+        if self.broadcaster and previous_status is False and selected_event.attendance.status:
+            await self.broadcaster.send_announcement(chat_id=update.effective_chat.id, event=selected_event.event)
+
+    def _data(self, update: Update, verb: str, *fields: int) -> str:
+        """Callback data of a button, the last field in the clear, or all of them signed with a codec."""
+        if self.codec is None:
+            return str(fields[-1])
+        return self.codec.encode("attend", verb, *fields, user_id=update.effective_user.id)
+
+    def _signed_fields(self, update: Update, count: int) -> Optional[Tuple[int, ...]]:
+        """The first ``count`` fields of the tapped button, None when they are not valid."""
+        try:
+            fields = self.codec.decode(update.callback_query.data, user_id=update.effective_user.id)
+        except InvalidCallbackData:
+            return None
+        return fields[:count] if len(fields) >= count else None
+
+    async def _fetch_event(self, update: Update, event_id: int) -> Optional[EventAttendance]:
+        """The event with this user's attendance, fetched again as no session remembers it."""
+        upcoming_events = await self.controller.retrieve_upcoming_events(
+            user_id=update.effective_user.id,
+            from_date=date.today(),
+        )
+        selected_event = next((item for item in upcoming_events if item.event.id == event_id), None)
+        if selected_event is not None:
+            self.registry.put(selected_event.event)
+        return selected_event
+
+    def _selected_event(self, context: ContextTypes.DEFAULT_TYPE) -> Optional[EventAttendance]:
+        """The selected event from the registry with this user's attendance, None if it is no longer known."""
+        event_id: int = context.user_data["selected_event_id"]
+        upcoming_attendance: Dict[int, Attendance] = context.user_data.get("upcoming_attendance", {})
+        event = self.registry.get(event_id)
+        if event is None or event_id not in upcoming_attendance:
+            return None
+        return EventAttendance(event=event, attendance=upcoming_attendance[event_id])
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import Tuple
+
 from telegram.ext import ConversationHandler
 
 class ConversationFlow(ABC):
@@ -11,7 +13,22 @@ class ConversationFlow(ABC):
 
     """
 
-    
+    # set before reading `conversation_handler` to keep conversation states across restarts,
+    # requires the application to have a persistence
+    persistent: bool = False
+
+    # seconds a user may stay idle before the conversation is ended and its user_data is evicted,
+    # 0 keeps it open until the user finishes or cancels it
+    timeout: float = 0
+
+    # keys this conversation stores in `context.user_data`, evicted once it is over
+    user_data_keys: Tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        """Name the conversation states are persisted under."""
+        return type(self).__name__
+
     @property
     @abstractmethod
     def conversation_handler(self) -> ConversationHandler:
@@ -1,30 +1,63 @@
 from datetime import date, datetime
-from typing import List
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Chat, Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ConversationHandler, CommandHandler, CallbackQueryHandler, ContextTypes
 
 from command_handlers.conversations.conversation_flow import ConversationFlow
 from controllers.team_attendance_controller import TeamAttendanceControlling
+from custom_components.PaginatedText import Page, PaginatedText
 from models.models import Event, AccessCategory
-from models.responses.responses import UserAttendance, UserAttendanceResponse
+from models.records import RosterRecord, UserAttendanceRecord
 from localization import Key
+from services.event_registry import EventRegistry
+from services.live_attendance import LiveAttendanceBoard
+from services.render_cache import RenderCache
 
 CHOOSING_EVENT = 1
+# callback data scope of the report's page navigation
+PAGES_SCOPE = "kaypoh"
 
 class GetTeamAttendanceConversation(ConversationFlow):
+    user_data_keys = (
+        "upcoming_event_ids",
+    )
+
     @property
     def conversation_handler(self) -> ConversationHandler:
         return ConversationHandler(
             entry_points=[CommandHandler("kaypoh", self.upcoming_events)],
             states={CHOOSING_EVENT: [
-                CallbackQueryHandler(self.return_team_attendance),
+                CallbackQueryHandler(self.return_team_attendance, pattern=r"^-?\d+$"),
             ]},
             fallbacks=[],
+            name=self.name,
+            persistent=self.persistent,
         )
 
-    def __init__(self, controller: TeamAttendanceControlling):
+    @property
+    def live_updates_handler(self) -> CallbackQueryHandler:
+        """Handles the button that keeps a team attendance message updated, outside of the conversation."""
+        return CallbackQueryHandler(self.keep_updated, pattern=r"^live:-?\d+$")
+
+    @property
+    def pages_handler(self) -> CallbackQueryHandler:
+        """Handles the page navigation of reports too long for one message, outside of the conversation."""
+        return CallbackQueryHandler(self.show_page, pattern=PaginatedText.pattern(PAGES_SCOPE))
+
+    def __init__(
+        self,
+        controller: TeamAttendanceControlling,
+        registry: Optional[EventRegistry] = None,
+        live_board: Optional[LiveAttendanceBoard] = None,
+        render_cache: Optional[RenderCache] = None,
+    ):
         self.controller = controller
+        self.registry = registry if registry is not None else EventRegistry()
+        self.live_board = live_board
+        # roster lines and blocks of earlier reports, most members are unchanged between two renders
+        self.render_cache = render_cache if render_cache is not None else RenderCache()
+        self._render_scopes: Dict[tuple, int] = {}
 
     async def upcoming_events(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         user = update.effective_user
@@ -34,7 +67,7 @@ class GetTeamAttendanceConversation(ConversationFlow):
             from_date=date.today(),
         )
 
-        context.user_data["upcoming_events"] = upcoming_events
+        context.user_data["upcoming_event_ids"] = self.registry.put_many(upcoming_events)
 
         if not upcoming_events:
             await update.message.reply_text(Key.no_upcoming_events_found)
@@ -58,8 +91,8 @@ class GetTeamAttendanceConversation(ConversationFlow):
         await query.answer()
 
         event_id = int(query.data)
-        upcoming_events: List[Event] = context.user_data.get("upcoming_events", [])
-        selected_event = next((event for event in upcoming_events if event.id == event_id), None)
+        upcoming_event_ids: List[int] = context.user_data.get("upcoming_event_ids", [])
+        selected_event = self.registry.get(event_id) if event_id in upcoming_event_ids else None
 
         if not selected_event:
             await query.edit_message_text(Key.event_not_found_retry)
@@ -67,51 +100,195 @@ class GetTeamAttendanceConversation(ConversationFlow):
 
         attendance_response = await self.controller.retrieve_team_attendance(event_id=event_id)
 
-        message = self._build_attendance_message(selected_event, attendance_response)
-
-        await query.edit_message_text(text=message)
+        page = self.render_attendance_page(selected_event, attendance_response, 0)
+        await self._show(query, selected_event, page)
 
         return ConversationHandler.END
 
-    def _build_attendance_message(self, event: Event, attendance: UserAttendanceResponse) -> str:
-        template = Key.team_attendance_message
-        total_attending = len(attendance.male) + len(attendance.female)
+    async def show_page(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        query = update.callback_query
+        _, event_id, number = PaginatedText.parse_page(query.data)
+        event = self.registry.get(int(event_id))
+
+        if not event:
+            await query.answer(Key.event_not_found_retry)
+            await query.edit_message_reply_markup(reply_markup=None)
+            return
+
+        await query.answer()
+        attendance_response = await self.controller.retrieve_team_attendance(event_id=event.id)
+        await self._show(query, event, self.render_attendance_page(event, attendance_response, number))
+
+    async def _show(self, query, event: Event, page: Page) -> None:
+        keyboard = []
+        navigation = PaginatedText.build(PAGES_SCOPE, event.id, page)
+        if navigation:
+            keyboard.extend(navigation.inline_keyboard)
+        message = query.message
+        # a message that is already kept updated only pages
+        if self.live_board and not self.live_board.is_tracked(event.id, message.chat.id, message.message_id):
+            keyboard.append([InlineKeyboardButton(Key.live_attendance_button, callback_data=f"live:{event.id}")])
+
+        if keyboard:
+            await query.edit_message_text(text=page.text, reply_markup=InlineKeyboardMarkup(keyboard))
+        else:
+            await query.edit_message_text(text=page.text)
+
+    async def keep_updated(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        query = update.callback_query
+        event_id = int(query.data.split(":", maxsplit=1)[1])
+        event = self.registry.get(event_id)
 
-        male_block = self._render_user_block(attendance.male, include_reason=True)
-        female_block = self._render_user_block(attendance.female, include_reason=True)
-        absent_block = self._render_user_block(attendance.absent, include_reason=True)
-        unindicated_block = self._render_unindicated_block(attendance.unindicated)
+        if not self.live_board or not event:
+            await query.answer(Key.event_not_found_retry)
+            await query.edit_message_reply_markup(reply_markup=None)
+            return
 
-        return template.format(
+        await query.answer(Key.live_attendance_enabled)
+        # the page navigation stays, only the button goes
+        markup = query.message.reply_markup
+        keyboard = [
+            row for row in (markup.inline_keyboard if markup else ())
+            if not any(button.callback_data == query.data for button in row)
+        ]
+        await query.edit_message_reply_markup(reply_markup=InlineKeyboardMarkup(keyboard) if keyboard else None)
+        await self.live_board.track(
+            event,
+            chat_id=query.message.chat.id,
+            message_id=query.message.message_id,
+            pin=query.message.chat.type in (Chat.GROUP, Chat.SUPERGROUP),
+        )
+
+    def build_attendance_message(
+        self,
+        event: Event,
+        attendance: RosterRecord,
+        timestamp: Optional[str] = None,
+    ) -> str:
+        """Render the team attendance message, stamped with the current time unless ``timestamp`` is given.
+
+        Only the first page is rendered when the report does not fit in one message.
+        """
+        return self.render_attendance_page(event, attendance, 0, timestamp).text
+
+    def build_live_message(
+        self,
+        event: Event,
+        attendance: RosterRecord,
+        timestamp: Optional[str] = None,
+    ) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+        """The first page of the team attendance message with the navigation to the others, for the live board."""
+        page = self.render_attendance_page(event, attendance, 0, timestamp)
+        return page.text, PaginatedText.build(PAGES_SCOPE, event.id, page)
+
+    def render_attendance_page(
+        self,
+        event: Event,
+        attendance: RosterRecord,
+        number: int,
+        timestamp: Optional[str] = None,
+    ) -> Page:
+        """Render page ``number`` of the team attendance report, without rendering the pages after it."""
+        return PaginatedText.page(self._report_sections(event, attendance, timestamp), number)
+
+    def _report_sections(
+        self,
+        event: Event,
+        attendance: RosterRecord,
+        timestamp: Optional[str],
+    ) -> Iterator[Iterator[str]]:
+        """The report as sections of lines, split at the blank lines of the template and rendered lazily."""
+        fields = dict(
             title=event.title,
             start=self._format_event_datetime(event.start),
-            total=total_attending,
+            total=len(attendance.male) + len(attendance.female),
             male_count=len(attendance.male),
-            male_block=male_block,
             female_count=len(attendance.female),
-            female_block=female_block,
             absent_count=len(attendance.absent),
-            absent_block=absent_block,
             unindicated_count=len(attendance.unindicated),
-            unindicated_block=unindicated_block,
-            timestamp=self._format_last_updated(),
+            timestamp=self._format_last_updated() if timestamp is None else timestamp,
         )
+        blocks: Dict[str, Callable[[], Iterator[str]]] = {
+            "male_block": lambda: self._render_user_lines(attendance.male, include_reason=True),
+            "female_block": lambda: self._render_user_lines(attendance.female, include_reason=True),
+            "absent_block": lambda: self._render_user_lines(attendance.absent, include_reason=True),
+            "unindicated_block": lambda: self._render_user_lines(
+                attendance.unindicated, include_reason=False, unindicated=True
+            ),
+        }
+
+        section: List[str] = []
+        for line in str(Key.team_attendance_message).split("\n"):
+            if line:
+                section.append(line)
+            elif section:
+                yield self._render_section(section, fields, blocks)
+                section = []
+        if section:
+            yield self._render_section(section, fields, blocks)
+
+    @staticmethod
+    def _render_section(
+        template_lines: List[str],
+        fields: Dict[str, object],
+        blocks: Dict[str, Callable[[], Iterator[str]]],
+    ) -> Iterator[str]:
+        for line in template_lines:
+            block = blocks.get(line[1:-1]) if line.startswith("{") and line.endswith("}") else None
+            if block:
+                yield from block()
+            else:
+                # a block sharing its line with other text is rendered whole
+                inline_blocks = {name: "\n".join(lines()) for name, lines in blocks.items() if f"{{{name}}}" in line}
+                yield line.format(**fields, **inline_blocks)
 
-    def _render_user_block(self, users: List[UserAttendance], include_reason: bool) -> str:
+    def _render_user_lines(
+        self,
+        users: Sequence[UserAttendanceRecord],
+        include_reason: bool,
+        unindicated: bool = False,
+    ) -> Iterator[str]:
         if not users:
-            return Key.team_attendance_empty_section
-        return "\n".join(
-            self._format_user_line(user, include_reason=include_reason) for user in users
+            yield Key.team_attendance_empty_section
+            return
+
+        # everything a line depends on besides the member, the templates change with the locale
+        scope = self._render_scope(include_reason, unindicated)
+        guest = AccessCategory.GUEST
+        line_keys = tuple(
+            (scope, user.name, user.telegram_user, user.access is guest, user.attendance.status, user.attendance.reason)
+            for user in users
         )
+        block = self.render_cache.get(line_keys)
+        if block is not None:
+            yield from block
+            return
 
-    def _render_unindicated_block(self, users: List[UserAttendance]) -> str:
-        if not users:
-            return Key.team_attendance_empty_section
-        return "\n".join(
-            self._format_user_line(user, include_reason=False, unindicated=True) for user in users
+        lines: List[str] = []
+        for line_key, user in zip(line_keys, users):
+            line = self.render_cache.get(line_key)
+            if line is None:
+                line = self.render_cache.put(
+                    line_key,
+                    self._format_user_line(user, include_reason=include_reason, unindicated=unindicated),
+                )
+            lines.append(line)
+            yield line
+        # only complete blocks are kept, rendering a single page may stop partway through one
+        self.render_cache.put(line_keys, tuple(lines))
+
+    def _render_scope(self, include_reason: bool, unindicated: bool) -> int:
+        """Small id standing for the templates and options of a roster block, cheaper to hash than they are."""
+        scope = (
+            str(Key.team_attendance_user),
+            str(Key.team_attendance_user_guest),
+            str(Key.team_attendance_user_unindicated),
+            include_reason,
+            unindicated,
         )
+        return self._render_scopes.setdefault(scope, len(self._render_scopes))
 
-    def _format_user_line(self, user: UserAttendance, include_reason: bool = True, unindicated: bool = False) -> str:
+    def _format_user_line(self, user: UserAttendanceRecord, include_reason: bool = True, unindicated: bool = False) -> str:
         reason_text = ""
         if include_reason and user.attendance.reason:
             reason_text = f" ({user.attendance.reason})"
@@ -1,13 +1,15 @@
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 
 from telegram import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message, Update
-from telegram.ext import CallbackQueryHandler, CommandHandler, ConversationHandler, ContextTypes
+from telegram.ext import CommandHandler, ConversationHandler, ContextTypes
 
+from command_handlers.callback_router import CallbackRouter
 from command_handlers.conversations.conversation_flow import ConversationFlow
 from controllers.manage_access_controller import ManageAccessControlling
 from localization import Key
 from models.enums import AccessCategory
 from models.models import User
+from services.callback_codec import CallbackCodec, InvalidCallbackData
 
 (
     SHOWING_CATEGORIES,
@@ -16,44 +18,91 @@ from models.models import User
     CONFIRMING_ACCESS,
 ) = range(4)
 
+# signed callback data carries an access category as its position here
+ACCESS_CATEGORIES: Tuple[AccessCategory, ...] = tuple(AccessCategory)
+
 
 class ManageAccessConversation(ConversationFlow):
-    def __init__(self, controller: ManageAccessControlling):
+    """
+    Lets admins change the access category of a user.
+
+    With a ``codec`` the flow is stateless: every button carries the category, user
+    and access chosen so far in signed callback data, and nothing is kept in
+    ``context.user_data`` or the conversation state between taps. Any worker can
+    then handle any tap, the users of a category are fetched again when needed.
+    """
+
+    user_data_keys = (
+        "categories",
+        "selected_category",
+        "users",
+        "selected_user",
+        "access_options",
+        "selected_access",
+    )
+
+    def __init__(self, controller: ManageAccessControlling, codec: Optional[CallbackCodec] = None):
         self.controller = controller
+        self.codec = codec
 
     @property
     def conversation_handler(self) -> ConversationHandler:
-        category_pattern = r"^category:.+$"
-        user_pattern = r"^user:\d+$"
-        access_pattern = r"^access:.+$"
+        if self.codec is not None:
+            # every tap is an entry point, its callback data says where the user is
+            return ConversationHandler(
+                entry_points=[
+                    CommandHandler("manage_access", self.show_categories),
+                    CallbackRouter({
+                        "access:categories": self.show_categories,
+                        "access:category": self.show_users_signed,
+                        "access:user": self.show_access_options_signed,
+                        "access:level": self.choose_access_signed,
+                        "access:confirm": self.confirm_access_signed,
+                    }),
+                ],
+                states={},
+                fallbacks=[],
+                name=self.name,
+                persistent=self.persistent,
+                allow_reentry=True,
+            )
 
         return ConversationHandler(
             entry_points=[CommandHandler("manage_access", self.show_categories)],
             states={
-                SHOWING_CATEGORIES: [CallbackQueryHandler(self.show_users, pattern=category_pattern)],
+                SHOWING_CATEGORIES: [CallbackRouter({"access:category": self.show_users})],
                 SHOWING_USERS: [
-                    CallbackQueryHandler(self.back_to_categories, pattern="^back:categories$"),
-                    CallbackQueryHandler(self.show_access_options, pattern=user_pattern),
+                    CallbackRouter({
+                        "access:back": self.back_to_categories,
+                        "access:user": self.show_access_options,
+                    }),
                 ],
                 SHOWING_ACCESS_OPTIONS: [
-                    CallbackQueryHandler(self.back_to_users, pattern="^back:users$"),
-                    CallbackQueryHandler(self.choose_access, pattern=access_pattern),
+                    CallbackRouter({
+                        "access:back": self.back_to_users,
+                        "access:level": self.choose_access,
+                    }),
                 ],
                 CONFIRMING_ACCESS: [
-                    CallbackQueryHandler(self.back_to_access_options, pattern="^back:access$"),
-                    CallbackQueryHandler(self.confirm_access, pattern="^confirm:set_access$"),
+                    CallbackRouter({
+                        "access:back": self.back_to_access_options,
+                        "access:confirm": self.confirm_access,
+                    }),
                 ],
             },
             fallbacks=[],
+            name=self.name,
+            persistent=self.persistent,
             allow_reentry=True,
         )
 
     async def show_categories(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-        categories = self.controller.retrieve_access_categories()
-        context.user_data["categories"] = categories
+        categories = await self.controller.retrieve_access_categories()
+        if self.codec is None:
+            context.user_data["categories"] = categories
 
         keyboard = [
-            [InlineKeyboardButton(cat.value.title(), callback_data=f"category:{cat.value}")]
+            [InlineKeyboardButton(cat.value.title(), callback_data=self._data(update, "category", cat.value, cat))]
             for cat in categories
         ]
         markup = InlineKeyboardMarkup(keyboard)
@@ -66,84 +115,48 @@ class ManageAccessConversation(ConversationFlow):
             message: Message = update.message
             await message.reply_text(Key.manage_access_select_category, reply_markup=markup)
 
-        return SHOWING_CATEGORIES
+        return self._next(SHOWING_CATEGORIES)
 
     async def show_users(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         query: CallbackQuery = update.callback_query
         await query.answer()
 
-        _, category_value = query.data.split(":", 1)
+        category_value = CallbackRouter.payload(query.data)
         category = AccessCategory(category_value)
         context.user_data["selected_category"] = category
 
-        users = self.controller.retrieve_users(category)
+        users = await self.controller.retrieve_users(category)
         context.user_data["users"] = users
 
-        keyboard = [
-            [InlineKeyboardButton(user.name, callback_data=f"user:{user.id}")]
-            for user in users
-        ]
-        keyboard.append(
-            [InlineKeyboardButton(Key.manage_access_back_button, callback_data="back:categories")]
-        )
-
-        await query.edit_message_text(
-            text=Key.manage_access_users_in_category.format(category=category.value.title()),
-            reply_markup=InlineKeyboardMarkup(keyboard),
-        )
+        await self._edit_users(update, category, users)
         return SHOWING_USERS
 
     async def show_access_options(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         query: CallbackQuery = update.callback_query
         await query.answer()
 
-        _, user_id_text = query.data.split(":", 1)
+        user_id_text = CallbackRouter.payload(query.data)
         user_id = int(user_id_text)
         users: List[User] = context.user_data.get("users", [])
         selected_user = next((u for u in users if u.id == user_id), None)
         context.user_data["selected_user"] = selected_user
 
-        options = self._access_options_for_user(selected_user)
+        options = await self._access_options_for_user(selected_user)
         context.user_data["access_options"] = options
 
-        keyboard = [
-            [InlineKeyboardButton(opt.value.title(), callback_data=f"access:{opt.value}")]
-            for opt in options
-        ]
-        keyboard.append(
-            [InlineKeyboardButton(Key.manage_access_back_button, callback_data="back:users")]
-        )
-
-        await query.edit_message_text(
-            text=Key.manage_access_access_options.format(name=selected_user.name),
-            reply_markup=InlineKeyboardMarkup(keyboard),
-        )
+        await self._edit_access_options(update, context.user_data.get("selected_category"), selected_user, options)
         return SHOWING_ACCESS_OPTIONS
 
     async def choose_access(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         query: CallbackQuery = update.callback_query
         await query.answer()
 
-        _, access_value = query.data.split(":", 1)
+        access_value = CallbackRouter.payload(query.data)
         selected_access = AccessCategory(access_value)
         context.user_data["selected_access"] = selected_access
 
         selected_user: User = context.user_data.get("selected_user")
-        keyboard = [
-            [
-                InlineKeyboardButton(
-                    Key.manage_access_confirm_button, callback_data="confirm:set_access"
-                )
-            ],
-            [InlineKeyboardButton(Key.manage_access_back_button, callback_data="back:access")],
-        ]
-
-        await query.edit_message_text(
-            text=Key.manage_access_set_access_confirmation.format(
-                name=selected_user.name, access=selected_access.value.title()
-            ),
-            reply_markup=InlineKeyboardMarkup(keyboard),
-        )
+        await self._edit_confirmation(update, context.user_data.get("selected_category"), selected_user, selected_access)
         return CONFIRMING_ACCESS
 
     async def confirm_access(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -152,13 +165,7 @@ class ManageAccessConversation(ConversationFlow):
 
         user: User = context.user_data.get("selected_user")
         selected_access: AccessCategory = context.user_data.get("selected_access")
-        self.controller.set_access(user, selected_access)
-
-        await query.edit_message_text(
-            text=Key.manage_access_access_updated.format(
-                name=user.name, access=selected_access.value.title()
-            ),
-        )
+        await self._set_access(query, user, selected_access)
         return ConversationHandler.END
 
     async def back_to_access_options(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -167,18 +174,7 @@ class ManageAccessConversation(ConversationFlow):
 
         selected_user: User = context.user_data.get("selected_user")
         options: List[AccessCategory] = context.user_data.get("access_options", [])
-        keyboard = [
-            [InlineKeyboardButton(opt.value.title(), callback_data=f"access:{opt.value}")]
-            for opt in options
-        ]
-        keyboard.append(
-            [InlineKeyboardButton(Key.manage_access_back_button, callback_data="back:users")]
-        )
-
-        await query.edit_message_text(
-            text=Key.manage_access_access_options.format(name=selected_user.name),
-            reply_markup=InlineKeyboardMarkup(keyboard),
-        )
+        await self._edit_access_options(update, context.user_data.get("selected_category"), selected_user, options)
         return SHOWING_ACCESS_OPTIONS
 
     async def back_to_users(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -187,25 +183,169 @@ class ManageAccessConversation(ConversationFlow):
 
         category: AccessCategory = context.user_data.get("selected_category")
         users: List[User] = context.user_data.get("users", [])
+        await self._edit_users(update, category, users)
+        return SHOWING_USERS
+
+    async def back_to_categories(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        return await self.show_categories(update, context)
+
+    async def show_users_signed(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        query: CallbackQuery = update.callback_query
+        await query.answer()
+
+        fields = await self._signed_fields(update, 1)
+        if fields is None:
+            return ConversationHandler.END
+        category = ACCESS_CATEGORIES[fields[0]]
+
+        await self._edit_users(update, category, await self.controller.retrieve_users(category))
+        return ConversationHandler.END
 
+    async def show_access_options_signed(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        query: CallbackQuery = update.callback_query
+        await query.answer()
+
+        selection = await self._signed_selection(update, 2)
+        if selection is None:
+            return ConversationHandler.END
+        category, user, _ = selection
+
+        options = await self._access_options_for_user(user)
+        await self._edit_access_options(update, category, user, options)
+        return ConversationHandler.END
+
+    async def choose_access_signed(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        query: CallbackQuery = update.callback_query
+        await query.answer()
+
+        selection = await self._signed_selection(update, 3)
+        if selection is None:
+            return ConversationHandler.END
+
+        await self._edit_confirmation(update, *selection)
+        return ConversationHandler.END
+
+    async def confirm_access_signed(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        query: CallbackQuery = update.callback_query
+        await query.answer()
+
+        selection = await self._signed_selection(update, 3)
+        if selection is None:
+            return ConversationHandler.END
+        _, user, access = selection
+
+        await self._set_access(query, user, access)
+        return ConversationHandler.END
+
+    async def _edit_users(self, update: Update, category: AccessCategory, users: Sequence[User]) -> None:
         keyboard = [
-            [InlineKeyboardButton(user.name, callback_data=f"user:{user.id}")]
+            [InlineKeyboardButton(user.name, callback_data=self._data(update, "user", user.id, category, user.id))]
             for user in users
         ]
-        keyboard.append(
-            [InlineKeyboardButton(Key.manage_access_back_button, callback_data="back:categories")]
-        )
+        # signed buttons go back by showing the previous step again
+        back = self._data(update, "back", "categories") if self.codec is None else self._data(update, "categories")
+        keyboard.append([InlineKeyboardButton(Key.manage_access_back_button, callback_data=back)])
 
-        await query.edit_message_text(
+        await update.callback_query.edit_message_text(
             text=Key.manage_access_users_in_category.format(category=category.value.title()),
             reply_markup=InlineKeyboardMarkup(keyboard),
         )
-        return SHOWING_USERS
 
-    async def back_to_categories(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-        return await self.show_categories(update, context)
+    async def _edit_access_options(
+        self, update: Update, category: AccessCategory, user: User, options: Sequence[AccessCategory]
+    ) -> None:
+        keyboard = [
+            [
+                InlineKeyboardButton(
+                    opt.value.title(), callback_data=self._data(update, "level", opt.value, category, user.id, opt)
+                )
+            ]
+            for opt in options
+        ]
+        if self.codec is None:
+            back = self._data(update, "back", "users")
+        else:
+            back = self._data(update, "category", None, category)
+        keyboard.append([InlineKeyboardButton(Key.manage_access_back_button, callback_data=back)])
+
+        await update.callback_query.edit_message_text(
+            text=Key.manage_access_access_options.format(name=user.name),
+            reply_markup=InlineKeyboardMarkup(keyboard),
+        )
+
+    async def _edit_confirmation(
+        self, update: Update, category: AccessCategory, user: User, access: AccessCategory
+    ) -> None:
+        if self.codec is None:
+            back = self._data(update, "back", "access")
+        else:
+            back = self._data(update, "user", None, category, user.id)
+        keyboard = [
+            [
+                InlineKeyboardButton(
+                    Key.manage_access_confirm_button,
+                    callback_data=self._data(update, "confirm", None, category, user.id, access),
+                )
+            ],
+            [InlineKeyboardButton(Key.manage_access_back_button, callback_data=back)],
+        ]
+
+        await update.callback_query.edit_message_text(
+            text=Key.manage_access_set_access_confirmation.format(name=user.name, access=access.value.title()),
+            reply_markup=InlineKeyboardMarkup(keyboard),
+        )
+
+    async def _set_access(self, query: CallbackQuery, user: User, access: AccessCategory) -> None:
+        await self.controller.set_access(user, access)
+        await query.edit_message_text(
+            text=Key.manage_access_access_updated.format(name=user.name, access=access.value.title()),
+        )
 
-    def _access_options_for_user(self, user: User) -> List[AccessCategory]:
+    async def _access_options_for_user(self, user: User) -> List[AccessCategory]:
         if user and user.access_category == AccessCategory.ADMIN:
             return [AccessCategory.ADMIN]
-        return self.controller.retrieve_access_categories()
+        return await self.controller.retrieve_access_categories()
+
+    def _next(self, state: int) -> int:
+        # a stateless flow keeps no conversation state, its next tap is an entry point again
+        return ConversationHandler.END if self.codec is not None else state
+
+    def _data(self, update: Update, verb: str, payload: object = None, *fields: AccessCategory | int) -> str:
+        """Callback data of a button, ``payload`` in the clear, or ``fields`` signed in a stateless flow."""
+        if self.codec is None:
+            return CallbackRouter.encode("access", verb, payload)
+        return self.codec.encode(
+            "access",
+            verb,
+            *(ACCESS_CATEGORIES.index(field) if isinstance(field, AccessCategory) else field for field in fields),
+            user_id=update.effective_user.id,
+        )
+
+    async def _signed_fields(self, update: Update, count: int) -> Optional[Tuple[int, ...]]:
+        """The first ``count`` fields of the tapped button, None after telling the user when they are not valid."""
+        query = update.callback_query
+        try:
+            fields = self.codec.decode(query.data, user_id=update.effective_user.id)
+        except InvalidCallbackData:
+            fields = ()
+        if len(fields) < count:
+            await query.edit_message_text(text=Key.menu_expired_retry)
+            return None
+        return fields[:count]
+
+    async def _signed_selection(
+        self, update: Update, count: int
+    ) -> Optional[Tuple[AccessCategory, User, Optional[AccessCategory]]]:
+        """Category, user and, with three fields, access carried by the tapped button, fetching the user again."""
+        fields = await self._signed_fields(update, count)
+        if fields is None:
+            return None
+
+        category = ACCESS_CATEGORIES[fields[0]]
+        users = await self.controller.retrieve_users(category)
+        user = next((u for u in users if u.id == fields[1]), None)
+        if user is None:
+            # moved to another category since the button was made
+            await update.callback_query.edit_message_text(text=Key.menu_expired_retry)
+            return None
+        return category, user, ACCESS_CATEGORIES[fields[2]] if count > 2 else None
@@ -11,12 +11,15 @@ from telegram.ext import (
     filters,
 )
 
+from command_handlers.callback_router import CallbackRouter
 from command_handlers.conversations.conversation_flow import ConversationFlow
 from controllers.manage_event_controller import ManageEventControlling
 from custom_components.CalendarKeyboardMarkup import CalendarKeyboardMarkup
 from models.enums import AccessCategory
 from models.models import Event
 from localization import Key
+from services.broadcast import Broadcaster
+from services.event_registry import EventRegistry
 
 CHOOSING_EVENT = 1
 SHOWING_EVENT_MENU = 2
@@ -38,12 +41,18 @@ TITLE_PRESETS = [
 
 
 class ManageEventConversation(ConversationFlow):
+    user_data_keys = (
+        "upcoming_event_ids",
+        "selected_event",
+        "initial_calendar_query",
+        "selected_date",
+        "time_message",
+        "title_message",
+    )
+
     @property
     def conversation_handler(self) -> ConversationHandler:
-        date_pattern = rf"^{CalendarKeyboardMarkup.callback_data.date_prefix}\d{{4}}-\d{{2}}-\d{{2}}$"
-        step_pattern = rf"^{CalendarKeyboardMarkup.callback_data.step_prefix}\d{{4}}-\d{{2}}$"
-        access_pattern = rf"^({'|'.join(a.value for a in AccessCategory)})$"
-        event_pattern = r"^event:.+$"
+        calendar_namespace = CalendarKeyboardMarkup.callback_data.namespace
 
         return ConversationHandler(
             entry_points=[
@@ -51,16 +60,20 @@ class ManageEventConversation(ConversationFlow):
             ],
             states={
                 CHOOSING_EVENT: [
-                    CallbackQueryHandler(self.selected_event, pattern=event_pattern),
-                    CallbackQueryHandler(self.select_date, pattern="^set_datetime_new$"),
+                    CallbackRouter({
+                        "event:open": self.selected_event,
+                        "event:date": self.select_date,
+                    }),
                 ],
                 SHOWING_EVENT_MENU: [
-                    CallbackQueryHandler(self.set_event_title, pattern="^set_title$"),
-                    CallbackQueryHandler(self.set_event_description, pattern="^set_description$"),
-                    CallbackQueryHandler(self.select_date, pattern=r"^set_datetime_.+"),
-                    CallbackQueryHandler(self.toggle_accountable_event, pattern="^set_accountability$"),
-                    CallbackQueryHandler(self.set_access, pattern="^set_access$"),
-                    CallbackQueryHandler(self.commit_event, pattern="^confirm_changes$"),
+                    CallbackRouter({
+                        "event:title": self.set_event_title,
+                        "event:description": self.set_event_description,
+                        "event:date": self.select_date,
+                        "event:accountable": self.toggle_accountable_event,
+                        "event:access": self.set_access,
+                        "event:confirm": self.commit_event,
+                    }),
                 ],
                 SETTING_TITLE: [
                     CallbackQueryHandler(self.update_event_title),
@@ -71,41 +84,52 @@ class ManageEventConversation(ConversationFlow):
                     MessageHandler(filters.TEXT & ~filters.COMMAND, self.update_event_description),
                 ],
                 SETTING_DATE: [
-                    CallbackQueryHandler(self.use_start_date, pattern="^use_start_date$"),
-                    CallbackQueryHandler(self.apply_deadline_preset, pattern=r"^deadline_preset:.+$"),
-                    CallbackQueryHandler(self.set_time, pattern=date_pattern),
-                    CallbackQueryHandler(self.select_date, pattern=step_pattern),
+                    CallbackRouter({
+                        "event:use_start": self.use_start_date,
+                        "event:preset": self.apply_deadline_preset,
+                        f"{calendar_namespace}:date": self.set_time,
+                        f"{calendar_namespace}:step": self.select_date,
+                    }),
                 ],
                 SETTING_TIME: [
                     CallbackQueryHandler(self.update_event_datetime),
                     MessageHandler(filters.TEXT & ~filters.COMMAND, self.update_event_datetime),
                 ],
                 SETTING_ACCESS: [
-                    CallbackQueryHandler(self.update_event_access, pattern=access_pattern)
+                    CallbackRouter({"event:category": self.update_event_access}),
                 ]
             },
             fallbacks=[CommandHandler("cancel", self.cancel)],
+            name=self.name,
+            persistent=self.persistent,
         )
 
-    def __init__(self, controller: ManageEventControlling):
+    def __init__(
+        self,
+        controller: ManageEventControlling,
+        broadcaster: Optional[Broadcaster] = None,
+        registry: Optional[EventRegistry] = None,
+    ):
         self.controller = controller
+        self.broadcaster = broadcaster
+        self.registry = registry if registry is not None else EventRegistry()
 
     async def select_or_create_event(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Entry point for /manage_event - show existing events and create button."""
 
-        upcoming_events: List[Event] = self.controller.retrieve_events(from_date=datetime.now())
-        context.user_data["upcoming_events"] = upcoming_events
+        upcoming_events: List[Event] = await self.controller.retrieve_events(from_date=datetime.now())
+        context.user_data["upcoming_event_ids"] = self.registry.put_many(upcoming_events)
 
         buttons: List[List[InlineKeyboardButton]] = [
             [
                 InlineKeyboardButton(
                     f"{event.title} — {self._format_datetime(event.start)}",
-                    callback_data=f"event:{event.id}",
+                    callback_data=f"event:open:{event.id}",
                 )
             ]
             for event in upcoming_events
         ]
-        buttons.append([InlineKeyboardButton(Key.manage_event_create_button, callback_data="set_datetime_new")])
+        buttons.append([InlineKeyboardButton(Key.manage_event_create_button, callback_data="event:date:new")])
 
         reply_markup = InlineKeyboardMarkup(buttons)
         text = Key.manage_event_choose_event if upcoming_events else Key.manage_event_no_events
@@ -118,13 +142,16 @@ class ManageEventConversation(ConversationFlow):
         query = update.callback_query
         await query.answer()
 
-        event_key = query.data.split(":", maxsplit=1)[1]
-        upcoming_events = context.user_data.get("upcoming_events", [])
-        selected_event = next(
-            (event for event in upcoming_events if str(event.id) == event_key), None
-        )
+        event_key = CallbackRouter.payload(query.data)
+        upcoming_event_ids = context.user_data.get("upcoming_event_ids", [])
+        event_id = next((event_id for event_id in upcoming_event_ids if str(event_id) == event_key), None)
+        registered_event = self.registry.get(event_id) if event_id is not None else None
+        if registered_event is None:
+            await query.edit_message_text(text=Key.event_not_found_retry)
+            return ConversationHandler.END
 
-        context.user_data["selected_event"] = selected_event
+        # edit a private draft, the shared event only changes once the changes are saved
+        context.user_data["selected_event"] = registered_event.model_copy(deep=True)
 
         bot_message = await query.edit_message_text(text=Key.manage_event_loaded_event)
 
@@ -161,9 +188,16 @@ class ManageEventConversation(ConversationFlow):
                 range_end=range_end,
             )
             await query.edit_message_reply_markup(reply_markup=markup)
+            self._prefetch_calendar_markup(
+                context=context,
+                year=year,
+                month=month,
+                range_start=range_start,
+                range_end=range_end,
+            )
             return SETTING_DATE
 
-        query_type = query.data.split("_").pop()
+        query_type = CallbackRouter.payload(query.data)
         query_label = self._query_label(query_type)
         context.user_data["initial_calendar_query"] = query_type
 
@@ -182,6 +216,14 @@ class ManageEventConversation(ConversationFlow):
             text=Key.manage_event_select_date_prompt.format(label=query_label),
             reply_markup=markup,
         )
+        self._prefetch_calendar_markup(
+            context=context,
+            year=base_date.year,
+            month=base_date.month,
+            query_type=query_type,
+            range_start=range_start,
+            range_end=range_end,
+        )
 
         return SETTING_DATE
 
@@ -217,7 +259,7 @@ class ManageEventConversation(ConversationFlow):
         query = update.callback_query
         await query.answer()
 
-        preset = query.data.split(":", maxsplit=1)[1]
+        preset = CallbackRouter.payload(query.data)
         selected_event: Event | None = context.user_data.get("selected_event")
         if not selected_event or not selected_event.start:
             return await self.manage_event_main_menu(update, context, await self.ensure_message(query))
@@ -270,7 +312,7 @@ class ManageEventConversation(ConversationFlow):
             return await self._handle_end_before_start(update, context, bot_message)
 
         if initial_query == "new":
-            selected_event = self.controller.create_new_event(start_datetime=selected_datetime)
+            selected_event = await self.controller.create_new_event(start_datetime=selected_datetime)
         elif initial_query == "start":
             selected_event.start = selected_datetime
         elif initial_query == "end":
@@ -305,6 +347,14 @@ class ManageEventConversation(ConversationFlow):
             query = update.callback_query
             ensured = await self.ensure_message(query)
             await ensured.edit_text(text=Key.manage_event_end_before_start, reply_markup=markup)
+        self._prefetch_calendar_markup(
+            context=context,
+            year=base_date.year,
+            month=base_date.month,
+            query_type="end",
+            range_start=range_start,
+            range_end=range_end,
+        )
 
         return SETTING_DATE
 
@@ -382,7 +432,7 @@ class ManageEventConversation(ConversationFlow):
         await query.answer()
 
         buttons = [
-            [InlineKeyboardButton(text=category.value.title(), callback_data=category.value)]
+            [InlineKeyboardButton(text=category.value.title(), callback_data=f"event:category:{category.value}")]
             for category in AccessCategory
         ]
 
@@ -396,7 +446,7 @@ class ManageEventConversation(ConversationFlow):
         query = update.callback_query
         await query.answer()
         selected_event = context.user_data.get("selected_event")
-        selected_event.access_category = AccessCategory(query.data)
+        selected_event.access_category = AccessCategory(CallbackRouter.payload(query.data))
 
         context.user_data["selected_event"] = selected_event
 
@@ -409,10 +459,15 @@ class ManageEventConversation(ConversationFlow):
         await query.answer()
 
         selected_event = context.user_data.get("selected_event")
-        self.controller.update_event(selected_event)
+        is_new_event = selected_event.id < 0
+        await self.controller.update_event(selected_event)
+        self.registry.put(selected_event.model_copy(deep=True))
 
         fields = self._event_display_fields(selected_event)
         await query.edit_message_text(text=Key.manage_event_confirm_changes_summary.format(**fields))
+
+        if is_new_event and self.broadcaster:
+            await self.broadcaster.announce_event(selected_event, admin_chat_id=update.effective_chat.id)
         return ConversationHandler.END
 
     async def cancel(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -454,14 +509,14 @@ class ManageEventConversation(ConversationFlow):
     @property
     def _build_main_menu_buttons(self) -> List[List[InlineKeyboardButton]]:
         return [
-            [InlineKeyboardButton(text=Key.manage_event_set_title_button, callback_data="set_title")],
-            [InlineKeyboardButton(text=Key.manage_event_set_description_button, callback_data="set_description")],
-            [InlineKeyboardButton(text=Key.manage_event_set_start_button, callback_data="set_datetime_start")],
-            [InlineKeyboardButton(text=Key.manage_event_set_end_button, callback_data="set_datetime_end")],
-            [InlineKeyboardButton(text=Key.manage_event_set_deadline_button, callback_data="set_datetime_deadline")],
-            [InlineKeyboardButton(text=Key.manage_event_set_accountability_button, callback_data="set_accountability")],
-            [InlineKeyboardButton(text=Key.manage_event_set_access_button, callback_data="set_access")],
-            [InlineKeyboardButton(text=Key.manage_event_confirm_changes_button, callback_data="confirm_changes")],
+            [InlineKeyboardButton(text=Key.manage_event_set_title_button, callback_data="event:title")],
+            [InlineKeyboardButton(text=Key.manage_event_set_description_button, callback_data="event:description")],
+            [InlineKeyboardButton(text=Key.manage_event_set_start_button, callback_data="event:date:start")],
+            [InlineKeyboardButton(text=Key.manage_event_set_end_button, callback_data="event:date:end")],
+            [InlineKeyboardButton(text=Key.manage_event_set_deadline_button, callback_data="event:date:deadline")],
+            [InlineKeyboardButton(text=Key.manage_event_set_accountability_button, callback_data="event:accountable")],
+            [InlineKeyboardButton(text=Key.manage_event_set_access_button, callback_data="event:access")],
+            [InlineKeyboardButton(text=Key.manage_event_confirm_changes_button, callback_data="event:confirm")],
         ]
 
     def _build_time_keyboard(
@@ -508,16 +563,32 @@ class ManageEventConversation(ConversationFlow):
         range_end: Optional[date] = None,
     ) -> InlineKeyboardMarkup:
         query_type = query_type or context.user_data.get("initial_calendar_query", "start")
-        markup = CalendarKeyboardMarkup.build(
+        return CalendarKeyboardMarkup.build(
+            year=year,
+            month=month,
+            start_date=range_start,
+            end_date=range_end,
+            extra_rows=self._extra_calendar_buttons(context, query_type),
+        )
+
+    def _prefetch_calendar_markup(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        year: int,
+        month: int,
+        query_type: Optional[str] = None,
+        range_start: Optional[date] = None,
+        range_end: Optional[date] = None,
+    ) -> None:
+        """Render the months either side of the one shown, after replying, so stepping to them is a cache hit."""
+        query_type = query_type or context.user_data.get("initial_calendar_query", "start")
+        CalendarKeyboardMarkup.prefetch(
             year=year,
             month=month,
             start_date=range_start,
             end_date=range_end,
+            extra_rows=self._extra_calendar_buttons(context, query_type),
         )
-        extra_rows = self._extra_calendar_buttons(context, query_type)
-        if extra_rows:
-            markup = InlineKeyboardMarkup(list(markup.inline_keyboard) + extra_rows)
-        return markup
 
     @staticmethod
     def _format_datetime(dt: datetime | None) -> str:
@@ -633,22 +704,22 @@ class ManageEventConversation(ConversationFlow):
 
         if query_type in ("end", "deadline") and selected_event and selected_event.start:
             buttons.append(
-                [InlineKeyboardButton(text=Key.manage_event_use_start_date_button, callback_data="use_start_date")]
+                [InlineKeyboardButton(text=Key.manage_event_use_start_date_button, callback_data="event:use_start")]
             )
 
         if query_type == "deadline":
             preset_buttons = [
-                InlineKeyboardButton(text=Key.manage_event_deadline_preset_1d, callback_data="deadline_preset:1d"),
-                InlineKeyboardButton(text=Key.manage_event_deadline_preset_2d, callback_data="deadline_preset:2d"),
+                InlineKeyboardButton(text=Key.manage_event_deadline_preset_1d, callback_data="event:preset:1d"),
+                InlineKeyboardButton(text=Key.manage_event_deadline_preset_2d, callback_data="event:preset:2d"),
             ]
             preset_buttons_hours = [
-                InlineKeyboardButton(text=Key.manage_event_deadline_preset_3h, callback_data="deadline_preset:3h"),
-                InlineKeyboardButton(text=Key.manage_event_deadline_preset_6h, callback_data="deadline_preset:6h"),
+                InlineKeyboardButton(text=Key.manage_event_deadline_preset_3h, callback_data="event:preset:3h"),
+                InlineKeyboardButton(text=Key.manage_event_deadline_preset_6h, callback_data="event:preset:6h"),
             ]
             buttons.append(preset_buttons)
             buttons.append(preset_buttons_hours)
             buttons.append(
-                [InlineKeyboardButton(text=Key.manage_event_deadline_clear_button, callback_data="deadline_preset:none")]
+                [InlineKeyboardButton(text=Key.manage_event_deadline_clear_button, callback_data="event:preset:none")]
             )
 
         return buttons
@@ -1,7 +1,7 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Message
-from telegram.ext import ConversationHandler, CommandHandler, CallbackQueryHandler, MessageHandler, filters, \
-    CallbackContext
+from telegram.ext import ConversationHandler, CommandHandler, MessageHandler, filters, CallbackContext
 
+from command_handlers.callback_router import CallbackRouter
 from command_handlers.conversations.conversation_flow import ConversationFlow
 from controllers.registration_controller import RegistrationControlling
 from localization import Key
@@ -15,6 +15,10 @@ FILLING_TELEGRAM_USER = 4
 
 class RegistrationConversation(ConversationFlow):
 
+    user_data_keys = (
+        "new_user",
+    )
+
     def __init__(self, controller: RegistrationControlling):
         self.controller = controller
 
@@ -27,17 +31,21 @@ class RegistrationConversation(ConversationFlow):
                     MessageHandler(filters.TEXT & ~filters.COMMAND, self.confirm_name_registration),
                     ],
                 CONFIRMING_NAME: [
-                    CallbackQueryHandler(self.handle_gender_selection, pattern="^(Male|Female)$"),
-                    CallbackQueryHandler(self.fill_name, pattern='^back$'),
-                    CallbackQueryHandler(self.fill_telegram_user, pattern='^forward$'),
+                    CallbackRouter({
+                        "register:gender": self.handle_gender_selection,
+                        "register:back": self.fill_name,
+                        "register:forward": self.fill_telegram_user,
+                    }),
                     MessageHandler(filters.TEXT & ~filters.COMMAND, self.confirm_name_registration),
                     ],
                 FILLING_TELEGRAM_USER: [
-                    CallbackQueryHandler(self.commit_registration, pattern="^skip_username$"),
+                    CallbackRouter({"register:skip": self.commit_registration}),
                     MessageHandler(filters.TEXT & ~filters.COMMAND, self.commit_registration),
                     ],
                 },
             fallbacks=[],
+            name=self.name,
+            persistent=self.persistent,
             )
 
     async def select_gender(self, update: Update, context: CallbackContext):
@@ -61,8 +69,8 @@ class RegistrationConversation(ConversationFlow):
         context.user_data["new_user"] = new_user
 
         buttons = [
-            [InlineKeyboardButton(text=Key.registration_gender_male, callback_data='Male')],
-            [InlineKeyboardButton(text=Key.registration_gender_female, callback_data='Female')]
+            [InlineKeyboardButton(text=Key.registration_gender_male, callback_data='register:gender:Male')],
+            [InlineKeyboardButton(text=Key.registration_gender_female, callback_data='register:gender:Female')]
         ]
         keyboard = InlineKeyboardMarkup(buttons)
         await update.message.reply_text(Key.registration_select_gender, reply_markup=keyboard)
@@ -73,7 +81,7 @@ class RegistrationConversation(ConversationFlow):
         await query.answer()
 
         new_user: User = context.user_data.get("new_user")
-        selected_gender = query.data
+        selected_gender = CallbackRouter.payload(query.data)
         if new_user and selected_gender in ("Male", "Female"):
             new_user = new_user.model_copy(update={"gender": Gender(selected_gender)})
             context.user_data["new_user"] = new_user
@@ -112,8 +120,8 @@ class RegistrationConversation(ConversationFlow):
 
         buttons = [
             [
-                InlineKeyboardButton(text=Key.registration_back_button, callback_data='back'),
-                InlineKeyboardButton(text=Key.registration_forward_button, callback_data='forward')
+                InlineKeyboardButton(text=Key.registration_back_button, callback_data='register:back'),
+                InlineKeyboardButton(text=Key.registration_forward_button, callback_data='register:forward')
             ]
         ]
         await self._prompt_confirm_name(update.message, name, buttons)
@@ -129,7 +137,7 @@ class RegistrationConversation(ConversationFlow):
         if new_user and new_user.telegram_user:
             return await self.commit_registration(update, context)
 
-        buttons = [[InlineKeyboardButton(Key.registration_skip_username_button, callback_data="skip_username")]]
+        buttons = [[InlineKeyboardButton(Key.registration_skip_username_button, callback_data="register:skip")]]
         await query.edit_message_text(
             Key.registration_prompt_telegram_user,
             reply_markup=InlineKeyboardMarkup(buttons),
@@ -171,8 +179,8 @@ class RegistrationConversation(ConversationFlow):
         if buttons is None:
             buttons = [
                 [
-                    InlineKeyboardButton(text=Key.registration_back_button, callback_data='back'),
-                    InlineKeyboardButton(text=Key.registration_forward_button, callback_data='forward')
+                    InlineKeyboardButton(text=Key.registration_back_button, callback_data='register:back'),
+                    InlineKeyboardButton(text=Key.registration_forward_button, callback_data='register:forward')
                 ]
             ]
         keyboard = InlineKeyboardMarkup(buttons)
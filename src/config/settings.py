@@ -10,17 +10,103 @@ class Settings(BaseSettings):
     # Bot tokens
     training_bot_token: str = Field(default=os.getenv("TRAINING_BOT_TOKEN", ""))
     admin_bot_token: str = Field(default=os.getenv("ADMIN_BOT_TOKEN", ""))
-    
+
     # Backend service URL
     backend_url: str = Field(default=os.getenv("BACKEND_URL", "http://localhost:8000"))
-    
+
+    # Controller implementation used by the bots: "fake", "http" or "sqlite"
+    controller_backend: str = Field(default=os.getenv("CONTROLLER_BACKEND", "fake"))
+
+    # Database file for the embedded SQLite controllers
+    sqlite_path: str = Field(default=os.getenv("SQLITE_PATH", "attendance.db"))
+
+    # Backend HTTP connection pool
+    backend_max_connections: int = Field(default=int(os.getenv("BACKEND_MAX_CONNECTIONS", "20")))
+    backend_max_keepalive_connections: int = Field(default=int(os.getenv("BACKEND_MAX_KEEPALIVE_CONNECTIONS", "10")))
+    backend_keepalive_expiry: float = Field(default=float(os.getenv("BACKEND_KEEPALIVE_EXPIRY", "30")))
+    backend_timeout: float = Field(default=float(os.getenv("BACKEND_TIMEOUT", "5")))
+    backend_connect_timeout: float = Field(default=float(os.getenv("BACKEND_CONNECT_TIMEOUT", "3")))
+    backend_http2: bool = Field(default=os.getenv("BACKEND_HTTP2", "true").lower() == "true")
+
+    # Upcoming-event cache, set the TTL to 0 to disable it
+    event_cache_ttl: float = Field(default=float(os.getenv("EVENT_CACHE_TTL", "300")))
+    event_cache_max_entries: int = Field(default=int(os.getenv("EVENT_CACHE_MAX_ENTRIES", "1024")))
+
+    # Events shared by all conversations, the least recently used are evicted beyond this
+    event_registry_max_entries: int = Field(default=int(os.getenv("EVENT_REGISTRY_MAX_ENTRIES", "1024")))
+
+    # Seconds a team attendance result is shared between /kaypoh callers
+    team_attendance_freshness: float = Field(default=float(os.getenv("TEAM_ATTENDANCE_FRESHNESS", "2")))
+
+    # Write-behind batching of attendance updates, set the window to 0 to disable it
+    attendance_batch_window: float = Field(default=float(os.getenv("ATTENDANCE_BATCH_WINDOW", "0")))
+    attendance_batch_size: int = Field(default=int(os.getenv("ATTENDANCE_BATCH_SIZE", "50")))
+
+    # Durable outbox for attendance writes, leave the path empty to disable it
+    attendance_outbox_path: str = Field(default=os.getenv("ATTENDANCE_OUTBOX_PATH", ""))
+    outbox_batch_size: int = Field(default=int(os.getenv("OUTBOX_BATCH_SIZE", "50")))
+    outbox_max_attempts: int = Field(default=int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8")))
+    outbox_retry_base_delay: float = Field(default=float(os.getenv("OUTBOX_RETRY_BASE_DELAY", "0.5")))
+    outbox_retry_max_delay: float = Field(default=float(os.getenv("OUTBOX_RETRY_MAX_DELAY", "60")))
+
+    # How updates are received: "polling" or "webhook"
+    bot_mode: str = Field(default=os.getenv("BOT_MODE", "polling"))
+
+    # Webhook listener, WEBHOOK_URL is the public base URL Telegram posts updates to
+    webhook_url: str = Field(default=os.getenv("WEBHOOK_URL", ""))
+    webhook_listen: str = Field(default=os.getenv("WEBHOOK_LISTEN", "0.0.0.0"))
+    webhook_port: int = Field(default=int(os.getenv("WEBHOOK_PORT", "8443")))
+    webhook_path: str = Field(default=os.getenv("WEBHOOK_PATH", "telegram"))
+    webhook_secret_token: str = Field(default=os.getenv("WEBHOOK_SECRET_TOKEN", ""))
+    webhook_max_connections: int = Field(default=int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40")))
+
+    # Users whose updates are processed concurrently, each user's updates stay in order
+    update_concurrency: int = Field(default=int(os.getenv("UPDATE_CONCURRENCY", "1")))
+
+    # Outbound Bot API rate limits in messages per second, set the global rate to 0 to disable limiting
+    send_global_rate: float = Field(default=float(os.getenv("SEND_GLOBAL_RATE", "30")))
+    send_chat_rate: float = Field(default=float(os.getenv("SEND_CHAT_RATE", "1")))
+    send_chat_burst: float = Field(default=float(os.getenv("SEND_CHAT_BURST", "3")))
+    send_group_rate: float = Field(default=float(os.getenv("SEND_GROUP_RATE", "0.33")))
+    send_max_retries: int = Field(default=int(os.getenv("SEND_MAX_RETRIES", "3")))
+
+    # Announcements of new events, leave the state path empty to disable them
+    broadcast_state_path: str = Field(default=os.getenv("BROADCAST_STATE_PATH", ""))
+    broadcast_batch_size: int = Field(default=int(os.getenv("BROADCAST_BATCH_SIZE", "25")))
+    broadcast_batch_interval: float = Field(default=float(os.getenv("BROADCAST_BATCH_INTERVAL", "1")))
+
+    # Team attendance messages the bot keeps updated, leave the path empty to disable them.
+    # Changes are gathered for the debounce in seconds, keep it above TEAM_ATTENDANCE_FRESHNESS
+    live_attendance_path: str = Field(default=os.getenv("LIVE_ATTENDANCE_PATH", ""))
+    live_attendance_debounce: float = Field(default=float(os.getenv("LIVE_ATTENDANCE_DEBOUNCE", "5")))
+
+    # Conversation states and user data kept across restarts, leave the path empty to keep them in memory only
+    persistence_path: str = Field(default=os.getenv("PERSISTENCE_PATH", ""))
+    persistence_update_interval: float = Field(default=float(os.getenv("PERSISTENCE_UPDATE_INTERVAL", "10")))
+
+    # Idle conversations are ended and their user data evicted after these many seconds, 0 keeps them open.
+    # CONVERSATION_TIMEOUTS overrides it per conversation, e.g. "ManageEventConversation=3600,RegistrationConversation=0"
+    conversation_timeout: float = Field(default=float(os.getenv("CONVERSATION_TIMEOUT", "0")))
+    conversation_timeouts: str = Field(default=os.getenv("CONVERSATION_TIMEOUTS", ""))
+    conversation_sweep_interval: float = Field(default=float(os.getenv("CONVERSATION_SWEEP_INTERVAL", "60")))
+
+    # Signs callback data so attendance and access menus run without session state, leave the secret empty
+    # to keep their state in user data. Every worker needs the same secret, signed buttons expire after the max age
+    callback_secret: str = Field(default=os.getenv("CALLBACK_SECRET", ""))
+    callback_max_age: float = Field(default=float(os.getenv("CALLBACK_MAX_AGE", "86400")))
+
+    # Seconds between checks for edited locale files, which are reloaded without a restart; 0 disables reloading
+    locale_reload_interval: float = Field(default=float(os.getenv("LOCALE_RELOAD_INTERVAL", "10")))
+    # Locales kept loaded besides the default one, the least recently used are evicted beyond this
+    locale_cache_size: int = Field(default=int(os.getenv("LOCALE_CACHE_SIZE", "8")))
+
     # Team configuration
     team_name: str = Field(default=os.getenv("TEAM_NAME", "My Team"))
-    
+
     # Environment
     environment: str = Field(default=os.getenv("ENVIRONMENT", "development"))
-    
+
     class Config:
         env_file = ".env"
 
-settings = Settings() 
\ No newline at end of file
+settings = Settings()
\ No newline at end of file
@@ -1,11 +1,13 @@
 import logging
 from abc import ABC, abstractmethod
 from datetime import date, datetime, timedelta
-from typing import List
+from typing import List, Optional
 
 from models.enums import AccessCategory
 from models.models import Attendance, Event
 from models.responses import EventAttendance
+from services.backend_client import BackendClient
+from services.sqlite_database import SqliteDatabase, accessible_categories, event_from_row
 
 
 class AttendanceControlling(ABC):
@@ -20,12 +22,81 @@ class AttendanceControlling(ABC):
         pass
 
 class AttendanceController(AttendanceControlling):
+    """Attendance controller backed by the HTTP backend service."""
+
+    def __init__(self, client: BackendClient, timeout: Optional[float] = None):
+        """
+        Args:
+            client: Shared backend client; its connection pool is reused across calls
+            timeout: Per-call timeout in seconds, defaults to the client's timeout
+        """
+        self.client = client
+        self.timeout = timeout
 
     async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[EventAttendance]:
-        raise NotImplementedError
+        return await self.client.get_model(
+            f"/users/{user_id}/attendance",
+            List[EventAttendance],
+            params={"from_date": from_date.isoformat()},
+            timeout=self.timeout,
+        )
+
+    async def update_attendance(self, events: List[EventAttendance]):
+        payload = [event.attendance.model_dump(mode="json") for event in events]
+        await self.client.post_json("/attendance", payload, timeout=self.timeout)
+
+class SqliteAttendanceController(AttendanceControlling):
+    """Attendance controller backed by the embedded SQLite database."""
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[EventAttendance]:
+        user = await self.database.fetchone("SELECT access_category FROM users WHERE id = ?", (user_id,))
+        access = AccessCategory(user["access_category"]) if user else AccessCategory.PUBLIC
+        categories = accessible_categories(access)
+
+        rows = await self.database.fetchall(
+            f"""
+            SELECT e.*, a.status AS attendance_status, a.reason AS attendance_reason
+            FROM events e
+            LEFT JOIN attendance a ON a.event_id = e.id AND a.user_id = ?
+            WHERE e.start >= ? AND e.access_category IN ({", ".join("?" for _ in categories)})
+            ORDER BY e.start
+            """,
+            (user_id, from_date.isoformat(), *categories),
+        )
+
+        return [
+            EventAttendance(
+                event=event_from_row(row),
+                attendance=Attendance(
+                    event_id=row["id"],
+                    user_id=user_id,
+                    status=None if row["attendance_status"] is None else bool(row["attendance_status"]),
+                    reason=row["attendance_reason"] or "",
+                ),
+            )
+            for row in rows
+        ]
 
-    async def update_attendance(self, events: List[EventAttendance]) -> List[Event]:
-        raise NotImplementedError
+    async def update_attendance(self, events: List[EventAttendance]):
+        await self.database.executemany(
+            """
+            INSERT INTO attendance (event_id, user_id, status, reason)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (event_id, user_id) DO UPDATE SET status = excluded.status, reason = excluded.reason
+            """,
+            [
+                (
+                    item.event.id,
+                    item.attendance.user_id,
+                    None if item.attendance.status is None else int(item.attendance.status),
+                    item.attendance.reason,
+                )
+                for item in events
+            ],
+        )
 
 class FakeAttendanceController(AttendanceControlling):
 
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from controllers.attendance_controller import AttendanceControlling
+from models.responses import EventAttendance
+
+logger = logging.getLogger(__name__)
+
+_PendingItem = Tuple[EventAttendance, asyncio.Future]
+
+
+class BatchingAttendanceController(AttendanceControlling):
+    """
+    Write-behind batching for `update_attendance`.
+
+    Updates from all users are gathered for up to ``max_delay`` seconds, or until
+    ``max_batch_size`` items are pending, and sent to the wrapped controller as one
+    bulk call. Each caller only resumes once the batch holding its own items has
+    been acknowledged, and sees the backend error if that batch failed.
+    """
+
+    def __init__(self, controller: AttendanceControlling, max_delay: float = 0.2, max_batch_size: int = 50):
+        """
+        Args:
+            controller: Controller that receives the bulk updates
+            max_delay: Seconds the first item of a batch waits for others to join
+            max_batch_size: Pending items that trigger an immediate flush
+        """
+        self.controller = controller
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self._pending: List[_PendingItem] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self.batches_sent = 0
+        self.items_sent = 0
+
+    async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[EventAttendance]:
+        return await self.controller.retrieve_upcoming_events(user_id=user_id, from_date=from_date)
+
+    async def update_attendance(self, events: List[EventAttendance]):
+        if not events:
+            return
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for event in events:
+            future = loop.create_future()
+            self._pending.append((event, future))
+            futures.append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_after_delay())
+
+        await asyncio.gather(*futures)
+
+    async def aclose(self) -> None:
+        """Send whatever is still pending and wait for in-flight batches; called on shutdown."""
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "batches_sent": self.batches_sent,
+            "items_sent": self.items_sent,
+            "pending": len(self._pending),
+        }
+
+    async def _flush_after_delay(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        self._timer = None
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._send(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch: List[_PendingItem]) -> None:
+        # a later update for the same user and event supersedes an earlier one in the batch
+        latest: Dict[Tuple[int, int], EventAttendance] = {}
+        for event, _ in batch:
+            latest[(event.attendance.user_id, event.event.id)] = event
+        items = list(latest.values())
+
+        try:
+            await self.controller.update_attendance(events=items)
+        except Exception as e:
+            logger.error(f"Batched attendance update of {len(items)} items failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_sent += 1
+        self.items_sent += len(items)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
@@ -0,0 +1,236 @@
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable, Deque, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from controllers.attendance_controller import AttendanceControlling
+from controllers.manage_event_controller import ManageEventControlling
+from controllers.team_attendance_controller import TeamAttendanceControlling
+from models.models import Event
+from models.records import RosterRecord, to_record
+from models.responses import EventAttendance
+
+CacheKey = Tuple[str, Optional[int], date]
+
+# invalidations remembered for the fetches still in flight, a fetch older than all of them is not cached
+RECENT_INVALIDATIONS = 256
+
+
+@dataclass
+class _CacheEntry:
+    value: Sequence
+    event_ids: FrozenSet[int]
+    from_date: date
+    expires_at: float
+
+
+class UpcomingEventsCache:
+    """
+    TTL + LRU cache for upcoming-event lists, shared by the cached controllers.
+
+    Entries are keyed by (scope, user id, from date). Each entry remembers the
+    event ids it holds so writes can drop only the lists they affect. Values are
+    kept as immutable records and handed out as fresh models, because the
+    conversations mutate the events they keep in ``user_data``; building a model
+    from a record is much cheaper than the deep copy of a model.
+
+    Invalidations bump a generation. A fetch takes the generation before it starts
+    and passes it to `put`, which drops the result when an invalidation since then
+    applies to it, so a list fetched before a write is not served after it.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl: Seconds an entry is served before it is refetched
+            max_entries: Entries kept before the least recently used one is evicted
+            clock: Monotonic time source, overridable for tests
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._generation = 0
+        self._recent_invalidations: Deque[Tuple[int, Callable[[CacheKey, _CacheEntry], bool]]] = deque(
+            maxlen=RECENT_INVALIDATIONS
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    @property
+    def generation(self) -> int:
+        """Taken before fetching a value for `put`."""
+        return self._generation
+
+    @staticmethod
+    def make_key(scope: str, user_id: Optional[int], from_date: date) -> CacheKey:
+        # datetimes are bucketed per day, otherwise datetime.now() callers would never hit
+        if isinstance(from_date, datetime):
+            from_date = from_date.date()
+        return scope, user_id, from_date
+
+    def get(self, key: CacheKey) -> Optional[List]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return [item.to_model() for item in entry.value]
+
+    def put(
+        self,
+        key: CacheKey,
+        value: Sequence,
+        event_ids: FrozenSet[int],
+        generation: Optional[int] = None,
+    ) -> None:
+        """Cache ``value`` unless it was fetched before ``generation`` and invalidated since."""
+        entry = _CacheEntry(value=(), event_ids=event_ids, from_date=key[2], expires_at=self._clock() + self.ttl)
+        if generation is not None and self._invalidated_since(generation, key, entry):
+            self.stale_puts += 1
+            return
+
+        entry.value = [to_record(item) for item in value]
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_event(self, event: Event) -> None:
+        """Drop every list that holds ``event`` or that ``event`` could now appear in."""
+        event_start = event.start.date() if event.start else None
+        self._invalidate_where(
+            lambda key, entry: event.id in entry.event_ids
+            or (event_start is not None and entry.from_date <= event_start)
+        )
+
+    def invalidate_user_event(self, scope: str, user_id: int, event_id: int) -> None:
+        """Drop the ``scope`` lists of one user that hold ``event_id``."""
+        self._invalidate_where(
+            lambda key, entry: key[0] == scope and key[1] == user_id and event_id in entry.event_ids
+        )
+
+    def clear(self) -> None:
+        self._invalidate_where(lambda key, entry: True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+            "size": len(self._entries),
+        }
+
+    def _invalidate_where(self, predicate: Callable[[CacheKey, _CacheEntry], bool]) -> None:
+        stale = [key for key, entry in self._entries.items() if predicate(key, entry)]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        # lists still being fetched are checked against it when they are put
+        self._generation += 1
+        self._recent_invalidations.append((self._generation, predicate))
+
+    def _invalidated_since(self, generation: int, key: CacheKey, entry: _CacheEntry) -> bool:
+        if generation == self._generation:
+            return False
+        if self._recent_invalidations[0][0] > generation + 1:
+            # some of the invalidations since have been forgotten
+            return True
+        return any(
+            predicate(key, entry) for invalidated_at, predicate in self._recent_invalidations
+            if invalidated_at > generation
+        )
+
+
+class CachedAttendanceController(AttendanceControlling):
+    """Read-through cache in front of an `AttendanceControlling`."""
+
+    scope = "attendance"
+
+    def __init__(self, controller: AttendanceControlling, cache: UpcomingEventsCache):
+        self.controller = controller
+        self.cache = cache
+
+    async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[EventAttendance]:
+        key = self.cache.make_key(self.scope, user_id, from_date)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = self.cache.generation
+        events = await self.controller.retrieve_upcoming_events(user_id=user_id, from_date=from_date)
+        self.cache.put(key, events, frozenset(item.event.id for item in events), generation)
+        return events
+
+    async def update_attendance(self, events: List[EventAttendance]):
+        result = await self.controller.update_attendance(events=events)
+        for item in events:
+            self.cache.invalidate_user_event(self.scope, item.attendance.user_id, item.event.id)
+        return result
+
+
+class CachedTeamAttendanceController(TeamAttendanceControlling):
+    """Read-through cache for the event list of a `TeamAttendanceControlling`."""
+
+    scope = "team_attendance"
+
+    def __init__(self, controller: TeamAttendanceControlling, cache: UpcomingEventsCache):
+        self.controller = controller
+        self.cache = cache
+
+    async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[Event]:
+        key = self.cache.make_key(self.scope, user_id, from_date)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = self.cache.generation
+        events = await self.controller.retrieve_upcoming_events(user_id=user_id, from_date=from_date)
+        self.cache.put(key, events, frozenset(event.id for event in events), generation)
+        return events
+
+    async def retrieve_team_attendance(self, event_id: int) -> RosterRecord:
+        return await self.controller.retrieve_team_attendance(event_id=event_id)
+
+
+class CachedManageEventController(ManageEventControlling):
+    """Read-through cache for the event list of a `ManageEventControlling`."""
+
+    scope = "manage_event"
+
+    def __init__(self, controller: ManageEventControlling, cache: UpcomingEventsCache):
+        self.controller = controller
+        self.cache = cache
+
+    async def retrieve_events(self, from_date: datetime) -> List[Event]:
+        key = self.cache.make_key(self.scope, None, from_date)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = self.cache.generation
+        events = await self.controller.retrieve_events(from_date=from_date)
+        self.cache.put(key, events, frozenset(event.id for event in events), generation)
+        return events
+
+    async def create_new_event(self, start_datetime: datetime) -> Event:
+        return await self.controller.create_new_event(start_datetime=start_datetime)
+
+    async def update_event(self, event: Event) -> None:
+        await self.controller.update_event(event)
+        self.cache.invalidate_event(event)
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from datetime import date
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from controllers.attendance_controller import AttendanceControlling
+from controllers.team_attendance_controller import TeamAttendanceControlling
+from models.models import Event
+from models.records import RosterRecord
+from models.responses import EventAttendance
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls for the same key into one in-flight call.
+
+    Every caller that arrives while a call for its key is running awaits that
+    call's result instead of starting another one. A finished result keeps being
+    served for ``freshness`` seconds. Failures are shared with the callers that
+    were waiting but are never kept.
+    """
+
+    def __init__(self, freshness: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            freshness: Seconds a completed result is reused for new callers
+            clock: Monotonic time source, overridable for tests
+        """
+        self.freshness = freshness
+        self._clock = clock
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._results: Dict[Hashable, Tuple[T, float]] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.fresh_hits = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        fresh = self._results.get(key)
+        if fresh is not None:
+            result, expires_at = fresh
+            if expires_at > self._clock():
+                self.fresh_hits += 1
+                return result
+            del self._results[key]
+
+        future = self._in_flight.get(key)
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(self._call(key, func))
+            self._in_flight[key] = future
+        else:
+            self.coalesced += 1
+
+        # shield so one caller giving up does not cancel the call the others are waiting on
+        return await asyncio.shield(future)
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Make the next caller for ``key`` go to the backend.
+
+        Drops the completed result and detaches a call still in flight, which may have
+        read the backend before the change that made the caller forget it. Callers
+        already waiting on that call still get its result.
+        """
+        self._results.pop(key, None)
+        self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "fresh_hits": self.fresh_hits,
+            "in_flight": len(self._in_flight),
+        }
+
+    async def _call(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = asyncio.current_task()
+        try:
+            result = await func()
+        finally:
+            # a forgotten call may have been replaced by a newer one, which stays in flight
+            current = self._in_flight.get(key) is task
+            if current:
+                del self._in_flight[key]
+
+        if self.freshness > 0 and current:
+            now = self._clock()
+            self._prune(now)
+            self._results[key] = (result, now + self.freshness)
+        return result
+
+    def _prune(self, now: float) -> None:
+        expired = [key for key, (_, expires_at) in self._results.items() if expires_at <= now]
+        for key in expired:
+            del self._results[key]
+
+
+class CoalescingTeamAttendanceController(TeamAttendanceControlling):
+    """
+    Shares one backend call per event between concurrent `retrieve_team_attendance` callers.
+
+    The shared `RosterRecord` is handed to every caller, it is immutable so no
+    caller can change it for the others.
+    """
+
+    def __init__(
+        self,
+        controller: TeamAttendanceControlling,
+        freshness: float = 2.0,
+        single_flight: Optional[SingleFlight[RosterRecord]] = None,
+    ):
+        """
+        Args:
+            controller: Controller the coalesced calls go to
+            freshness: Seconds a roster is reused, when no ``single_flight`` is given
+            single_flight: Coalescer shared with a `RosterInvalidatingAttendanceController`
+        """
+        self.controller = controller
+        self.single_flight = single_flight if single_flight is not None else SingleFlight(freshness=freshness)
+
+    async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[Event]:
+        return await self.controller.retrieve_upcoming_events(user_id=user_id, from_date=from_date)
+
+    async def retrieve_team_attendance(self, event_id: int) -> RosterRecord:
+        return await self.single_flight.do(
+            event_id,
+            lambda: self.controller.retrieve_team_attendance(event_id=event_id),
+        )
+
+
+class RosterInvalidatingAttendanceController(AttendanceControlling):
+    """
+    Forgets the coalesced team attendance of the events it writes attendance for.
+
+    Without it a user who marks attendance and then runs /kaypoh within the
+    freshness window would be shown the roster from before their change.
+    """
+
+    def __init__(self, controller: AttendanceControlling, single_flight: SingleFlight[RosterRecord]):
+        self.controller = controller
+        self.single_flight = single_flight
+
+    async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[EventAttendance]:
+        return await self.controller.retrieve_upcoming_events(user_id=user_id, from_date=from_date)
+
+    async def update_attendance(self, events: List[EventAttendance]):
+        result = await self.controller.update_attendance(events=events)
+        for item in events:
+            self.single_flight.forget(item.event.id)
+        return result
@@ -1,13 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import Executor
+from typing import List, Optional
 
+from controllers.thread_pool import ThreadPoolAdapter
 from models.enums import AccessCategory
 from models.models import User
+from services.sqlite_database import SqliteDatabase
 
 
 class ManageAccessControlling(ABC):
     """Interface for managing user access levels."""
 
+    @abstractmethod
+    async def retrieve_access_categories(self) -> List[AccessCategory]:
+        """Return available access categories that can be managed."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def retrieve_users(self, category: AccessCategory) -> List[User]:
+        """Return users within the selected access category."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_access(self, user: User, access: AccessCategory) -> None:
+        """Persist the updated access for the provided user."""
+        raise NotImplementedError
+
+
+class SyncManageAccessControlling(ABC):
+    """Blocking variant of `ManageAccessControlling`, wrap with `ThreadPoolManageAccessController`."""
+
     @abstractmethod
     def retrieve_access_categories(self) -> List[AccessCategory]:
         """Return available access categories that can be managed."""
@@ -24,17 +46,57 @@ class ManageAccessControlling(ABC):
         raise NotImplementedError
 
 
+class ThreadPoolManageAccessController(ThreadPoolAdapter, ManageAccessControlling):
+    """Runs a blocking `SyncManageAccessControlling` on a thread pool."""
+
+    def __init__(self, controller: SyncManageAccessControlling, executor: Optional[Executor] = None):
+        super().__init__(executor=executor)
+        self.controller = controller
+
+    async def retrieve_access_categories(self) -> List[AccessCategory]:
+        return await self._run(self.controller.retrieve_access_categories)
+
+    async def retrieve_users(self, category: AccessCategory) -> List[User]:
+        return await self._run(self.controller.retrieve_users, category)
+
+    async def set_access(self, user: User, access: AccessCategory) -> None:
+        return await self._run(self.controller.set_access, user, access)
+
+
 class ManageAccessController(ManageAccessControlling):
-    def retrieve_access_categories(self) -> List[AccessCategory]:
+    async def retrieve_access_categories(self) -> List[AccessCategory]:
         raise NotImplementedError
 
-    def retrieve_users(self, category: AccessCategory) -> List[User]:
+    async def retrieve_users(self, category: AccessCategory) -> List[User]:
         raise NotImplementedError
 
-    def set_access(self, user: User, access: AccessCategory) -> None:
+    async def set_access(self, user: User, access: AccessCategory) -> None:
         raise NotImplementedError
 
 
+class SqliteManageAccessController(ManageAccessControlling):
+    """Access management backed by the embedded SQLite database."""
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    async def retrieve_access_categories(self) -> List[AccessCategory]:
+        return list(AccessCategory)
+
+    async def retrieve_users(self, category: AccessCategory) -> List[User]:
+        rows = await self.database.fetchall(
+            "SELECT * FROM users WHERE access_category = ? ORDER BY name COLLATE NOCASE",
+            (category.value,),
+        )
+        return [User(**dict(row)) for row in rows]
+
+    async def set_access(self, user: User, access: AccessCategory) -> None:
+        await self.database.execute(
+            "UPDATE users SET access_category = ? WHERE id = ?",
+            (access.value, user.id),
+        )
+
+
 class FakeManageAccessController(ManageAccessControlling):
     def __init__(self):
         self.available_categories = [
@@ -51,13 +113,13 @@ class FakeManageAccessController(ManageAccessControlling):
         ]
         self.last_set_access: tuple[int, AccessCategory] | None = None
 
-    def retrieve_access_categories(self) -> List[AccessCategory]:
+    async def retrieve_access_categories(self) -> List[AccessCategory]:
         return self.available_categories
 
-    def retrieve_users(self, category: AccessCategory) -> List[User]:
+    async def retrieve_users(self, category: AccessCategory) -> List[User]:
         return [user for user in self.sample_users if user.access_category == category]
 
-    def set_access(self, user: User, access: AccessCategory) -> None:
+    async def set_access(self, user: User, access: AccessCategory) -> None:
         for existing in self.sample_users:
             if existing.id == user.id:
                 existing.access_category = access
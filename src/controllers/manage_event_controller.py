@@ -1,12 +1,31 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 
+from controllers.thread_pool import ThreadPoolAdapter
 from models.enums import AccessCategory
 from models.models import Event
+from services.sqlite_database import SqliteDatabase, event_from_row, event_to_params
 
 class ManageEventControlling(ABC):
 
+    @abstractmethod
+    async def retrieve_events(self, from_date: datetime) -> List[Event]:
+        pass
+
+    @abstractmethod
+    async def create_new_event(self, start_datetime: datetime) -> Event:
+        pass
+
+    @abstractmethod
+    async def update_event(self, event: Event) -> None:
+        """upsert an event"""
+        pass
+
+class SyncManageEventControlling(ABC):
+    """Blocking variant of `ManageEventControlling`, wrap with `ThreadPoolManageEventController`."""
+
     @abstractmethod
     def retrieve_events(self, from_date: datetime) -> List[Event]:
         pass
@@ -20,17 +39,84 @@ class ManageEventControlling(ABC):
         """upsert an event"""
         pass
 
+class ThreadPoolManageEventController(ThreadPoolAdapter, ManageEventControlling):
+    """Runs a blocking `SyncManageEventControlling` on a thread pool."""
+
+    def __init__(self, controller: SyncManageEventControlling, executor: Optional[Executor] = None):
+        super().__init__(executor=executor)
+        self.controller = controller
+
+    async def retrieve_events(self, from_date: datetime) -> List[Event]:
+        return await self._run(self.controller.retrieve_events, from_date)
+
+    async def create_new_event(self, start_datetime: datetime) -> Event:
+        return await self._run(self.controller.create_new_event, start_datetime)
+
+    async def update_event(self, event: Event) -> None:
+        return await self._run(self.controller.update_event, event)
+
 class ManageEventController(ManageEventControlling):
 
-    def retrieve_events(self, from_date: datetime) -> List[Event]:
+    async def retrieve_events(self, from_date: datetime) -> List[Event]:
         raise NotImplementedError()
 
-    def create_new_event(self, start_datetime: datetime) -> Event:
+    async def create_new_event(self, start_datetime: datetime) -> Event:
         raise NotImplementedError()
 
-    def update_event(self, event: Event) -> None:
+    async def update_event(self, event: Event) -> None:
         raise NotImplementedError()
 
+class SqliteManageEventController(ManageEventControlling):
+    """Event management backed by the embedded SQLite database."""
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    async def retrieve_events(self, from_date: datetime) -> List[Event]:
+        rows = await self.database.fetchall(
+            "SELECT * FROM events WHERE start >= ? ORDER BY start",
+            (from_date.isoformat(),),
+        )
+        return [event_from_row(row) for row in rows]
+
+    async def create_new_event(self, start_datetime: datetime) -> Event:
+        return Event(
+            id=-1,  # assigned by the database on update_event
+            title="Field Training",
+            start=start_datetime,
+            end=start_datetime + timedelta(hours=3),
+            is_accountable=False,
+            access_category=AccessCategory.GUEST,
+        )
+
+    async def update_event(self, event: Event) -> None:
+        params = event_to_params(event)
+        if event.id < 0:
+            event.id = await self.database.execute(
+                """
+                INSERT INTO events (title, description, start, "end", attendance_deadline, is_accountable, access_category)
+                VALUES (:title, :description, :start, :end, :attendance_deadline, :is_accountable, :access_category)
+                """,
+                params,
+            )
+            return
+
+        await self.database.execute(
+            """
+            INSERT INTO events (id, title, description, start, "end", attendance_deadline, is_accountable, access_category)
+            VALUES (:id, :title, :description, :start, :end, :attendance_deadline, :is_accountable, :access_category)
+            ON CONFLICT (id) DO UPDATE SET
+                title = excluded.title,
+                description = excluded.description,
+                start = excluded.start,
+                "end" = excluded."end",
+                attendance_deadline = excluded.attendance_deadline,
+                is_accountable = excluded.is_accountable,
+                access_category = excluded.access_category
+            """,
+            {"id": event.id, **params},
+        )
+
 class FakeManageEventController(ManageEventControlling):
 
     def __init__(self):
@@ -57,10 +143,10 @@ class FakeManageEventController(ManageEventControlling):
             ),
         ]
 
-    def retrieve_events(self, from_date: datetime) -> List[Event]:
+    async def retrieve_events(self, from_date: datetime) -> List[Event]:
         return self.sample_events
 
-    def create_new_event(self, start_datetime: datetime) -> Event:
+    async def create_new_event(self, start_datetime: datetime) -> Event:
         default_end_datetime = start_datetime + timedelta(hours=3)
 
         return Event(
@@ -72,6 +158,6 @@ class FakeManageEventController(ManageEventControlling):
             access_category=AccessCategory.GUEST,
         )
 
-    def update_event(self, event: Event) -> None:
+    async def update_event(self, event: Event) -> None:
         pass
 
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from pydantic import ValidationError
+
+from controllers.attendance_controller import AttendanceControlling
+from controllers.thread_pool import ThreadPoolAdapter
+from models.models import Attendance
+from models.responses import EventAttendance
+from services.outbox import AppendOnlyOutbox, OutboxEntry
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxAttendanceController(ThreadPoolAdapter, AttendanceControlling):
+    """
+    Acknowledges attendance writes as soon as they are durable in a local outbox.
+
+    `update_attendance` only appends to the outbox and returns; a background task
+    replays the outbox to the wrapped controller in order. Attendance updates are
+    absolute (status and reason), so replaying an entry twice - e.g. after a crash
+    between delivery and acknowledgement - is harmless, and a later entry for the
+    same user and event supersedes earlier ones.
+
+    Users were told their writes succeeded, so while the backend is unreachable
+    (connection errors, timeouts, 502/503/504) deliveries are retried with capped
+    exponential backoff however long that takes. Replay is ordered, so an entry the
+    backend fails on must not hold back the ones after it: a 4xx rejection ends the
+    entry at once, other errors such as a 500 after ``max_attempts`` attempts. Ended
+    entries, and entries whose payload no longer validates, are logged and moved to
+    the outbox's dead-letter log.
+
+    Outbox I/O runs on a single worker thread, which also keeps it ordered.
+    """
+
+    def __init__(
+        self,
+        controller: AttendanceControlling,
+        outbox: AppendOnlyOutbox,
+        max_batch_size: int = 50,
+        max_attempts: int = 8,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 60.0,
+    ):
+        """
+        Args:
+            controller: Controller the outbox is replayed to
+            outbox: Durable log of undelivered updates
+            max_batch_size: Entries replayed per backend call
+            max_attempts: Attempts at an item the backend keeps failing on before it is dead-lettered,
+                attempts while the backend is unreachable are not counted
+            retry_base_delay: Seconds before the first retry, doubled on each further retry
+            retry_max_delay: Upper bound on the delay between retries
+        """
+        super().__init__(executor=ThreadPoolExecutor(max_workers=1, thread_name_prefix="outbox"))
+        self.controller = controller
+        self.outbox = outbox
+        self.max_batch_size = max_batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._wakeup = asyncio.Event()
+        self._replayer: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.dead_lettered = 0
+
+    async def start(self) -> None:
+        """Start replaying, including entries recovered from a previous run."""
+        if self._replayer is None or self._replayer.done():
+            self._replayer = asyncio.ensure_future(self._replay())
+        self._wakeup.set()
+
+    async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[EventAttendance]:
+        events = await self.controller.retrieve_upcoming_events(user_id=user_id, from_date=from_date)
+
+        # overlay writes that have not reached the backend yet so users see their own updates
+        pending = await self._run(self.outbox.pending)
+        overrides: Dict[int, dict] = {}
+        for entry in pending:
+            attendance = entry.payload["attendance"]
+            if attendance["user_id"] == user_id:
+                overrides[entry.payload["event"]["id"]] = attendance
+
+        for item in events:
+            if item.event.id in overrides:
+                item.attendance = Attendance.model_validate(overrides[item.event.id])
+        return events
+
+    async def update_attendance(self, events: List[EventAttendance]):
+        payloads = [item.model_dump(mode="json") for item in events]
+        await self._run(self._append_all, payloads)
+        await self.start()
+
+    async def aclose(self) -> None:
+        """Stop replaying; undelivered entries stay in the outbox for the next start."""
+        if self._replayer is not None:
+            self._replayer.cancel()
+            try:
+                await self._replayer
+            except asyncio.CancelledError:
+                pass
+            self._replayer = None
+        await self._run(self.outbox.close)
+        self.executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self.outbox),
+            "delivered": self.delivered,
+            "dead_lettered": self.dead_lettered,
+        }
+
+    def _append_all(self, payloads: List[dict]) -> None:
+        for payload in payloads:
+            self.outbox.append(payload)
+
+    async def _replay(self) -> None:
+        failures = 0
+        while True:
+            try:
+                # clear before reading so an append that lands in between still wakes us
+                self._wakeup.clear()
+                entries: List[OutboxEntry] = await self._run(self.outbox.pending, self.max_batch_size)
+                if not entries:
+                    await self._wakeup.wait()
+                    continue
+
+                await self._deliver(entries)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                delay = self._retry_delay(failures)
+                logger.error(f"Error replaying the outbox, retrying in {delay:.1f}s: {str(e)}", exc_info=True)
+                await asyncio.sleep(delay)
+
+    async def _deliver(self, entries: List[OutboxEntry]) -> None:
+        """Deliver and acknowledge ``entries``, or move the ones that cannot be delivered to the dead letters."""
+        latest: Dict[Tuple[int, int], Tuple[EventAttendance, List[int]]] = {}
+        for entry in entries:
+            try:
+                item = EventAttendance.model_validate(entry.payload)
+            except ValidationError as e:
+                self.dead_lettered += 1
+                logger.error(
+                    f"Outbox entry {entry.seq} is not valid attendance, moved to {self.outbox.dead_letter_path}: {str(e)}"
+                )
+                await self._run(self.outbox.dead_letter, [entry.seq], str(e))
+                continue
+            key = (item.attendance.user_id, item.event.id)
+            seqs = latest[key][1] if key in latest else []
+            seqs.append(entry.seq)
+            latest[key] = (item, seqs)
+        batch = list(latest.values())
+        if not batch:
+            return
+
+        error = await self._send([item for item, _ in batch])
+        if error is None:
+            self.delivered += len(batch)
+            await self._run(self.outbox.ack, [seq for _, seqs in batch for seq in seqs])
+            return
+
+        # one failing item fails the whole batch, so find it by sending the items one at a time
+        for item, seqs in batch:
+            if len(batch) > 1:
+                error = await self._send([item])
+            if error is None:
+                self.delivered += 1
+                await self._run(self.outbox.ack, seqs)
+                continue
+
+            self.dead_lettered += 1
+            logger.error(
+                f"Backend failed on outbox item for user {item.attendance.user_id} and event {item.event.id}, "
+                f"moved to {self.outbox.dead_letter_path}: {str(error)}"
+            )
+            await self._run(self.outbox.dead_letter, seqs, str(error))
+
+    async def _send(self, items: List[EventAttendance]) -> Optional[Exception]:
+        """
+        Send ``items``, the error if they are rejected or keep failing, else None.
+
+        Retries without limit while the backend is unreachable, and up to ``max_attempts``
+        attempts on other failures.
+        """
+        attempt = failed_attempts = 0
+        while True:
+            try:
+                await self.controller.update_attendance(events=items)
+                return None
+            except Exception as e:
+                if _is_rejection(e):
+                    return e
+                if not _is_unreachable(e):
+                    failed_attempts += 1
+                    if failed_attempts >= self.max_attempts:
+                        return e
+                attempt += 1
+                delay = self._retry_delay(attempt)
+                logger.warning(
+                    f"Outbox delivery of {len(items)} items failed (attempt {attempt}), retrying in {delay:.1f}s: {str(e)}"
+                )
+                await asyncio.sleep(delay)
+
+    def _retry_delay(self, attempt: int) -> float:
+        # the exponent is capped too, so a long outage cannot overflow the float
+        return min(self.retry_max_delay, self.retry_base_delay * 2 ** min(attempt - 1, 32))
+
+
+def _is_rejection(error: Exception) -> bool:
+    """A 4xx response other than a timeout or rate limit: the backend will reject the same request again."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return 400 <= status < 500 and status not in (408, 429)
+    return False
+
+
+def _is_unreachable(error: Exception) -> bool:
+    """The request did not get through to a backend able to answer it, so it says nothing about the items."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in (408, 429, 502, 503, 504)
+    return isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError, asyncio.TimeoutError))
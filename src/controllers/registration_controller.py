@@ -3,8 +3,9 @@ from typing import Dict, Optional
 
 from telegram import User as TelegramUser
 
-from models.enums import UserRecordStatus
+from models.enums import AccessCategory, UserRecordStatus
 from models.models import Gender, User
+from services.sqlite_database import SqliteDatabase
 
 
 class RegistrationControlling(ABC):
@@ -69,6 +70,61 @@ class RegistrationController(RegistrationControlling):
         raise NotImplementedError
 
 
+class SqliteRegistrationController(RegistrationControlling):
+    """Registration backed by the embedded SQLite database."""
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    async def check_user_record(self, telegram_user: TelegramUser) -> UserRecordStatus:
+        existing = await self.database.fetchone(
+            "SELECT telegram_user, access_category FROM users WHERE id = ?",
+            (telegram_user.id,),
+        )
+        if not existing or existing["access_category"] == AccessCategory.PUBLIC.value:
+            return UserRecordStatus.NEW
+
+        if telegram_user.username and existing["telegram_user"] != telegram_user.username:
+            await self.database.execute(
+                "UPDATE users SET telegram_user = ? WHERE id = ?",
+                (telegram_user.username, telegram_user.id),
+            )
+            return UserRecordStatus.UPDATED
+
+        return UserRecordStatus.EXISTS
+
+    async def check_name_conflict(self, name: str) -> bool:
+        row = await self.database.fetchone("SELECT 1 FROM users WHERE name = ?", (name,))
+        return row is not None
+
+    async def submit_user_registration(self, user: User):
+        await self.database.execute(
+            """
+            INSERT INTO users (id, telegram_user, name, access_category, gender)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                telegram_user = excluded.telegram_user,
+                name = excluded.name,
+                gender = excluded.gender
+            """,
+            (
+                user.id,
+                user.telegram_user,
+                user.name,
+                user.access_category.value,
+                user.gender.value if user.gender else None,
+            ),
+        )
+
+    async def create_new_user(self, telegram_id: int, telegram_user: Optional[str], name: str, gender: Gender) -> User:
+        return User(
+            id=telegram_id,
+            telegram_user=telegram_user,
+            name=name,
+            gender=gender,
+        )
+
+
 class FakeRegistrationController(RegistrationControlling):
     """Lightweight fake controller with in-memory sample data."""
 
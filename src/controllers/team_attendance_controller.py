@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
 from datetime import date, datetime
-from typing import List
+from typing import List, Optional
 
+from models.enums import Gender
 from models.models import Event, AccessCategory
+from models.records import AttendanceResponseRecord, RosterRecord, UserAttendanceRecord
 from models.responses.responses import UserAttendanceResponse, UserAttendance, AttendanceResponse
+from services.backend_client import BackendClient
+from services.sqlite_database import SqliteDatabase, accessible_categories, event_from_row
 
 
 class TeamAttendanceControlling(ABC):
@@ -12,16 +16,103 @@ class TeamAttendanceControlling(ABC):
         pass
 
     @abstractmethod
-    async def retrieve_team_attendance(self, event_id: int) -> UserAttendanceResponse:
+    async def retrieve_team_attendance(self, event_id: int) -> RosterRecord:
+        """Attendance of the team for an event, shared between callers and so immutable."""
         pass
 
 
 class TeamAttendanceController(TeamAttendanceControlling):
+    """Team attendance controller backed by the HTTP backend service."""
+
+    def __init__(self, client: BackendClient, timeout: Optional[float] = None):
+        """
+        Args:
+            client: Shared backend client; its connection pool is reused across calls
+            timeout: Per-call timeout in seconds, defaults to the client's timeout
+        """
+        self.client = client
+        self.timeout = timeout
+
+    async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[Event]:
+        return await self.client.get_model(
+            f"/users/{user_id}/events",
+            List[Event],
+            params={"from_date": from_date.isoformat()},
+            timeout=self.timeout,
+        )
+
+    async def retrieve_team_attendance(self, event_id: int) -> RosterRecord:
+        # the whole roster is decoded in one pass over the body, not one member at a time
+        roster = await self.client.get_model(
+            f"/events/{event_id}/attendance", UserAttendanceResponse, timeout=self.timeout
+        )
+        return RosterRecord.from_model(roster)
+
+
+class SqliteTeamAttendanceController(TeamAttendanceControlling):
+    """Team attendance controller backed by the embedded SQLite database."""
+
+    # users of these access levels are expected to respond and show up as unindicated until they do
+    roster_categories = (AccessCategory.MEMBER.value, AccessCategory.ADMIN.value)
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
     async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[Event]:
-        raise NotImplementedError
+        user = await self.database.fetchone("SELECT access_category FROM users WHERE id = ?", (user_id,))
+        access = AccessCategory(user["access_category"]) if user else AccessCategory.PUBLIC
+        categories = accessible_categories(access)
+
+        rows = await self.database.fetchall(
+            f"""
+            SELECT * FROM events
+            WHERE start >= ? AND access_category IN ({", ".join("?" for _ in categories)})
+            ORDER BY start
+            """,
+            (from_date.isoformat(), *categories),
+        )
+        return [event_from_row(row) for row in rows]
+
+    async def retrieve_team_attendance(self, event_id: int) -> RosterRecord:
+        # one query: everyone who responded (attendance primary key) plus roster members who have not
+        rows = await self.database.fetchall(
+            """
+            SELECT u.name, u.telegram_user, u.gender, u.access_category, a.status, a.reason
+            FROM attendance a JOIN users u ON u.id = a.user_id
+            WHERE a.event_id = :event_id
+            UNION ALL
+            SELECT u.name, u.telegram_user, u.gender, u.access_category, NULL, NULL
+            FROM users u
+            WHERE u.access_category IN (:member, :admin)
+              AND NOT EXISTS (SELECT 1 FROM attendance a WHERE a.event_id = :event_id AND a.user_id = u.id)
+            ORDER BY 1 COLLATE NOCASE
+            """,
+            {"event_id": event_id, "member": self.roster_categories[0], "admin": self.roster_categories[1]},
+        )
 
-    async def retrieve_team_attendance(self, event_id: int) -> UserAttendanceResponse:
-        raise NotImplementedError
+        # rows are built straight into records, the database already holds valid values
+        male: List[UserAttendanceRecord] = []
+        female: List[UserAttendanceRecord] = []
+        absent: List[UserAttendanceRecord] = []
+        unindicated: List[UserAttendanceRecord] = []
+        for row in rows:
+            status = None if row["status"] is None else bool(row["status"])
+            user = UserAttendanceRecord(
+                row["name"],
+                row["telegram_user"],
+                row["gender"] or "",
+                AccessCategory(row["access_category"]),
+                AttendanceResponseRecord(status, row["reason"]),
+            )
+            if status is None:
+                unindicated.append(user)
+            elif not status:
+                absent.append(user)
+            elif row["gender"] == Gender.FEMALE.value:
+                female.append(user)
+            else:
+                male.append(user)
+        return RosterRecord(tuple(male), tuple(female), tuple(absent), tuple(unindicated))
 
 
 class FakeTeamAttendanceController(TeamAttendanceControlling):
@@ -40,7 +131,7 @@ class FakeTeamAttendanceController(TeamAttendanceControlling):
     async def retrieve_upcoming_events(self, user_id: int, from_date: date) -> List[Event]:
         return [self.sample_event]
 
-    async def retrieve_team_attendance(self, event_id: int) -> UserAttendanceResponse:
+    async def retrieve_team_attendance(self, event_id: int) -> RosterRecord:
         male_attending = [
             UserAttendance(name="Aaron Seah", telegram_user="aaronseah", gender="M", access=AccessCategory.MEMBER, attendance=AttendanceResponse(status=True, reason="Late 2pm, beach")),
             UserAttendance(name="Aaron Toh", telegram_user="aarontoh", gender="M", access=AccessCategory.MEMBER, attendance=AttendanceResponse(status=True, reason=None)),
@@ -122,9 +213,9 @@ class FakeTeamAttendanceController(TeamAttendanceControlling):
             UserAttendance(name="Royce Chen", telegram_user="royce", gender="M", access=AccessCategory.GUEST, attendance=AttendanceResponse(status=None, reason="checking things out")),
         ]
 
-        return UserAttendanceResponse(
+        return RosterRecord.from_model(UserAttendanceResponse(
             male=male_attending,
             female=female_attending,
             absent=absent,
             unindicated=unindicated,
-        )
+        ))
@@ -0,0 +1,26 @@
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ThreadPoolAdapter:
+    """
+    Base class for adapters that expose a blocking controller through an async interface.
+
+    Calls are handed to a thread pool so a slow backend call only occupies a worker
+    thread instead of freezing the event loop for every other user.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None):
+        """
+        Args:
+            executor: Pool to run blocking calls on; ``None`` uses the loop's default executor
+        """
+        self.executor = executor
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
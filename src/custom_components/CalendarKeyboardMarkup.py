@@ -1,15 +1,17 @@
 from calendar import Calendar, month_name, monthrange
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import date
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 
 @dataclass(frozen=True)
 class CalendarCallbackData:
-    date_prefix: str = "date:"
-    step_prefix: str = "step:"
+    namespace: str = "cal"
+    date_prefix: str = "cal:date:"
+    step_prefix: str = "cal:step:"
 
 
 class CalendarKeyboardMarkup:
@@ -18,11 +20,19 @@ class CalendarKeyboardMarkup:
 
     - Opens directly in month view.
     - Supports previous/next month navigation.
-    - Emits callback data of the form `date:YYYY-MM-DD` for selections and
-      `step:YYYY-MM` for navigation.
+    - Emits callback data of the form `cal:date:YYYY-MM-DD` for selections and
+      `cal:step:YYYY-MM` for navigation, routed by the `cal` namespace.
+    - Markups are memoized in an LRU of `cache_size` months, a month and range
+      always render the same keyboard. Markups are immutable, so a cached one is
+      shared by every conversation showing that month.
     """
 
     callback_data = CalendarCallbackData()
+    cache_size = 256
+    _cache: "OrderedDict[tuple, InlineKeyboardMarkup]" = OrderedDict()
+    _hits = 0
+    _misses = 0
+    _prefetched = 0
 
     @classmethod
     def build(
@@ -32,11 +42,75 @@ class CalendarKeyboardMarkup:
         *,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        extra_rows: Sequence[Sequence[InlineKeyboardButton]] = (),
     ) -> InlineKeyboardMarkup:
+        """Markup for the month, with ``extra_rows`` of buttons below the calendar."""
         today = date.today()
         year = year or today.year
         month = month or today.month
+        key = (year, month, start_date, end_date, tuple(tuple(row) for row in extra_rows))
 
+        markup = cls._cache.get(key)
+        if markup is not None:
+            cls._hits += 1
+            cls._cache.move_to_end(key)
+            return markup
+
+        cls._misses += 1
+        return cls._store(key, cls._build(year, month, start_date, end_date, key[4]))
+
+    @classmethod
+    def prefetch(
+        cls,
+        year: int,
+        month: int,
+        *,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        extra_rows: Sequence[Sequence[InlineKeyboardButton]] = (),
+    ) -> None:
+        """Render the months either side of ``month`` that can be navigated to, so stepping to them is a lookup."""
+        rows = tuple(tuple(row) for row in extra_rows)
+        for delta in (-1, 1):
+            step_year, step_month = cls._step_month(year, month, delta)
+            key = (step_year, step_month, start_date, end_date, rows)
+            if key in cls._cache or not cls._month_within_range(step_year, step_month, start_date, end_date):
+                continue
+            cls._prefetched += 1
+            cls._store(key, cls._build(step_year, step_month, start_date, end_date, rows))
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, float]:
+        lookups = cls._hits + cls._misses
+        return {
+            "entries": len(cls._cache),
+            "hits": cls._hits,
+            "misses": cls._misses,
+            "prefetched": cls._prefetched,
+            "hit_rate": cls._hits / lookups if lookups else 0.0,
+        }
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._cache.clear()
+        cls._hits = cls._misses = cls._prefetched = 0
+
+    @classmethod
+    def _store(cls, key: tuple, markup: InlineKeyboardMarkup) -> InlineKeyboardMarkup:
+        cls._cache[key] = markup
+        while len(cls._cache) > cls.cache_size:
+            cls._cache.popitem(last=False)
+        return markup
+
+    @classmethod
+    def _build(
+        cls,
+        year: int,
+        month: int,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        extra_rows: Tuple[Tuple[InlineKeyboardButton, ...], ...],
+    ) -> InlineKeyboardMarkup:
         cal = Calendar(firstweekday=0)
         month_days = cal.monthdatescalendar(year, month)
 
@@ -89,6 +163,7 @@ class CalendarKeyboardMarkup:
                 ),
             ]
         )
+        keyboard.extend(list(row) for row in extra_rows)
 
         return InlineKeyboardMarkup(keyboard)
 
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+# Telegram rejects longer messages, counted in UTF-16 code units
+MESSAGE_LIMIT = 4096
+
+
+@lru_cache(maxsize=8192)
+def text_length(text: str) -> int:
+    """Length of ``text`` as Telegram counts it, in UTF-16 code units."""
+    # cached, reports re-render mostly the same lines
+    return len(text.encode("utf-16-le")) // 2
+
+
+class Page(NamedTuple):
+    number: int
+    text: str
+    has_next: bool
+
+
+@dataclass(frozen=True)
+class PageCallbackData:
+    prefix: str = "page:"
+
+
+class PaginatedText:
+    """
+    Splits long text into pages that each fit in one Telegram message.
+
+    - Text is given as sections of lines, sections are separated by a blank line.
+    - A section that fits on a page is moved to the next page rather than split,
+      unless the current page is less than half full. Lines are never split unless
+      a single line is longer than a page.
+    - Sections are only consumed up to the requested page, so rendering page 1 of
+      a long report does not render the rest of it.
+    - Emits callback data of the form `page:<scope>:<key>:<number>` for navigation.
+    """
+
+    callback_data = PageCallbackData()
+
+    @classmethod
+    def pages(cls, sections: Iterable[Iterable[str]], limit: int = MESSAGE_LIMIT) -> Iterator[Page]:
+        """Pack ``sections`` into pages of at most ``limit`` characters, lazily."""
+        page: List[str] = []
+        size = 0
+        number = 0
+        for section in sections:
+            lines, section_size = cls._peek(section, limit)
+            if lines is None:
+                continue
+
+            if page and size + 2 + section_size > limit and section_size <= limit and size >= limit // 2:
+                # it fits on a page of its own, start it there rather than split it
+                yield Page(number, "\n".join(page), True)
+                page, size, number = [], 0, number + 1
+            if page:
+                # the blank line between sections
+                page.append("")
+                size += 1
+
+            for line, length in lines:
+                pieces = ((line, length),) if length <= limit else cls._split_line(line, limit)
+                for piece, piece_length in pieces:
+                    if page and size + 1 + piece_length > limit:
+                        while page and not page[-1]:
+                            page.pop()
+                        yield Page(number, "\n".join(page), True)
+                        page, size, number = [], 0, number + 1
+                    size += piece_length + (1 if page else 0)
+                    page.append(piece)
+
+        yield Page(number, "\n".join(page), False)
+
+    @classmethod
+    def page(cls, sections: Iterable[Iterable[str]], number: int, limit: int = MESSAGE_LIMIT) -> Page:
+        """Page ``number``, counted from 0, or the last page when there are fewer."""
+        for page in cls.pages(sections, limit):
+            if page.number >= number or not page.has_next:
+                return page
+        raise AssertionError("pages always ends with a last page")
+
+    @classmethod
+    def build(cls, scope: str, key: int | str, page: Page) -> Optional[InlineKeyboardMarkup]:
+        """Previous/next navigation for ``page``, None when the text fits on a single page."""
+        if page.number == 0 and not page.has_next:
+            return None
+        row = [
+            InlineKeyboardButton(
+                "◀️" if page.number > 0 else " ",
+                callback_data=cls.encode_page(scope, key, page.number - 1) if page.number > 0 else "noop",
+            ),
+            InlineKeyboardButton(str(page.number + 1), callback_data="noop"),
+            InlineKeyboardButton(
+                "▶️" if page.has_next else " ",
+                callback_data=cls.encode_page(scope, key, page.number + 1) if page.has_next else "noop",
+            ),
+        ]
+        return InlineKeyboardMarkup([row])
+
+    @classmethod
+    def pattern(cls, scope: str) -> str:
+        """Callback query pattern matching the navigation of ``scope``."""
+        return rf"^{cls.callback_data.prefix}{scope}:-?\d+:\d+$"
+
+    @classmethod
+    def encode_page(cls, scope: str, key: int | str, number: int) -> str:
+        return f"{cls.callback_data.prefix}{scope}:{key}:{number}"
+
+    @classmethod
+    def parse_page(cls, data: str) -> Tuple[str, str, int]:
+        if not data.startswith(cls.callback_data.prefix):
+            raise ValueError("Not a page callback")
+        scope, key, number = data.removeprefix(cls.callback_data.prefix).rsplit(":", maxsplit=2)
+        return scope, key, int(number)
+
+    @staticmethod
+    def _peek(section: Iterable[str], limit: int) -> Tuple[Optional[Iterator[Tuple[str, int]]], int]:
+        """The lines of ``section`` with their lengths, None when it has none, and its size, read no further
+        than past ``limit``."""
+        lines = ((line, text_length(line)) for line in section)
+        head: List[Tuple[str, int]] = []
+        size = -1
+        for line, length in lines:
+            head.append((line, length))
+            size += length + 1
+            if size > limit:
+                return chain(head, lines), size
+        return (iter(head) if head else None), size
+
+    @staticmethod
+    def _split_line(line: str, limit: int) -> Iterator[Tuple[str, int]]:
+        # half the limit in characters never exceeds it in UTF-16 code units
+        step = max(limit // 2, 1)
+        for start in range(0, len(line), step):
+            piece = line[start:start + step]
+            yield piece, text_length(piece)
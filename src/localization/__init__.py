@@ -1,18 +1,33 @@
 from pathlib import Path
 
-from .locale_store import LocaleStore, LocaleKeyAccessor
+from .locale_store import (
+    CurrentLocaleKeyAccessor,
+    LocaleStore,
+    LocaleKeyAccessor,
+    current_locale,
+    use_locale,
+)
+from .reloader import LocaleReloader
 
 _locale_directory = Path(__file__).parent / "locales"
 _default_locale = "en"
 
 store = LocaleStore(locale_directory=_locale_directory, default_locale=_default_locale)
 
-# Default accessor for convenience
-Key = LocaleKeyAccessor(store)
+# Default accessor for convenience, serves the locale of the user whose update is being handled
+Key = CurrentLocaleKeyAccessor(store)
+
+# Accessor bound to the default locale, for messages addressed to the whole team
+TeamKey = LocaleKeyAccessor(store)
 
 __all__ = [
     "Key",
+    "TeamKey",
     "store",
     "LocaleStore",
     "LocaleKeyAccessor",
+    "CurrentLocaleKeyAccessor",
+    "LocaleReloader",
+    "current_locale",
+    "use_locale",
 ]
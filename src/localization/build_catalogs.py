@@ -0,0 +1,16 @@
+"""Compile every locale JSON into its binary catalog, see `localization.catalog`."""
+import sys
+from pathlib import Path
+
+from localization.catalog import build_catalog
+
+
+def main() -> None:
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent / "locales"
+    for locale_file in sorted(directory.glob("*.json")):
+        target = build_catalog(locale_file)
+        print(f"Compiled {locale_file.name} -> {target.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Binary locale catalogs.
+
+A catalog is the flattened content of one ``locales/<locale>.json`` file, written
+with ``marshal`` next to it as ``<locale>.catalog``. Loading one is a single
+unmarshal, with no JSON parsing or flattening. A catalog records the modification
+time and size of the JSON it was built from, so checking that it is up to date is a
+``stat`` and the JSON is not read at all. Once the JSON changes the catalog is
+ignored, so a stale catalog never hides an edit.
+
+Build the catalogs of every locale with:
+
+    PYTHONPATH=src python -m localization.build_catalogs
+"""
+from __future__ import annotations
+
+import json
+import logging
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SUFFIX = ".catalog"
+# bump when the layout of the entries changes
+CATALOG_VERSION = 2
+
+# flattened key -> (text, is_multiline)
+CatalogEntries = Dict[str, Tuple[str, bool]]
+
+
+def flatten_locale(data: Dict[str, Any], parent_key: str = "") -> CatalogEntries:
+    """Flatten nested locale JSON into dotted keys, joining multi-line arrays."""
+    entries: CatalogEntries = {}
+    for key, value in data.items():
+        new_key = f"{parent_key}.{key}" if parent_key else key
+        if isinstance(value, dict):
+            entries.update(flatten_locale(value, new_key))
+        elif isinstance(value, list):
+            entries[new_key] = ("\n".join(str(line) for line in value), True)
+        else:
+            entries[new_key] = (str(value), False)
+    return entries
+
+
+def source_signature(locale_file: Path) -> Tuple[int, int]:
+    """Modification time and size of ``locale_file``, which change with every edit."""
+    stat = locale_file.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def catalog_path(locale_file: Path) -> Path:
+    return locale_file.with_suffix(CATALOG_SUFFIX)
+
+
+def build_catalog(locale_file: Path) -> Path:
+    """Compile ``locale_file`` into its catalog, replacing any previous one atomically."""
+    # taken before reading, an edit made while building leaves the catalog stale rather than wrong
+    signature = source_signature(locale_file)
+    entries = flatten_locale(json.loads(locale_file.read_bytes()))
+    payload = (CATALOG_VERSION, sys.version_info[:2], signature, entries)
+
+    target = catalog_path(locale_file)
+    tmp_path = target.with_suffix(target.suffix + ".tmp")
+    with tmp_path.open("wb") as file:
+        marshal.dump(payload, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, target)
+    return target
+
+
+def read_entries(locale_file: Path) -> CatalogEntries:
+    """Entries of ``locale_file``, from its catalog when that is up to date, else from the JSON."""
+    entries = _read_catalog(catalog_path(locale_file), source_signature(locale_file))
+    if entries is None:
+        entries = flatten_locale(json.loads(locale_file.read_bytes()))
+    return entries
+
+
+def _read_catalog(path: Path, signature: Tuple[int, int]) -> Optional[CatalogEntries]:
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+    try:
+        version, python_version, built_from, entries = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        logger.warning("Ignoring unreadable locale catalog %s", path)
+        return None
+
+    # marshal is only guaranteed to round-trip within one Python version
+    if version != CATALOG_VERSION or tuple(python_version) != sys.version_info[:2]:
+        return None
+    if tuple(built_from) != signature:
+        logger.info("Locale catalog %s is older than its JSON, loading the JSON instead", path)
+        return None
+    return entries
+
@@ -1,20 +1,101 @@
 from __future__ import annotations
 
-import json
+import keyword
 import logging
+import string
+import weakref
+from collections import OrderedDict
+from contextvars import ContextVar, Token
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .catalog import catalog_path, read_entries
 
 logger = logging.getLogger(__name__)
 
+_parser = string.Formatter()
+_missing = object()
+# names used by the generated functions themselves
+_reserved_names = {"args", "unused"}
+# locale of the update being handled, None serves the default locale
+_current_locale: ContextVar[Optional[str]] = ContextVar("current_locale", default=None)
+
+
+def use_locale(locale: Optional[str]) -> Token:
+    """Serve ``Key`` lookups made from the current context in ``locale``; None restores the default."""
+    return _current_locale.set(locale)
+
+
+def current_locale() -> Optional[str]:
+    return _current_locale.get()
 
-@dataclass(frozen=True, init=False)
+
+def _format_slowly(source: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    return source.format(*args, **{name: value for name, value in kwargs.items() if value is not _missing})
+
+
+def compile_template(source: str) -> Callable[..., str]:
+    """Parse ``source`` once into a function formatting it like ``source.format``.
+
+    Templates whose fields are plain names, like ``"{name}{reason}"``, become a
+    generated function returning an f-string, so a call does not re-parse the
+    template the way ``str.format`` does. Anything else (positional or attribute
+    fields, conversions, format specs) keeps using ``str.format``, as does a call
+    missing a field, so errors are unchanged.
+    """
+    parts: List[str] = []
+    literals: Dict[str, str] = {}
+    field_names: List[str] = []
+    for literal, field_name, format_spec, conversion in _parser.parse(source):
+        if literal:
+            name = f"_literal{len(literals)}"
+            literals[name] = literal
+            parts.append(f"{{{name}}}")
+        if field_name is None:
+            continue
+        if (
+            format_spec
+            or conversion
+            or not field_name.isidentifier()
+            or keyword.iskeyword(field_name)
+            or field_name.startswith("_")
+            or field_name in _reserved_names
+        ):
+            return source.format
+        if field_name not in field_names:
+            field_names.append(field_name)
+        parts.append(f"{{{field_name}}}")
+
+    if not field_names:
+        return source.format
+
+    parameters = ", ".join(f"{name}=_missing" for name in field_names)
+    missing = " or ".join(f"{name} is _missing" for name in field_names)
+    given = ", ".join(f"{name}={name}" for name in field_names)
+    code = (
+        f"def format(*args, {parameters}, **unused):\n"
+        f"    if args or {missing}:\n"
+        f"        return _format_slowly(_source, args, dict(unused, {given}))\n"
+        f"    return f\"{''.join(parts)}\"\n"
+    )
+    namespace: Dict[str, Any] = dict(literals, _missing=_missing, _format_slowly=_format_slowly, _source=source)
+    exec(code, namespace)
+    return namespace["format"]
+
+
+def _rebuild_text(value: str, is_multiline: bool, key: Optional[str], locale: Optional[str]) -> "LocalizedText":
+    return LocalizedText(value, is_multiline=is_multiline, key=key, locale=locale)
+
+
+@dataclass(frozen=True, init=False, eq=False)
 class LocalizedText(str):
     """Localized string value with metadata about formatting.
 
     The string behaves like a regular ``str`` but carries flags that tell
     consumers whether it originated from a multi-line array in the locale file.
+    Its template is compiled once, on the first ``format``, which returns a
+    plain ``str``.
     """
 
     is_multiline: bool = False
@@ -29,38 +110,63 @@ class LocalizedText(str):
         object.__setattr__(obj, "locale", locale)
         return obj
 
-    def format(self, *args: Any, **kwargs: Any) -> "LocalizedText":  # type: ignore[override]
-        formatted_value = super().format(*args, **kwargs)
-        return LocalizedText(
-            formatted_value,
-            is_multiline=self.is_multiline,
-            key=self.key,
-            locale=self.locale,
-        )
+    def format(self, *args: Any, **kwargs: Any) -> str:  # type: ignore[override]
+        compiled = compile_template(str(self))
+        # shadows this method, so later calls go straight to the compiled template
+        object.__setattr__(self, "format", compiled)
+        return compiled(*args, **kwargs)
+
+    def __reduce__(self):
+        # the compiled template cannot be pickled, it is compiled again when unpickled
+        return _rebuild_text, (str(self), self.is_multiline, self.key, self.locale)
+
+
+Catalog = Dict[str, LocalizedText]
+# modification time and size of a locale file, None when missing
+FileSignature = Optional[Tuple[int, int]]
+# JSON and catalog file signatures of every locale in a fallback chain
+Signature = Tuple[Tuple[FileSignature, FileSignature], ...]
 
 
 class LocaleStore:
-    """Loads and serves localized strings from JSON files."""
+    """Loads and serves localized strings from JSON files.
+
+    A locale is read from its binary catalog when one was built from the current
+    JSON (see ``localization.catalog``), otherwise from the JSON itself. Locales
+    other than the default are loaded on first use and kept in an LRU of
+    ``max_locales`` catalogs next to the default locale, which is never evicted.
+
+    Each loaded catalog is merged with its fallbacks, e.g. ``pt_br`` over ``pt``
+    over the default locale, so a key missing from a translation costs the same
+    single lookup as any other key.
 
-    def __init__(self, locale_directory: Path, default_locale: str = "en"):
+    Changed files are picked up by ``reload``, which swaps in the new catalog in a
+    single assignment, so a lookup sees either the old or the new copy but never
+    a mix.
+    """
+
+    def __init__(self, locale_directory: Path, default_locale: str = "en", max_locales: int = 8):
         self.locale_directory = locale_directory
         self.default_locale = default_locale
-        self._translations: Dict[str, Dict[str, LocalizedText]] = {}
+        self.max_locales = max_locales
+        self.available_locales: FrozenSet[str] = self._scan_locales()
+        self._translations: "OrderedDict[str, Catalog]" = OrderedDict()
+        self._signatures: Dict[str, Signature] = {}
+        self._accessors: "weakref.WeakSet[LocaleKeyAccessor]" = weakref.WeakSet()
+        self.loads = 0
+        self.evictions = 0
         self._load_locale(default_locale)
 
     def has_key(self, key: str) -> bool:
         default_catalog = self._translations.get(self.default_locale, {})
         return key in default_catalog
 
-    def translate(self, key: str, *, locale: Optional[str] = None, **kwargs: Any) -> LocalizedText:
+    def translate(self, key: str, *, locale: Optional[str] = None, **kwargs: Any) -> str:
         """Return a translated string, falling back to the default locale."""
 
         target_locale = locale or self.default_locale
-        catalog = self._get_catalog(target_locale)
-        entry = catalog.get(key)
-
-        if entry is None and target_locale != self.default_locale:
-            entry = self._translations[self.default_locale].get(key)
+        # merged with its fallbacks, a key missing from the locale is found here too
+        entry = self._get_catalog(target_locale).get(key)
 
         if entry is None:
             raise KeyError(f"Translation key '{key}' not found for locale '{target_locale}'")
@@ -78,66 +184,219 @@ class LocaleStore:
             return entry.is_multiline
         return False
 
-    def _get_catalog(self, locale: str) -> Dict[str, LocalizedText]:
-        if locale not in self._translations:
+    def resolve_locale(self, language_code: Optional[str]) -> str:
+        """Best available locale for an IETF language tag such as Telegram's ``language_code``.
+
+        ``pt-BR`` resolves to ``pt_br`` when that locale exists, else to ``pt``, else
+        to the default locale.
+        """
+        if not language_code:
+            return self.default_locale
+        locale = language_code.lower().replace("-", "_")
+        available = self.available_locales
+        while locale:
+            if locale in available:
+                return locale
+            locale = locale.rpartition("_")[0]
+        return self.default_locale
+
+    def fallback_chain(self, locale: str) -> List[str]:
+        """Locales consulted for ``locale``, most specific first and ending with the default locale."""
+        chain: List[str] = []
+        while locale:
+            if locale in self.available_locales and locale != self.default_locale:
+                chain.append(locale)
+            locale = locale.rpartition("_")[0]
+        chain.append(self.default_locale)
+        return chain
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "locales": len(self._translations),
+            "max_locales": self.max_locales,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
+
+    def _get_catalog(self, locale: str) -> Catalog:
+        catalog = self._translations.get(locale)
+        if catalog is not None:
+            self._translations.move_to_end(locale)
+            return catalog
+        if locale in self.available_locales:
             self._load_locale(locale)
-        return self._translations.get(locale, self._translations[self.default_locale])
+            self._evict()
+        return self._translations.get(locale) or self._translations[self.default_locale]
+
+    def _evict(self) -> None:
+        for locale in list(self._translations):
+            if len(self._translations) <= self.max_locales + 1:
+                return
+            if locale == self.default_locale:
+                continue
+            del self._translations[locale]
+            del self._signatures[locale]
+            self.evictions += 1
+            for accessor in list(self._accessors):
+                accessor._forget(locale)
+
+    def reload(self) -> List[str]:
+        """Reload the locales whose files changed and return them."""
+        changed = self.changed_catalogs()
+        for locale, (catalog, signature) in changed.items():
+            self.swap(locale, catalog, signature)
+        return list(changed)
+
+    def changed_catalogs(self) -> Dict[str, Tuple[Catalog, Signature]]:
+        """Read the loaded locales whose files changed, without installing them; safe to run in a thread."""
+        self.available_locales = self._scan_locales()
+        changed: Dict[str, Tuple[Catalog, Signature]] = {}
+        for locale, signature in list(self._signatures.items()):
+            if self._signature(locale) == signature:
+                continue
+            try:
+                loaded = self._read_locale(locale)
+            except Exception as e:
+                # e.g. a file caught halfway through being saved, retried on the next reload
+                logger.warning("Could not reload locale '%s': %s", locale, str(e))
+                continue
+            if loaded is not None:
+                changed[locale] = loaded
+        return changed
+
+    def swap(self, locale: str, catalog: Catalog, signature: Signature) -> None:
+        """Install ``catalog`` for ``locale`` and drop the lookups accessors cached from the old one."""
+        if locale != self.default_locale and locale not in self._translations:
+            # evicted while it was being re-read, the next lookup loads it again
+            return
+        self._translations[locale] = catalog
+        self._signatures[locale] = signature
+        for accessor in list(self._accessors):
+            accessor._forget()
 
     def _load_locale(self, locale: str) -> None:
-        locale_file = self.locale_directory / f"{locale}.json"
-        if not locale_file.exists():
-            logger.warning("Locale file for '%s' not found at %s", locale, locale_file)
+        loaded = self._read_locale(locale)
+        if loaded is None:
+            logger.warning("Locale file for '%s' not found in %s", locale, self.locale_directory)
             return
-
-        with locale_file.open("r", encoding="utf-8") as file:
-            raw_data = json.load(file)
-
-        flattened = self._flatten_keys(raw_data)
-        catalog: Dict[str, LocalizedText] = {}
-
-        for key, raw_value in flattened.items():
-            localized_text = self._normalize_value(raw_value, key=key, locale=locale)
-            catalog[key] = localized_text
-
+        catalog, signature = loaded
         self._translations[locale] = catalog
-
-    def _normalize_value(self, value: Any, *, key: Optional[str], locale: str) -> LocalizedText:
-        if isinstance(value, list):
-            joined_value = "\n".join(str(line) for line in value)
-            return LocalizedText(joined_value, is_multiline=True, key=key, locale=locale)
-        return LocalizedText(str(value), is_multiline=False, key=key, locale=locale)
-
-    def _flatten_keys(self, data: Dict[str, Any], parent_key: str = "") -> Dict[str, Any]:
-        items: Dict[str, Any] = {}
-        for key, value in data.items():
-            new_key = f"{parent_key}.{key}" if parent_key else key
-            if isinstance(value, dict):
-                items.update(self._flatten_keys(value, new_key))
-            else:
-                items[new_key] = value
-        return items
+        self._signatures[locale] = signature
+        self.loads += 1
+
+    def _read_locale(self, locale: str) -> Optional[Tuple[Catalog, Signature]]:
+        chain = self.fallback_chain(locale) if locale != self.default_locale else [locale]
+        if chain[0] != locale:
+            return None
+        # taken before reading, so a change made while reading is seen by the next reload
+        signature = self._signature(locale)
+        if any(json_signature is None for json_signature, _ in signature):
+            return None
+
+        # the default locale first, each more specific locale overrides the keys it has
+        catalog: Catalog = {}
+        for fallback in reversed(chain):
+            locale_file = self.locale_directory / f"{fallback}.json"
+            catalog.update(
+                (key, LocalizedText(value, is_multiline=is_multiline, key=key, locale=fallback))
+                for key, (value, is_multiline) in read_entries(locale_file).items()
+            )
+        return catalog, signature
+
+    def _signature(self, locale: str) -> Signature:
+        chain = self.fallback_chain(locale) if locale != self.default_locale else [locale]
+        files = [self.locale_directory / f"{fallback}.json" for fallback in chain]
+        return tuple((self._stat(file), self._stat(catalog_path(file))) for file in files)
+
+    def _scan_locales(self) -> FrozenSet[str]:
+        return frozenset(path.stem for path in self.locale_directory.glob("*.json"))
+
+    @staticmethod
+    def _stat(path: Path) -> FileSignature:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
 
 
 class LocaleKeyAccessor:
-    """Provides attribute access to translation keys."""
+    """Provides attribute access to translation keys.
+
+    Resolved keys and prefixes are cached on the accessor, so repeated lookups such
+    as ``Key.team_attendance_user`` are plain attribute reads after the first one.
+    The cache is dropped whenever the store reloads a catalog.
+    """
 
     def __init__(self, store: LocaleStore, locale: Optional[str] = None, prefix: str = ""):
         self._store = store
         self._locale = locale
         self._prefix = prefix
+        self._locales: Dict[Optional[str], LocaleKeyAccessor] = {}
+        store._accessors.add(self)
 
     def for_locale(self, locale: str) -> "LocaleKeyAccessor":
-        return LocaleKeyAccessor(self._store, locale=locale, prefix=self._prefix)
+        accessor = self._locales.get(locale)
+        if accessor is None:
+            accessor = self._locales[locale] = LocaleKeyAccessor(self._store, locale=locale, prefix=self._prefix)
+        return accessor
 
     def __getattr__(self, item: str) -> LocalizedText:
+        if item.startswith("__"):
+            # keep copy, pickle and mocks from mistaking dunder probes for translation keys
+            raise AttributeError(item)
+
         candidate_key = f"{self._prefix}.{item}" if self._prefix else item
 
         if self._store.has_key(candidate_key):
-            return self._store.translate(candidate_key, locale=self._locale)
-
-        return LocaleKeyAccessor(self._store, locale=self._locale, prefix=candidate_key)
-
-    def __call__(self, **kwargs: Any) -> LocalizedText:
+            value = self._store.translate(candidate_key, locale=self._locale)
+        else:
+            value = LocaleKeyAccessor(self._store, locale=self._locale, prefix=candidate_key)
+
+        # cached as an instance attribute, __getattr__ is not called for it again
+        object.__setattr__(self, item, value)
+        return value
+
+    def _forget(self, locale: Optional[str] = None) -> None:
+        """Drop cached lookups after the store swapped in a reloaded catalog, or evicted ``locale``."""
+        if locale is not None:
+            # the accessor of an evicted locale would otherwise keep its strings alive
+            self._locales.pop(locale, None)
+            if (self._locale or self._store.default_locale) != locale:
+                return
+        for name in [name for name in vars(self) if not name.startswith("_")]:
+            delattr(self, name)
+
+    def __call__(self, **kwargs: Any) -> str:
         if not self._prefix:
             raise ValueError("Cannot format a key without a prefix; select a key first.")
         return self._store.translate(self._prefix, locale=self._locale, **kwargs)
+
+
+class CurrentLocaleKeyAccessor(LocaleKeyAccessor):
+    """Key accessor serving the locale of the update being handled.
+
+    Lookups are delegated to the accessor of the locale set with ``use_locale``,
+    which caches them, so each locale resolves a key once. Work that is not
+    addressed to a single user, such as team announcements, should use an
+    accessor bound to a locale instead.
+    """
+
+    def __getattribute__(self, item: str) -> Any:
+        # intercepts every lookup: going through __getattr__ would first fail a normal lookup, which costs
+        # more than the rest of the delegation, and nothing may be cached here as the next lookup may come
+        # from another user's update
+        if item[:1] == "_" or item == "for_locale":
+            return object.__getattribute__(self, item)
+        accessor = object.__getattribute__(self, "_locales").get(_current_locale.get())
+        if accessor is None:
+            accessor = self._current_accessor()
+        return getattr(accessor, item)
+
+    def _current_accessor(self) -> LocaleKeyAccessor:
+        locale = _current_locale.get()
+        accessor = self.for_locale(locale or self._store.default_locale)
+        if locale is None:
+            # also kept under None, so the default locale is found without resolving it first
+            self._locales[None] = accessor
+        return accessor
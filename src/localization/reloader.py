@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from typing import Optional
+
+from .locale_store import LocaleStore
+
+logger = logging.getLogger(__name__)
+
+
+class LocaleReloader:
+    """
+    Polls the locale files and swaps in changed catalogs while the bot runs.
+
+    Files are checked and re-read in a worker thread; only the swap itself runs on
+    the event loop, so handlers never see a catalog that is half loaded.
+    """
+
+    def __init__(self, store: LocaleStore, interval: float = 10):
+        """
+        Args:
+            store: Store whose loaded locales are watched
+            interval: Seconds between two checks of the locale files
+        """
+        self.store = store
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def reload(self) -> None:
+        changed = await asyncio.to_thread(self.store.changed_catalogs)
+        for locale, (catalog, signature) in changed.items():
+            self.store.swap(locale, catalog, signature)
+            self.reloads += 1
+            logger.info(f"Reloaded locale '{locale}' with {len(catalog)} keys")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"Error reloading locales: {str(e)}", exc_info=True)
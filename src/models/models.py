@@ -4,6 +4,30 @@ from typing import Optional
 
 from models.enums import AccessCategory, Gender
 
+
+def telegram_handle(telegram_user: Optional[str]) -> str:
+    """
+    Display-ready Telegram handle with leading @.
+
+    Returns a placeholder string when no handle is available.
+    """
+    if telegram_user:
+        clean = telegram_user.lstrip("@")
+        return f"@{clean}"
+    return "(not yet set on telegram)"
+
+
+def is_attendance_locked(attendance_deadline: Optional[datetime], now: Optional[datetime] = None) -> bool:
+    """
+    Return True when the attendance deadline has passed.
+    None deadlines mean the event stays open.
+    """
+    if attendance_deadline is None:
+        return False
+
+    return (now or datetime.now()) >= attendance_deadline
+
+
 class User(BaseModel):
     id: int
     telegram_user: Optional[str] = None
@@ -14,15 +38,7 @@ class User(BaseModel):
 
     @property
     def telegram_handle(self) -> str:
-        """
-        Display-ready Telegram handle with leading @.
-
-        Returns a placeholder string when no handle is available.
-        """
-        if self.telegram_user:
-            clean = self.telegram_user.lstrip("@")
-            return f"@{clean}"
-        return "(not yet set on telegram)"
+        return telegram_handle(self.telegram_user)
 
 class Event(BaseModel):
     id: int
@@ -52,14 +68,7 @@ class Event(BaseModel):
             super().__setattr__("attendance_deadline", None)
 
     def is_attendance_locked(self, now: Optional[datetime] = None) -> bool:
-        """
-        Return True when the attendance deadline has passed.
-        None deadlines mean the event stays open.
-        """
-        if self.attendance_deadline is None:
-            return False
-
-        return (now or datetime.now()) >= self.attendance_deadline
+        return is_attendance_locked(self.attendance_deadline, now)
 
 class Attendance(BaseModel):
     user_id: int = None
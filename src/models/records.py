@@ -0,0 +1,213 @@
+"""
+Slotted, immutable records of the models for read-heavy paths.
+
+The pydantic models validate data where it enters or leaves the bot: backend
+responses, persisted state and the objects conversations edit. Rosters that are
+rendered over and over and event lists that sit in caches are kept as records
+instead. A record has ``__slots__`` rather than an instance ``__dict__`` and the
+validation state of a model, so it takes a fraction of the memory, builds without
+validation and, being frozen, can be shared without defensive copies.
+
+Conversion is lossless both ways: ``Record.from_model(model).to_model() == model``.
+``to_model`` skips validation, the values were validated when the model was first
+built. Edit the model a record came from, not the record, so rules like the
+``Event`` start reconciliation keep applying.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from models.enums import AccessCategory, Gender
+from models.models import Attendance, Event, User, is_attendance_locked, telegram_handle
+from models.responses.responses import AttendanceResponse, EventAttendance, UserAttendance, UserAttendanceResponse
+
+
+@dataclass(frozen=True, slots=True)
+class UserRecord:
+    id: int
+    telegram_user: Optional[str]
+    name: str
+    access_category: AccessCategory
+    username: Optional[str]
+    gender: Optional[Gender]
+
+    @property
+    def telegram_handle(self) -> str:
+        return telegram_handle(self.telegram_user)
+
+    @classmethod
+    def from_model(cls, model: User) -> "UserRecord":
+        return cls(model.id, model.telegram_user, model.name, model.access_category, model.username, model.gender)
+
+    def to_model(self) -> User:
+        return User.model_construct(
+            id=self.id,
+            telegram_user=self.telegram_user,
+            name=self.name,
+            access_category=self.access_category,
+            username=self.username,
+            gender=self.gender,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class EventRecord:
+    id: int
+    title: str
+    description: Optional[str]
+    start: datetime
+    end: datetime
+    attendance_deadline: Optional[datetime]
+    is_accountable: bool
+    access_category: AccessCategory
+
+    def is_attendance_locked(self, now: Optional[datetime] = None) -> bool:
+        return is_attendance_locked(self.attendance_deadline, now)
+
+    @classmethod
+    def from_model(cls, model: Event) -> "EventRecord":
+        return cls(
+            model.id,
+            model.title,
+            model.description,
+            model.start,
+            model.end,
+            model.attendance_deadline,
+            model.is_accountable,
+            model.access_category,
+        )
+
+    def to_model(self) -> Event:
+        # model_construct sets the fields directly, the start reconciliation of __setattr__ does not run
+        return Event.model_construct(
+            id=self.id,
+            title=self.title,
+            description=self.description,
+            start=self.start,
+            end=self.end,
+            attendance_deadline=self.attendance_deadline,
+            is_accountable=self.is_accountable,
+            access_category=self.access_category,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AttendanceRecord:
+    user_id: Optional[int]
+    event_id: Optional[int]
+    status: Optional[bool]
+    reason: Optional[str]
+
+    @classmethod
+    def from_model(cls, model: Attendance) -> "AttendanceRecord":
+        return cls(model.user_id, model.event_id, model.status, model.reason)
+
+    def to_model(self) -> Attendance:
+        return Attendance.model_construct(
+            user_id=self.user_id, event_id=self.event_id, status=self.status, reason=self.reason
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class EventAttendanceRecord:
+    event: EventRecord
+    attendance: AttendanceRecord
+
+    @classmethod
+    def from_model(cls, model: EventAttendance) -> "EventAttendanceRecord":
+        return cls(EventRecord.from_model(model.event), AttendanceRecord.from_model(model.attendance))
+
+    def to_model(self) -> EventAttendance:
+        return EventAttendance.model_construct(event=self.event.to_model(), attendance=self.attendance.to_model())
+
+
+@dataclass(frozen=True, slots=True)
+class AttendanceResponseRecord:
+    status: Optional[bool]
+    reason: Optional[str]
+
+    @classmethod
+    def from_model(cls, model: AttendanceResponse) -> "AttendanceResponseRecord":
+        return cls(model.status, model.reason)
+
+    def to_model(self) -> AttendanceResponse:
+        return AttendanceResponse.model_construct(status=self.status, reason=self.reason)
+
+
+@dataclass(frozen=True, slots=True)
+class UserAttendanceRecord:
+    name: str
+    telegram_user: Optional[str]
+    gender: str
+    access: AccessCategory
+    attendance: AttendanceResponseRecord
+
+    @property
+    def telegram_handle(self) -> str:
+        return telegram_handle(self.telegram_user)
+
+    @classmethod
+    def from_model(cls, model: UserAttendance) -> "UserAttendanceRecord":
+        attendance = model.attendance
+        return cls(
+            model.name,
+            model.telegram_user,
+            model.gender,
+            model.access,
+            AttendanceResponseRecord(attendance.status, attendance.reason),
+        )
+
+    def to_model(self) -> UserAttendance:
+        return UserAttendance.model_construct(
+            name=self.name,
+            telegram_user=self.telegram_user,
+            gender=self.gender,
+            access=self.access,
+            attendance=self.attendance.to_model(),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RosterRecord:
+    """Team attendance of an event, the record of `UserAttendanceResponse`."""
+
+    male: Tuple[UserAttendanceRecord, ...]
+    female: Tuple[UserAttendanceRecord, ...]
+    absent: Tuple[UserAttendanceRecord, ...]
+    unindicated: Tuple[UserAttendanceRecord, ...]
+
+    @classmethod
+    def from_model(cls, model: UserAttendanceResponse) -> "RosterRecord":
+        convert = UserAttendanceRecord.from_model
+        return cls(
+            tuple(map(convert, model.male)),
+            tuple(map(convert, model.female)),
+            tuple(map(convert, model.absent)),
+            tuple(map(convert, model.unindicated)),
+        )
+
+    def to_model(self) -> UserAttendanceResponse:
+        return UserAttendanceResponse.model_construct(
+            male=[user.to_model() for user in self.male],
+            female=[user.to_model() for user in self.female],
+            absent=[user.to_model() for user in self.absent],
+            unindicated=[user.to_model() for user in self.unindicated],
+        )
+
+
+RECORD_TYPES: Dict[Type[BaseModel], type] = {
+    User: UserRecord,
+    Event: EventRecord,
+    Attendance: AttendanceRecord,
+    EventAttendance: EventAttendanceRecord,
+    AttendanceResponse: AttendanceResponseRecord,
+    UserAttendance: UserAttendanceRecord,
+    UserAttendanceResponse: RosterRecord,
+}
+
+
+def to_record(model: BaseModel):
+    """The record of ``model``, which must be one of the models in `RECORD_TYPES`."""
+    return RECORD_TYPES[type(model)].from_model(model)
@@ -3,7 +3,7 @@ from typing import List, Optional
 from pydantic import BaseModel
 
 from models.enums import AccessCategory
-from models.models import Attendance, Event
+from models.models import Attendance, Event, telegram_handle
 
 class AttendanceResponse(BaseModel):
     status: Optional[bool]
@@ -18,10 +18,7 @@ class UserAttendance(BaseModel):
 
     @property
     def telegram_handle(self) -> str:
-        if self.telegram_user:
-            clean = self.telegram_user.lstrip("@")
-            return f"@{clean}"
-        return "(not yet set on telegram)"
+        return telegram_handle(self.telegram_user)
 
 class UserAttendanceResponse(BaseModel):
     male: List[UserAttendance]
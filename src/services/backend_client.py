@@ -0,0 +1,145 @@
+import logging
+from typing import Any, Dict, Optional, Type, TypeVar
+
+import httpx
+
+from config.settings import Settings
+from services.payload_decoder import PayloadDecoder
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class BackendClient:
+    """
+    Shared, long-lived HTTP client for the backend service.
+
+    One ``httpx.AsyncClient`` is kept for the lifetime of the bot so that
+    connections (and their TLS sessions) are pooled and reused across handler
+    calls instead of being re-established on every request.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 5.0,
+        connect_timeout: float = 3.0,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        decoder: Optional[PayloadDecoder] = None,
+    ):
+        """
+        Args:
+            base_url: Root URL of the backend service
+            max_connections: Upper bound on concurrent connections in the pool
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept alive
+            timeout: Default read/write/pool timeout in seconds
+            connect_timeout: Default connect timeout in seconds
+            http2: Negotiate HTTP/2 so requests are multiplexed on one connection
+            transport: Optional transport override, mainly for tests
+            decoder: Decodes response bodies and encodes request bodies, validating by default
+        """
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.http2 = http2
+        self._transport = transport
+        self.decoder = decoder or PayloadDecoder()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "BackendClient":
+        return cls(
+            base_url=settings.backend_url,
+            max_connections=settings.backend_max_connections,
+            max_keepalive_connections=settings.backend_max_keepalive_connections,
+            keepalive_expiry=settings.backend_keepalive_expiry,
+            timeout=settings.backend_timeout,
+            connect_timeout=settings.backend_connect_timeout,
+            http2=settings.backend_http2,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            logger.info("Opening backend connection pool to %s", self.base_url)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def get_json(
+        self,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """GET ``path`` and return the decoded JSON body."""
+        body = await self._request("GET", path, params=params, timeout=timeout)
+        return self.decoder.loads(body) if body else None
+
+    async def get_model(
+        self,
+        path: str,
+        type_: Type[T],
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> T:
+        """GET ``path`` and decode the whole body into ``type_``, e.g. a model or ``List[Model]``."""
+        body = await self._request("GET", path, params=params, timeout=timeout)
+        return self.decoder.decode(body, type_)
+
+    async def post_json(self, path: str, payload: Any, *, timeout: Optional[float] = None) -> Any:
+        """POST ``payload`` as JSON to ``path`` and return the decoded JSON body, if any."""
+        body = await self._request("POST", path, payload=payload, timeout=timeout)
+        return self.decoder.loads(body) if body else None
+
+    async def aclose(self) -> None:
+        """Close the pool; called once when the bot shuts down."""
+        if self._client is not None and not self._client.is_closed:
+            logger.info("Closing backend connection pool")
+            await self._client.aclose()
+        self._client = None
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        payload: Any = None,
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        """The raw body of the response, decoding is left to the caller."""
+        request_timeout = httpx.USE_CLIENT_DEFAULT if timeout is None else httpx.Timeout(timeout)
+        content = headers = None
+        if payload is not None:
+            content = self.decoder.dumps(payload)
+            headers = {"Content-Type": "application/json"}
+        response = await self.client.request(
+            method,
+            path,
+            params=params,
+            content=content,
+            headers=headers,
+            timeout=request_timeout,
+        )
+        response.raise_for_status()
+        return response.content
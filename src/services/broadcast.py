@@ -0,0 +1,253 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from telegram import Bot
+from telegram.error import Forbidden, RetryAfter, TelegramError
+
+from bots.rate_limiter import PriorityRateLimiter, SendPriority, retry_after_seconds
+from controllers.manage_access_controller import ManageAccessControlling
+from localization import TeamKey
+from models.enums import AccessCategory
+from models.models import Event
+from services.sqlite_database import ACCESS_ORDER
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastJob(BaseModel):
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    title: str
+    text: str
+    recipients: List[int]
+    cursor: int = 0
+    sent: int = 0
+    failed: int = 0
+    admin_chat_id: int
+    progress_message_id: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self.cursor >= len(self.recipients)
+
+
+class BroadcastStore:
+    """
+    Persists unfinished broadcasts to a JSON file so they resume after a restart.
+
+    The file is rewritten atomically after every batch, so at most one batch is
+    sent twice after a crash.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def load(self) -> List[BroadcastJob]:
+        if not self.path.exists():
+            return []
+        with self.path.open("r", encoding="utf-8") as file:
+            return [BroadcastJob.model_validate(job) for job in json.load(file)]
+
+    def save(self, jobs: List[BroadcastJob]) -> None:
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            json.dump([job.model_dump(mode="json") for job in jobs], file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class Broadcaster:
+    """
+    Fans event announcements out to everyone who can attend the event.
+
+    Recipients are resolved once when the broadcast starts and sent to in batches as
+    bulk traffic, so the outbound rate limiter serves interactive replies first. The
+    cursor is persisted after every batch and unfinished broadcasts are resumed by
+    `resume`. The admin who started a broadcast gets a progress message that is
+    updated after every batch.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        recipients: ManageAccessControlling,
+        store: BroadcastStore,
+        batch_size: int = 25,
+        batch_interval: float = 1.0,
+    ):
+        """
+        Args:
+            bot: Bot the announcements are sent with
+            recipients: Controller the event's roster is resolved from
+            store: Persistence for unfinished broadcasts
+            batch_size: Announcements sent concurrently before the cursor is saved
+            batch_interval: Minimum seconds between the start of two batches
+        """
+        self.bot = bot
+        self.recipients = recipients
+        self.store = store
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._jobs: Dict[str, BroadcastJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = asyncio.Lock()
+
+    async def announce_event(self, event: Event, admin_chat_id: int) -> BroadcastJob:
+        """Start announcing ``event``; returns once the broadcast is persisted."""
+        recipients = await self._roster(event.access_category)
+        job = BroadcastJob(
+            title=event.title,
+            text=self.announcement_text(event),
+            recipients=[user_id for user_id in recipients if user_id != admin_chat_id],
+            admin_chat_id=admin_chat_id,
+        )
+        self._jobs[job.id] = job
+        await self._save()
+        self._start(job)
+        return job
+
+    async def send_announcement(self, chat_id: int, event: Event) -> None:
+        """Send a single announcement as an interactive message, e.g. to someone who changed their mind."""
+        await self.bot.send_message(chat_id=chat_id, text=self.announcement_text(event))
+
+    async def resume(self) -> None:
+        """Resume broadcasts left unfinished by a previous run."""
+        jobs = await asyncio.to_thread(self.store.load)
+        for job in jobs:
+            logger.info(f"Resuming broadcast {job.id} at {job.cursor}/{len(job.recipients)}")
+            self._jobs[job.id] = job
+            self._start(job)
+
+    async def aclose(self) -> None:
+        """Stop broadcasting; the persisted cursors let the next run continue."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def wait(self) -> None:
+        """Wait for the running broadcasts to finish."""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "broadcasts": len(self._jobs),
+            "pending": sum(len(job.recipients) - job.cursor for job in self._jobs.values()),
+        }
+
+    @staticmethod
+    def announcement_text(event: Event) -> str:
+        datetime_format = str(TeamKey.manage_event_datetime_format)
+        deadline = (
+            event.attendance_deadline.strftime(datetime_format)
+            if event.attendance_deadline
+            else str(TeamKey.manage_event_no_deadline)
+        )
+        description = event.description.strip() if event.description else str(TeamKey.manage_event_no_description)
+        return TeamKey.event_announcement.format(
+            title=event.title,
+            start=event.start.strftime(datetime_format),
+            end=event.end.strftime(datetime_format),
+            deadline=deadline,
+            description=description,
+        )
+
+    def _start(self, job: BroadcastJob) -> None:
+        self._tasks[job.id] = asyncio.ensure_future(self._run(job))
+
+    async def _roster(self, access: AccessCategory) -> List[int]:
+        # public users are not registered members, announcements go to guests and above
+        lowest = max(ACCESS_ORDER.index(access), ACCESS_ORDER.index(AccessCategory.GUEST))
+        user_ids: List[int] = []
+        for category in ACCESS_ORDER[lowest:]:
+            user_ids.extend(user.id for user in await self.recipients.retrieve_users(category))
+        return list(dict.fromkeys(user_ids))
+
+    async def _run(self, job: BroadcastJob) -> None:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        processed = 0
+        try:
+            await self._report_progress(job, rate=0.0)
+            while not job.done:
+                batch_started = loop.time()
+                batch = job.recipients[job.cursor:job.cursor + self.batch_size]
+                results = await asyncio.gather(*(self._send_one(chat_id, job.text) for chat_id in batch))
+
+                job.sent += sum(results)
+                job.failed += len(results) - sum(results)
+                job.cursor += len(batch)
+                processed += len(batch)
+                await self._save()
+
+                rate = processed / max(loop.time() - started, 1e-6)
+                await self._report_progress(job, rate=rate)
+                if not job.done:
+                    await asyncio.sleep(max(0.0, self.batch_interval - (loop.time() - batch_started)))
+
+            logger.info(f"Broadcast {job.id} finished: {job.sent} sent, {job.failed} failed")
+            self._jobs.pop(job.id, None)
+            await self._save()
+        except Exception as e:
+            # the job stays persisted and is picked up again by the next resume
+            logger.error(f"Broadcast {job.id} stopped at {job.cursor}/{len(job.recipients)}: {str(e)}", exc_info=True)
+        finally:
+            self._tasks.pop(job.id, None)
+
+    async def _send_one(self, chat_id: int, text: str) -> bool:
+        kwargs = {}
+        if isinstance(getattr(self.bot, "rate_limiter", None), PriorityRateLimiter):
+            kwargs["rate_limit_args"] = SendPriority.BULK
+
+        for _ in range(3):
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                return True
+            except RetryAfter as e:
+                # only reached without a rate limiter, which otherwise retries by itself
+                await asyncio.sleep(retry_after_seconds(e))
+            except Forbidden:
+                logger.info(f"User {chat_id} has blocked the bot, skipping announcement")
+                return False
+            except TelegramError as e:
+                logger.warning(f"Failed to send announcement to {chat_id}: {str(e)}")
+                return False
+        return False
+
+    async def _report_progress(self, job: BroadcastJob, rate: float) -> None:
+        if job.done:
+            text = TeamKey.broadcast_finished.format(title=job.title, sent=job.sent, failed=job.failed)
+        else:
+            text = TeamKey.broadcast_progress.format(
+                title=job.title,
+                done=job.cursor,
+                total=len(job.recipients),
+                failed=job.failed,
+                rate=f"{rate:.1f}",
+            )
+
+        try:
+            if job.progress_message_id is None:
+                message = await self.bot.send_message(chat_id=job.admin_chat_id, text=text)
+                job.progress_message_id = message.message_id
+                await self._save()
+            else:
+                await self.bot.edit_message_text(
+                    chat_id=job.admin_chat_id,
+                    message_id=job.progress_message_id,
+                    text=text,
+                )
+        except TelegramError as e:
+            # progress is best effort, e.g. an unchanged message cannot be edited
+            logger.debug(f"Could not report broadcast progress: {str(e)}")
+
+    async def _save(self) -> None:
+        async with self._lock:
+            jobs: List[BroadcastJob] = [job.model_copy() for job in self._jobs.values()]
+            await asyncio.to_thread(self.store.save, jobs)
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from models.models import Event
+
+
+class EventRegistry:
+    """
+    Process-wide store of events keyed by id, shared by every conversation.
+
+    Conversations put the events they fetch here and keep only event ids in
+    ``context.user_data``, so an event is held once no matter how many users are
+    looking at it, and a saved edit is visible to all of them straight away. The
+    least recently used events are evicted beyond ``max_entries``; a conversation
+    that finds its event gone asks the user to start over.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries: Events kept before the least recently used are evicted
+        """
+        self.max_entries = max_entries
+        self._events: "OrderedDict[int, Event]" = OrderedDict()
+
+    def put(self, event: Event) -> int:
+        """Store ``event``, replacing any previous version, and return its id."""
+        self._events[event.id] = event
+        self._events.move_to_end(event.id)
+        while len(self._events) > self.max_entries:
+            self._events.popitem(last=False)
+        return event.id
+
+    def put_many(self, events: Iterable[Event]) -> List[int]:
+        return [self.put(event) for event in events]
+
+    def get(self, event_id: int) -> Optional[Event]:
+        event = self._events.get(event_id)
+        if event is not None:
+            self._events.move_to_end(event_id)
+        return event
+
+    def get_many(self, event_ids: Iterable[int]) -> List[Event]:
+        """Events for ``event_ids`` in the same order, skipping any that were evicted."""
+        events = (self.get(event_id) for event_id in event_ids)
+        return [event for event in events if event is not None]
+
+    def stats(self) -> Dict[str, int]:
+        return {"events": len(self._events), "max_entries": self.max_entries}
+
+    def __contains__(self, event_id: int) -> bool:
+        return event_id in self._events
+
+    def __len__(self) -> int:
+        return len(self._events)
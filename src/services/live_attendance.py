@@ -0,0 +1,281 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from telegram import Bot, InlineKeyboardMarkup
+from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
+
+from bots.rate_limiter import PriorityRateLimiter, SendPriority, retry_after_seconds
+from controllers.team_attendance_controller import TeamAttendanceControlling
+from localization import use_locale
+from models.models import Event
+from models.records import RosterRecord
+from services.event_registry import EventRegistry
+
+logger = logging.getLogger(__name__)
+
+# renders the team attendance message and its buttons, a given timestamp replaces the current time
+AttendanceRenderer = Callable[[Event, RosterRecord, Optional[str]], Tuple[str, Optional[InlineKeyboardMarkup]]]
+
+
+class LiveMessage(BaseModel):
+    event: Event
+    chat_id: int
+    message_id: int
+    # digest of the text and buttons last shown, rendered without the last-updated time
+    digest: str = ""
+
+
+class LiveMessageStore:
+    """Persists the live messages to a JSON file so they keep updating after a restart."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def load(self) -> List[LiveMessage]:
+        if not self.path.exists():
+            return []
+        with self.path.open("r", encoding="utf-8") as file:
+            return [LiveMessage.model_validate(message) for message in json.load(file)]
+
+    def save(self, messages: List[LiveMessage]) -> None:
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            json.dump([message.model_dump(mode="json") for message in messages], file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class LiveAttendanceBoard:
+    """
+    Keeps team attendance messages up to date as attendance changes.
+
+    A message is tracked per event and chat. Changes are debounced: the first change
+    to an event schedules a refresh ``debounce`` seconds later and further changes
+    in that window are coalesced into it, so an event is re-fetched and edited at
+    most once per window however many people update their attendance. Messages
+    show the first page of the report with the buttons the renderer gives, e.g. the
+    navigation to the other pages. Messages whose rendered text and buttons did not
+    change are not edited, and edits go out as bulk
+    traffic when the bot has a priority rate limiter. Messages stop updating once
+    their event has ended or the message can no longer be edited.
+
+    ``debounce`` should be longer than the team attendance freshness, so a refresh
+    never reuses a result fetched before the change it is refreshing for.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        controller: TeamAttendanceControlling,
+        registry: EventRegistry,
+        render: AttendanceRenderer,
+        store: LiveMessageStore,
+        debounce: float = 5.0,
+        max_messages_per_event: int = 20,
+    ):
+        """
+        Args:
+            bot: Bot the messages are edited with
+            controller: Controller the team attendance is fetched from
+            registry: Shared events, preferred over the copy kept with each message
+            render: Renders the message text and buttons for an event and its attendance
+            store: Persistence for the tracked messages
+            debounce: Seconds changes are gathered before an event is refreshed
+            max_messages_per_event: Messages kept updating per event, the oldest stop beyond this
+        """
+        self.bot = bot
+        self.controller = controller
+        self.registry = registry
+        self.render = render
+        self.store = store
+        self.debounce = debounce
+        self.max_messages_per_event = max_messages_per_event
+        self._messages: Dict[int, List[LiveMessage]] = {}
+        self._timers: Dict[int, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+        self.coalesced = 0
+        self.edits = 0
+        self.unchanged = 0
+        self.failures = 0
+
+    async def track(self, event: Event, chat_id: int, message_id: int, pin: bool = False) -> None:
+        """Keep ``message_id`` updated with the attendance of ``event`` and bring it up to date."""
+        # one live message per event and chat, a newer one replaces it
+        messages = [message for message in self._messages.get(event.id, []) if message.chat_id != chat_id]
+        messages.append(LiveMessage(event=event, chat_id=chat_id, message_id=message_id))
+        self._messages[event.id] = messages[-self.max_messages_per_event:]
+        await self._save()
+
+        if pin:
+            try:
+                await self.bot.pin_chat_message(chat_id=chat_id, message_id=message_id, disable_notification=True)
+            except TelegramError as e:
+                # pinning needs admin rights in groups, the message still updates without it
+                logger.info(f"Could not pin live attendance in {chat_id}: {str(e)}")
+
+        self.attendance_changed(event.id)
+
+    def is_tracked(self, event_id: int, chat_id: int, message_id: int) -> bool:
+        return any(
+            message.chat_id == chat_id and message.message_id == message_id
+            for message in self._messages.get(event_id, [])
+        )
+
+    def attendance_changed(self, event_id: int) -> None:
+        """Schedule a refresh of the messages tracking ``event_id``."""
+        if event_id not in self._messages:
+            return
+        if event_id in self._timers:
+            self.coalesced += 1
+            return
+        task = asyncio.ensure_future(self._refresh_later(event_id))
+        self._timers[event_id] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def resume(self) -> None:
+        """Load the messages tracked by a previous run."""
+        messages = await asyncio.to_thread(self.store.load)
+        for message in messages:
+            self._messages.setdefault(message.event.id, []).append(message)
+
+    async def aclose(self) -> None:
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def wait(self) -> None:
+        """Wait for the scheduled refreshes to finish."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "messages": sum(len(messages) for messages in self._messages.values()),
+            "refreshes": self.refreshes,
+            "coalesced": self.coalesced,
+            "edits": self.edits,
+            "unchanged": self.unchanged,
+            "failures": self.failures,
+        }
+
+    async def _refresh_later(self, event_id: int) -> None:
+        # the messages are shared by the team, not rendered in the locale of whoever triggered the change
+        use_locale(None)
+        try:
+            await asyncio.sleep(self.debounce)
+        except asyncio.CancelledError:
+            self._timers.pop(event_id, None)
+            raise
+
+        # changes from here on schedule another refresh instead of joining this one
+        self._timers.pop(event_id, None)
+        try:
+            await self._refresh(event_id)
+        except Exception as e:
+            logger.error(f"Error refreshing live attendance for event {event_id}: {str(e)}", exc_info=True)
+
+    async def _refresh(self, event_id: int) -> None:
+        messages = self._messages.get(event_id, [])
+        if not messages:
+            return
+
+        event = self.registry.get(event_id) or messages[-1].event
+        if event.end < datetime.now():
+            logger.info(f"Event {event_id} has ended, its live attendance messages stop updating")
+            self._messages.pop(event_id, None)
+            await self._save()
+            return
+
+        self.refreshes += 1
+        attendance = await self.controller.retrieve_team_attendance(event_id=event_id)
+        digest = self._digest(*self.render(event, attendance, ""))
+        rendered: Optional[Tuple[str, Optional[InlineKeyboardMarkup]]] = None
+        changed = False
+
+        for message in list(messages):
+            if message.digest == digest:
+                self.unchanged += 1
+                continue
+
+            rendered = rendered or self.render(event, attendance, None)
+            edited = await self._edit(message, *rendered)
+            if edited is None:
+                # left as is, the next change tries again
+                continue
+            if edited:
+                message.digest = digest
+                message.event = event
+                self.edits += 1
+            else:
+                messages.remove(message)
+            changed = True
+
+        if not messages:
+            self._messages.pop(event_id, None)
+        if changed:
+            await self._save()
+
+    @staticmethod
+    def _digest(text: str, reply_markup: Optional[InlineKeyboardMarkup]) -> str:
+        digest = hashlib.blake2b(text.encode(), digest_size=16)
+        if reply_markup:
+            digest.update(reply_markup.to_json().encode())
+        return digest.hexdigest()
+
+    async def _edit(
+        self,
+        message: LiveMessage,
+        text: str,
+        reply_markup: Optional[InlineKeyboardMarkup],
+    ) -> Optional[bool]:
+        """Edit ``message``; False once it can no longer be edited, None when this edit failed."""
+        kwargs = {}
+        if isinstance(getattr(self.bot, "rate_limiter", None), PriorityRateLimiter):
+            kwargs["rate_limit_args"] = SendPriority.BULK
+
+        for _ in range(3):
+            try:
+                await self.bot.edit_message_text(
+                    chat_id=message.chat_id,
+                    message_id=message.message_id,
+                    text=text,
+                    reply_markup=reply_markup,
+                    **kwargs,
+                )
+                return True
+            except RetryAfter as e:
+                # only reached without a rate limiter, which otherwise retries by itself
+                await asyncio.sleep(retry_after_seconds(e))
+            except BadRequest as e:
+                if "not modified" in str(e).lower():
+                    return True
+                self.failures += 1
+                logger.info(f"Live attendance message {message.message_id} in {message.chat_id} is gone: {str(e)}")
+                return False
+            except Forbidden as e:
+                self.failures += 1
+                logger.info(f"Live attendance in {message.chat_id} is no longer allowed: {str(e)}")
+                return False
+            except TelegramError as e:
+                self.failures += 1
+                logger.warning(f"Failed to update live attendance in {message.chat_id}: {str(e)}")
+                return None
+        self.failures += 1
+        return None
+
+    async def _save(self) -> None:
+        async with self._lock:
+            messages = [message.model_copy() for messages in self._messages.values() for message in messages]
+            await asyncio.to_thread(self.store.save, messages)
@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OutboxEntry:
+    seq: int
+    key: str
+    payload: Dict[str, Any]
+
+
+class AppendOnlyOutbox:
+    """
+    Disk-backed append-only outbox.
+
+    Every write and every delivery acknowledgement is appended to a JSON-lines
+    log and fsynced, so an entry survives a crash as soon as `append` returns.
+    On start-up the log is replayed to recover the undelivered entries in their
+    original order. Once enough entries are acknowledged the log is compacted by
+    atomically rewriting it with only the pending entries.
+
+    Entries the receiver rejects for good are moved to a dead-letter log next to
+    the outbox (``<path>.dead``) rather than deleted, so they can be inspected and
+    replayed by hand.
+
+    The methods block on disk I/O; callers on the event loop should run them on
+    a worker thread.
+    """
+
+    def __init__(self, path: str | Path, compact_after: int = 100):
+        """
+        Args:
+            path: Log file; created if missing
+            compact_after: Acknowledged entries that trigger a compaction
+        """
+        self.path = Path(path)
+        self.dead_letter_path = self.path.with_suffix(self.path.suffix + ".dead")
+        self.compact_after = compact_after
+        self._pending: "OrderedDict[int, OutboxEntry]" = OrderedDict()
+        self._next_seq = 1
+        self._acked_since_compaction = 0
+        self._needs_rewrite = False
+        self._load()
+        self._file = self.path.open("a", encoding="utf-8")
+        if self._needs_rewrite:
+            self.compact()
+
+    def append(self, payload: Dict[str, Any]) -> OutboxEntry:
+        entry = OutboxEntry(seq=self._next_seq, key=uuid.uuid4().hex, payload=payload)
+        self._next_seq += 1
+        self._write([{"op": "put", "seq": entry.seq, "key": entry.key, "payload": entry.payload}])
+        self._pending[entry.seq] = entry
+        return entry
+
+    def pending(self, limit: int | None = None) -> List[OutboxEntry]:
+        """Undelivered entries, oldest first."""
+        entries = list(self._pending.values())
+        return entries if limit is None else entries[:limit]
+
+    def ack(self, seqs: Iterable[int]) -> None:
+        """Mark entries as delivered (or dead-lettered) and compact once enough have been acknowledged."""
+        acked = [seq for seq in seqs if seq in self._pending]
+        if not acked:
+            return
+
+        self._write([{"op": "ack", "seq": seq} for seq in acked])
+        for seq in acked:
+            del self._pending[seq]
+
+        self._acked_since_compaction += len(acked)
+        if not self._pending or self._acked_since_compaction >= self.compact_after:
+            self.compact()
+
+    def dead_letter(self, seqs: Iterable[int], reason: str) -> None:
+        """Move entries that can never be delivered to the dead-letter log, then acknowledge them."""
+        entries = [self._pending[seq] for seq in seqs if seq in self._pending]
+        if not entries:
+            return
+
+        failed_at = time.time()
+        with self.dead_letter_path.open("a", encoding="utf-8") as file:
+            for entry in entries:
+                record = {"seq": entry.seq, "key": entry.key, "payload": entry.payload,
+                          "reason": reason, "failed_at": failed_at}
+                file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        # written before the ack, a crash in between leaves the entry pending rather than lost
+        self.ack([entry.seq for entry in entries])
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        """Entries moved to the dead-letter log, oldest first, with the reason they were rejected."""
+        if not self.dead_letter_path.exists():
+            return []
+        with self.dead_letter_path.open("r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    def compact(self) -> None:
+        """Rewrite the log with only the pending entries."""
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as tmp_file:
+            for entry in self._pending.values():
+                tmp_file.write(json.dumps({"op": "put", "seq": entry.seq, "key": entry.key, "payload": entry.payload}))
+                tmp_file.write("\n")
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._acked_since_compaction = 0
+        logger.debug("Compacted outbox %s to %d pending entries", self.path, len(self._pending))
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(record) + "\n" for record in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+
+        with self.path.open("r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # a torn final line from a crash mid-write; everything before it is intact
+                    logger.warning("Skipping unreadable outbox line %d in %s", line_number, self.path)
+                    self._needs_rewrite = True
+                    continue
+
+                seq = record["seq"]
+                if record["op"] == "put":
+                    self._pending[seq] = OutboxEntry(seq=seq, key=record["key"], payload=record["payload"])
+                elif record["op"] == "ack":
+                    self._pending.pop(seq, None)
+                self._next_seq = max(self._next_seq, seq + 1)
+
+        if self._pending:
+            logger.info("Recovered %d undelivered entries from outbox %s", len(self._pending), self.path)
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RenderCache:
+    """
+    Bounded store of rendered text keyed by everything the text depends on.
+
+    Renders that mostly repeat, like a team attendance report in which one member
+    changed their status, look their unchanged pieces up here instead of formatting
+    them again. Keys must include every input of the render, including the templates
+    used, so a reloaded locale misses the cache rather than serving stale text. The
+    least recently used entries are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Args:
+            max_entries: Rendered pieces kept before the least recently used are evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: T) -> T:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def get_or_render(self, key: Hashable, render: Callable[[], T]) -> T:
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, render())
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
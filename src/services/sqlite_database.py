@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+from models.enums import AccessCategory
+from models.models import Event
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    telegram_user TEXT,
+    name TEXT NOT NULL,
+    access_category TEXT NOT NULL DEFAULT 'public',
+    gender TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_access_category ON users (access_category);
+CREATE INDEX IF NOT EXISTS idx_users_name ON users (name);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    start TEXT NOT NULL,
+    "end" TEXT NOT NULL,
+    attendance_deadline TEXT,
+    is_accountable INTEGER NOT NULL,
+    access_category TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events (start);
+
+CREATE TABLE IF NOT EXISTS attendance (
+    event_id INTEGER NOT NULL REFERENCES events (id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL,
+    status INTEGER,
+    reason TEXT,
+    PRIMARY KEY (event_id, user_id)
+) WITHOUT ROWID;
+"""
+
+# Lowest to highest; an event is visible to users whose access is at least the event's
+ACCESS_ORDER: List[AccessCategory] = [
+    AccessCategory.PUBLIC,
+    AccessCategory.GUEST,
+    AccessCategory.MEMBER,
+    AccessCategory.ADMIN,
+]
+
+
+def accessible_categories(access: AccessCategory) -> List[str]:
+    """Event access categories visible to a user with ``access``."""
+    rank = ACCESS_ORDER.index(access)
+    return [category.value for category in ACCESS_ORDER[:rank + 1]]
+
+
+def event_from_row(row: sqlite3.Row) -> Event:
+    deadline = row["attendance_deadline"]
+    return Event(
+        id=row["id"],
+        title=row["title"],
+        description=row["description"],
+        start=datetime.fromisoformat(row["start"]),
+        end=datetime.fromisoformat(row["end"]),
+        attendance_deadline=datetime.fromisoformat(deadline) if deadline else None,
+        is_accountable=bool(row["is_accountable"]),
+        access_category=AccessCategory(row["access_category"]),
+    )
+
+
+def event_to_params(event: Event) -> Dict[str, Any]:
+    return {
+        "title": event.title,
+        "description": event.description,
+        "start": event.start.isoformat(),
+        "end": event.end.isoformat(),
+        "attendance_deadline": event.attendance_deadline.isoformat() if event.attendance_deadline else None,
+        "is_accountable": int(event.is_accountable),
+        "access_category": event.access_category.value,
+    }
+
+
+class SqliteDatabase:
+    """
+    Embedded SQLite store for self-hosted deployments without a backend service.
+
+    All statements run on one dedicated worker thread that owns the connection,
+    so the event loop never blocks on disk I/O and SQLite only ever sees a
+    single writer. The database runs in WAL mode so external readers (backups,
+    reporting) do not block the bot.
+    """
+
+    def __init__(self, path: str | Path, schema: str = SCHEMA):
+        """
+        Args:
+            path: Database file, or ``":memory:"`` for a throwaway database
+            schema: Script creating the tables, run when the connection is opened
+        """
+        self.path = str(path)
+        self.schema = schema
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._connection: Optional[sqlite3.Connection] = None
+
+    async def run(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """Run ``func`` with the connection inside one transaction on the worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run_in_transaction, func)
+
+    async def fetchall(self, sql: str, params: Sequence | Dict[str, Any] = ()) -> List[sqlite3.Row]:
+        return await self.run(lambda connection: connection.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params: Sequence | Dict[str, Any] = ()) -> Optional[sqlite3.Row]:
+        return await self.run(lambda connection: connection.execute(sql, params).fetchone())
+
+    async def execute(self, sql: str, params: Sequence | Dict[str, Any] = ()) -> int:
+        """Execute a single statement and return the last inserted row id."""
+        return await self.run(lambda connection: connection.execute(sql, params).lastrowid)
+
+    async def executemany(self, sql: str, params: Iterable[Sequence | Dict[str, Any]]) -> None:
+        await self.run(lambda connection: connection.executemany(sql, params))
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=True)
+
+    def _run_in_transaction(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        connection = self._connect()
+        with connection:
+            return func(connection)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            logger.info("Opening SQLite database at %s", self.path)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(self.schema)
+            self._connection = connection
+        return self._connection
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
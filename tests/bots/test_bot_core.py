@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from bots.bot_core import BotCore
+from config.settings import settings
+
+TOKEN = "123456:TEST-TOKEN"
+
+
+@pytest.fixture
+def core() -> BotCore:
+    core = BotCore(token=TOKEN)
+    core.application = MagicMock()
+    return core
+
+
+def test_run_uses_polling_by_default(core, monkeypatch):
+    monkeypatch.setattr(settings, "bot_mode", "polling")
+
+    core.run()
+
+    core.application.run_polling.assert_called_once()
+    core.application.run_webhook.assert_not_called()
+
+
+def test_run_serves_webhook_with_secret_token(core, monkeypatch):
+    monkeypatch.setattr(settings, "bot_mode", "webhook")
+    monkeypatch.setattr(settings, "webhook_url", "https://bot.example.com/")
+    monkeypatch.setattr(settings, "webhook_path", "/telegram")
+    monkeypatch.setattr(settings, "webhook_secret_token", "s3cret")
+    monkeypatch.setattr(settings, "webhook_max_connections", 80)
+
+    core.run()
+
+    core.application.run_polling.assert_not_called()
+    kwargs = core.application.run_webhook.call_args.kwargs
+    assert kwargs["url_path"] == "telegram"
+    assert kwargs["webhook_url"] == "https://bot.example.com/telegram"
+    assert kwargs["secret_token"] == "s3cret"
+    assert kwargs["max_connections"] == 80
+
+
+def test_webhook_generates_secret_when_unset(core, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_url", "https://bot.example.com")
+    monkeypatch.setattr(settings, "webhook_secret_token", "")
+
+    core.run_webhook()
+
+    assert len(core.application.run_webhook.call_args.kwargs["secret_token"]) >= 32
+
+
+def test_webhook_requires_public_url(core, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_url", "")
+
+    with pytest.raises(ValueError):
+        core.run_webhook()
+
+
+def test_concurrent_updates_configures_application():
+    assert BotCore(token=TOKEN).application.concurrent_updates == 1
+    assert BotCore(token=TOKEN, concurrent_updates=8).application.concurrent_updates == 8
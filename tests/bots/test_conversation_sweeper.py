@@ -0,0 +1,145 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram import Update, User
+from telegram.ext import Application
+
+from bots.conversation_sweeper import ConversationSweeper
+from command_handlers.conversations.get_team_attendance_conversation import (
+    CHOOSING_EVENT,
+    GetTeamAttendanceConversation,
+)
+from command_handlers.conversations.manage_event_conversation import (
+    SHOWING_EVENT_MENU,
+    ManageEventConversation,
+)
+
+USER_ID = 5
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def application() -> Application:
+    return Application.builder().token("123456:TEST-TOKEN").build()
+
+
+def make_sweeper(application, clock, *conversations):
+    sweeper = ConversationSweeper(application, clock=clock)
+    handlers = []
+    for conversation in conversations:
+        handler = conversation.conversation_handler
+        sweeper.register(conversation, handler)
+        handlers.append(handler)
+    return sweeper, handlers
+
+
+async def touch(sweeper: ConversationSweeper, user_id: int = USER_ID):
+    update = MagicMock(spec=Update)
+    update.effective_user = MagicMock(spec=User, id=user_id)
+    await sweeper._touch(update, MagicMock())
+
+
+def open_conversation(handler, state, user_id: int = USER_ID):
+    handler._update_state(state, (user_id, user_id))
+
+
+@pytest.mark.asyncio
+async def test_idle_conversation_is_ended_and_its_data_evicted(application, clock):
+    conversation = GetTeamAttendanceConversation(controller=AsyncMock())
+    conversation.timeout = 60
+    sweeper, [handler] = make_sweeper(application, clock, conversation)
+
+    await touch(sweeper)
+    open_conversation(handler, CHOOSING_EVENT)
+    user_data = application.user_data[USER_ID]
+    user_data["upcoming_event_ids"] = list(range(100))
+    user_data["language"] = "en"
+
+    clock.now += 30
+    assert sweeper.sweep() == 0
+    assert handler._conversations
+
+    clock.now += 31
+    reclaimed = sweeper.sweep()
+
+    assert not handler._conversations
+    assert user_data == {"language": "en"}
+    assert reclaimed > 100
+    assert sweeper.stats()["conversations_ended"] == 1
+    assert sweeper.stats()["keys_evicted"] == 1
+    assert sweeper.stats()["bytes_reclaimed"] == reclaimed
+
+
+@pytest.mark.asyncio
+async def test_keys_of_an_open_conversation_are_kept(application, clock):
+    team_attendance = GetTeamAttendanceConversation(controller=AsyncMock())
+    team_attendance.timeout = 60
+    manage_event = ManageEventConversation(controller=AsyncMock())
+    manage_event.timeout = 3600
+    sweeper, [_, manage_event_handler] = make_sweeper(application, clock, team_attendance, manage_event)
+
+    await touch(sweeper)
+    open_conversation(manage_event_handler, SHOWING_EVENT_MENU)
+    application.user_data[USER_ID].update({"upcoming_event_ids": [1, 2], "selected_event": object()})
+
+    clock.now += 120
+    sweeper.sweep()
+
+    # both conversations use upcoming_event_ids, the admin is still editing an event
+    assert manage_event_handler._conversations
+    assert set(application.user_data[USER_ID]) == {"upcoming_event_ids", "selected_event"}
+
+
+@pytest.mark.asyncio
+async def test_data_left_by_finished_conversations_is_evicted(application, clock):
+    conversation = GetTeamAttendanceConversation(controller=AsyncMock())
+    conversation.timeout = 60
+    sweeper, _ = make_sweeper(application, clock, conversation)
+
+    await touch(sweeper)
+    application.user_data[USER_ID]["upcoming_event_ids"] = [1, 2, 3]
+
+    clock.now += 61
+    sweeper.sweep()
+
+    assert application.user_data[USER_ID] == {}
+    assert sweeper.stats()["tracked_users"] == 0
+
+
+@pytest.mark.asyncio
+async def test_conversations_without_timeout_are_left_open(application, clock):
+    conversation = GetTeamAttendanceConversation(controller=AsyncMock())
+    sweeper, [handler] = make_sweeper(application, clock, conversation)
+
+    await touch(sweeper)
+    open_conversation(handler, CHOOSING_EVENT)
+    application.user_data[USER_ID]["upcoming_event_ids"] = [1]
+
+    clock.now += 10 ** 6
+    sweeper.sweep()
+
+    assert handler._conversations
+    assert application.user_data[USER_ID] == {"upcoming_event_ids": [1]}
+
+
+def test_unsupported_conversation_handlers_fail_when_registered(application, clock):
+    conversation = GetTeamAttendanceConversation(controller=AsyncMock())
+    handler = conversation.conversation_handler
+    sweeper = ConversationSweeper(application, clock=clock)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.delattr(type(handler), "_update_state")
+        with pytest.raises(RuntimeError, match="22.5"):
+            sweeper.register(conversation, handler)
@@ -0,0 +1,141 @@
+import time
+import zlib
+from datetime import datetime, timedelta
+
+import pytest
+from telegram import Bot, Chat, Message
+
+from bots.persistence import SqlitePersistence
+from models.enums import AccessCategory
+from models.models import Event
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "persistence.db"
+
+
+def make_persistence(path) -> SqlitePersistence:
+    persistence = SqlitePersistence(path)
+    persistence.set_bot(Bot("123456:TEST-TOKEN"))
+    return persistence
+
+
+@pytest.mark.asyncio
+async def test_user_data_is_loaded_lazily_after_restart(path):
+    persistence = make_persistence(path)
+    event = Event(
+        id=1,
+        title="Field Training",
+        start=datetime(2025, 10, 11, 13, 30),
+        end=datetime(2025, 10, 11, 15, 30),
+        is_accountable=True,
+        access_category=AccessCategory.GUEST,
+    )
+    await persistence.update_user_data(7, {"selected_event": event})
+    await persistence.aclose()
+
+    restarted = make_persistence(path)
+    assert await restarted.get_user_data() == {}
+
+    user_data = {}
+    await restarted.refresh_user_data(7, user_data)
+    # refreshing again must not clobber changes made since the first load
+    user_data["selected_event"].title = "Scrim"
+    await restarted.refresh_user_data(7, user_data)
+    await restarted.aclose()
+
+    assert user_data["selected_event"].title == "Scrim"
+    assert user_data["selected_event"].start == event.start
+
+
+@pytest.mark.asyncio
+async def test_payloads_are_compressed_and_unchanged_data_is_not_rewritten(path):
+    persistence = make_persistence(path)
+    data = {"notes": "attendance " * 200}
+
+    await persistence.update_user_data(1, data)
+    await persistence.update_user_data(1, dict(data))
+    row = await persistence.database.fetchone("SELECT data FROM user_data WHERE user_id = 1")
+    await persistence.aclose()
+
+    assert len(row["data"]) < len(data["notes"]) / 10
+    zlib.decompress(row["data"])
+    assert persistence.stats()["rows_written"] == 1
+    assert persistence.stats()["rows_skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unloaded_user_is_not_overwritten_with_empty_data(path):
+    persistence = make_persistence(path)
+    await persistence.update_user_data(3, {"name": "Alice"})
+    await persistence.aclose()
+
+    restarted = make_persistence(path)
+    # an update from user 3 that no handler picked up, so their data was never loaded
+    await restarted.update_user_data(3, {})
+    user_data = {}
+    await restarted.refresh_user_data(3, user_data)
+    await restarted.aclose()
+
+    assert user_data == {"name": "Alice"}
+
+
+@pytest.mark.asyncio
+async def test_conversation_states_round_trip(path):
+    persistence = make_persistence(path)
+    await persistence.update_conversation("MarkAttendanceConversation", (10, 10), 2)
+    await persistence.update_conversation("MarkAttendanceConversation", (11, 11), 1)
+    await persistence.update_conversation("MarkAttendanceConversation", (11, 11), None)
+    await persistence.update_conversation("ManageEventConversation", (10, 10), 3)
+    await persistence.aclose()
+
+    restarted = make_persistence(path)
+    conversations = await restarted.get_conversations("MarkAttendanceConversation")
+    await restarted.aclose()
+
+    assert conversations == {(10, 10): 2}
+
+
+@pytest.mark.asyncio
+async def test_telegram_objects_are_rebound_to_the_bot(path):
+    persistence = make_persistence(path)
+    message = Message(message_id=1, date=datetime(2025, 10, 11), chat=Chat(id=5, type=Chat.PRIVATE))
+    message.set_bot(persistence.bot)
+    await persistence.update_user_data(5, {"time_message": message})
+    await persistence.aclose()
+
+    restarted = make_persistence(path)
+    user_data = {}
+    await restarted.refresh_user_data(5, user_data)
+    await restarted.aclose()
+
+    assert user_data["time_message"] == message
+    assert user_data["time_message"].get_bot() is restarted.bot
+    assert user_data["time_message"].chat.get_bot() is restarted.bot
+
+
+@pytest.mark.asyncio
+async def test_start_up_does_not_scale_with_stored_users(path):
+    persistence = make_persistence(path)
+    blob = persistence._encode({"upcoming_events": list(range(50)), "selected_event": None})
+    await persistence.database.executemany(
+        "INSERT INTO user_data (user_id, data) VALUES (?, ?)",
+        ((user_id, blob) for user_id in range(20_000)),
+    )
+    await persistence.aclose()
+
+    restarted = make_persistence(path)
+    started = time.perf_counter()
+    await restarted.get_user_data()
+    await restarted.get_chat_data()
+    await restarted.get_bot_data()
+    await restarted.get_conversations("MarkAttendanceConversation")
+    elapsed = time.perf_counter() - started
+
+    user_data = {}
+    await restarted.refresh_user_data(19_999, user_data)
+    await restarted.aclose()
+
+    assert elapsed < 0.5
+    assert user_data["upcoming_events"][-1] == 49
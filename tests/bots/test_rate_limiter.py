@@ -0,0 +1,133 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from telegram.error import RetryAfter
+
+from bots.rate_limiter import PriorityRateLimiter, SendPriority, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    bucket.take()
+    bucket.take()
+    assert bucket.delay() == pytest.approx(0.5)
+
+    clock.now = 0.25
+    assert bucket.delay() == pytest.approx(0.25)
+
+    clock.now = 10
+    assert bucket.full
+    assert bucket.delay() == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_without_chat_are_not_limited():
+    limiter = PriorityRateLimiter(global_rate=1, chat_rate=1, chat_burst=1)
+    calls = 0
+
+    async def callback():
+        nonlocal calls
+        calls += 1
+        return True
+
+    await asyncio.gather(*(
+        limiter.process_request(callback, (), {}, "getUpdates", {}, None) for _ in range(5)
+    ))
+
+    assert calls == 5
+    assert limiter.global_bucket.tokens == 1
+
+
+@pytest.mark.asyncio
+async def test_chat_limit_keeps_order():
+    limiter = PriorityRateLimiter(global_rate=1000, chat_rate=50, chat_burst=1)
+    sent = []
+
+    def callback(n: int):
+        async def send():
+            sent.append(n)
+            return True
+        return send
+
+    await asyncio.gather(*(
+        limiter.process_request(callback(n), (), {}, "sendMessage", {"chat_id": 7}, None) for n in range(4)
+    ))
+    await limiter.shutdown()
+
+    assert sent == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_are_served_before_bulk():
+    limiter = PriorityRateLimiter(global_rate=20, chat_rate=100, chat_burst=100)
+    limiter.global_bucket.tokens = 0
+    sent = []
+
+    def callback(label: str):
+        async def send():
+            sent.append(label)
+            return True
+        return send
+
+    bulk = [
+        limiter.process_request(callback(f"bulk {n}"), (), {}, "sendMessage", {"chat_id": 100 + n}, SendPriority.BULK)
+        for n in range(3)
+    ]
+    interactive = limiter.process_request(callback("reply"), (), {}, "sendMessage", {"chat_id": 1}, None)
+
+    tasks = [asyncio.ensure_future(request) for request in bulk]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.ensure_future(interactive))
+    await asyncio.sleep(0)
+    assert limiter.stats()["queued_bulk"] == 3
+
+    await asyncio.gather(*tasks)
+    await limiter.shutdown()
+
+    assert sent[0] == "reply"
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honoured():
+    limiter = PriorityRateLimiter(global_rate=1000, chat_rate=1000, chat_burst=10, max_retries=2)
+    attempts = 0
+
+    async def callback():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RetryAfter(timedelta(seconds=0.05))
+        return True
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert await limiter.process_request(callback, (), {}, "sendMessage", {"chat_id": 1}, None)
+    await limiter.shutdown()
+
+    assert attempts == 2
+    assert loop.time() - started >= 0.05
+    assert limiter.stats()["retry_after"] == 1
+    assert limiter.chat_queue_depth(1) == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_raised_once_retries_are_exhausted():
+    limiter = PriorityRateLimiter(global_rate=1000, chat_rate=1000, chat_burst=10, max_retries=1)
+
+    async def callback():
+        raise RetryAfter(timedelta(seconds=0.01))
+
+    with pytest.raises(RetryAfter):
+        await limiter.process_request(callback, (), {}, "sendMessage", {"chat_id": 1}, None)
+    await limiter.shutdown()
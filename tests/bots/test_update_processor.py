@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bots.update_processor import PerUserUpdateProcessor
+
+
+def make_update(user_id: int | None = None, chat_id: int | None = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id) if user_id is not None else None,
+        effective_chat=SimpleNamespace(id=chat_id) if chat_id is not None else None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_updates_from_one_user_run_in_order():
+    processor = PerUserUpdateProcessor(max_concurrent_updates=4)
+    log = []
+
+    async def handle(n: int, delay: float):
+        log.append(f"start {n}")
+        await asyncio.sleep(delay)
+        log.append(f"end {n}")
+
+    await asyncio.gather(*(
+        processor.process_update(make_update(user_id=1), handle(n, delay))
+        for n, delay in enumerate([0.03, 0.01, 0.0])
+    ))
+
+    assert log == ["start 0", "end 0", "start 1", "end 1", "start 2", "end 2"]
+
+
+@pytest.mark.asyncio
+async def test_updates_from_different_users_run_concurrently_up_to_limit():
+    processor = PerUserUpdateProcessor(max_concurrent_updates=2)
+    running = 0
+    peak = 0
+
+    async def handle():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*(processor.process_update(make_update(user_id=n), handle()) for n in range(6)))
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_queued_updates_do_not_take_extra_slots():
+    processor = PerUserUpdateProcessor(max_concurrent_updates=2)
+    release = asyncio.Event()
+    other_user_done = asyncio.Event()
+
+    async def busy():
+        await release.wait()
+
+    async def other():
+        other_user_done.set()
+
+    # user 1 sends a burst while its first update is stuck
+    burst = [asyncio.ensure_future(processor.process_update(make_update(user_id=1), busy())) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert processor.queued_updates == 2
+
+    other_task = asyncio.ensure_future(processor.process_update(make_update(user_id=2), other()))
+    await asyncio.wait_for(other_user_done.wait(), 1)
+
+    release.set()
+    await asyncio.gather(*burst, other_task)
+    assert processor.queued_updates == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_update_does_not_block_later_ones():
+    processor = PerUserUpdateProcessor(max_concurrent_updates=2)
+    handled = []
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def ok():
+        handled.append(True)
+
+    await asyncio.gather(
+        processor.process_update(make_update(chat_id=5), fail()),
+        processor.process_update(make_update(chat_id=5), ok()),
+    )
+
+    assert handled == [True]
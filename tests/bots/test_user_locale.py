@@ -0,0 +1,61 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from telegram import Update, User
+from telegram.ext import Application
+
+from bots.user_locale import UserLocaleResolver
+from localization.locale_store import CurrentLocaleKeyAccessor, LocaleStore, current_locale, use_locale
+
+USER_ID = 5
+
+
+@pytest.fixture
+def store(tmp_path) -> LocaleStore:
+    for locale, greeting in {"en": "Hi", "pt": "Olá", "de": "Hallo"}.items():
+        (tmp_path / f"{locale}.json").write_text(json.dumps({"greeting": greeting}), encoding="utf-8")
+    return LocaleStore(locale_directory=tmp_path)
+
+
+@pytest.fixture
+def application() -> Application:
+    return Application.builder().token("123456:TEST-TOKEN").build()
+
+
+def make_update(language_code=None, user_id=USER_ID) -> Update:
+    update = MagicMock(spec=Update)
+    update.effective_user = None if user_id is None else User(
+        id=user_id, first_name="Aaron", is_bot=False, language_code=language_code
+    )
+    return update
+
+
+@pytest.fixture(autouse=True)
+def default_locale():
+    yield
+    use_locale(None)
+
+
+@pytest.mark.asyncio
+async def test_update_is_served_in_the_users_telegram_language(store, application):
+    resolver = UserLocaleResolver(store)
+    context = MagicMock(application=application)
+
+    await resolver._resolve(make_update("pt-BR"), context)
+
+    assert current_locale() == "pt"
+    assert CurrentLocaleKeyAccessor(store).greeting == "Olá"
+    # resolving the locale does not create user_data
+    assert USER_ID not in application.user_data
+
+
+@pytest.mark.asyncio
+async def test_update_without_user_is_served_in_the_default_locale(store, application):
+    resolver = UserLocaleResolver(store)
+    use_locale("pt")
+
+    await resolver._resolve(make_update(user_id=None), MagicMock(application=application))
+
+    assert current_locale() is None
+    assert CurrentLocaleKeyAccessor(store).greeting == "Hi"
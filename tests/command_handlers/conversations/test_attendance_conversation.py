@@ -16,6 +16,9 @@ from localization import Key
 from models.enums import AccessCategory
 from models.models import Attendance, Event
 from models.responses.responses import EventAttendance
+from services.broadcast import Broadcaster
+from services.callback_codec import CallbackCodec
+from services.live_attendance import LiveAttendanceBoard
 
 
 def make_event_attendance(
@@ -110,9 +113,12 @@ class TestMarkAttendanceConversation:
         user_id = 99
         selected_event = make_event_attendance(user_id=user_id, event_id=321)
 
+        self.conversation.registry.put(selected_event.event)
+
         context = MagicMock(spec=CallbackContext)
         context.user_data = {
-            "selected_event": selected_event,
+            "selected_event_id": 321,
+            "upcoming_attendance": {321: selected_event.attendance},
             "is_event_selected_query_handled": False,
         }
 
@@ -299,3 +305,152 @@ class TestMarkAttendanceConversation:
         next_state = await self.conversation.give_reason(update_yes_but, context)
 
         assert next_state == INDICATING_ATTENDANCE
+
+    @pytest.mark.asyncio
+    async def test_changing_absent_to_attending_resends_announcement(self):
+        broadcaster = AsyncMock(spec=Broadcaster)
+        conversation = MarkAttendanceConversation(controller=self.controller, broadcaster=broadcaster)
+        selected_event = make_event_attendance(user_id=5)
+
+        conversation.registry.put(selected_event.event)
+
+        context = MagicMock(spec=CallbackContext)
+        context.user_data = {
+            "selected_event_id": selected_event.event.id,
+            "upcoming_attendance": {selected_event.event.id: selected_event.attendance},
+            "previous_status": False,
+            "is_event_selected_query_handled": False,
+        }
+
+        callback_yes = MagicMock(spec=CallbackQuery)
+        callback_yes.data = "1"
+        callback_yes.answer = AsyncMock()
+        callback_yes.edit_message_text = AsyncMock(return_value=AsyncMock(spec=Message))
+        update = MagicMock(spec=Update)
+        update.callback_query = callback_yes
+        update.effective_chat = MagicMock(id=5)
+
+        await conversation.attendance_selected(update, context)
+
+        broadcaster.send_announcement.assert_awaited_once_with(chat_id=5, event=selected_event.event)
+
+        # no resend when the user was not previously absent
+        context.user_data["previous_status"] = None
+        await conversation.attendance_selected(update, context)
+        broadcaster.send_announcement.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_attendance_update_refreshes_live_messages(self):
+        live_board = MagicMock(spec=LiveAttendanceBoard)
+        conversation = MarkAttendanceConversation(controller=self.controller, live_board=live_board)
+        selected_event = make_event_attendance(user_id=5, event_id=8)
+        conversation.registry.put(selected_event.event)
+
+        context = MagicMock(spec=CallbackContext)
+        context.user_data = {
+            "selected_event_id": 8,
+            "upcoming_attendance": {8: selected_event.attendance},
+            "is_event_selected_query_handled": False,
+        }
+
+        callback_yes = MagicMock(spec=CallbackQuery)
+        callback_yes.data = "1"
+        callback_yes.answer = AsyncMock()
+        callback_yes.edit_message_text = AsyncMock(return_value=AsyncMock(spec=Message))
+        update = MagicMock(spec=Update)
+        update.callback_query = callback_yes
+
+        await conversation.attendance_selected(update, context)
+
+        live_board.attendance_changed.assert_called_once_with(8)
+
+
+class TestStatelessMarkAttendance:
+    @pytest.fixture(autouse=True)
+    def _setup(self, controller):
+        self.controller = controller
+        self.codec = CallbackCodec(b"shared secret")
+
+    def worker(self) -> MarkAttendanceConversation:
+        # each tap may land on a worker that has never seen this user
+        return MarkAttendanceConversation(controller=self.controller, codec=self.codec)
+
+    @staticmethod
+    def tap(data: str, user_id: int) -> Update:
+        query = MagicMock(spec=CallbackQuery)
+        query.data = data
+        query.answer = AsyncMock()
+        query.edit_message_text = AsyncMock(return_value=AsyncMock(spec=Message))
+        update = MagicMock(spec=Update)
+        update.callback_query = query
+        update.effective_user = MagicMock(spec=User, id=user_id)
+        return update
+
+    @staticmethod
+    def buttons(update: Update):
+        markup = update.callback_query.edit_message_text.await_args.kwargs["reply_markup"]
+        return [button for row in markup.inline_keyboard for button in row]
+
+    @pytest.mark.asyncio
+    async def test_yes_flow_keeps_no_session_state(self):
+        user_id = 7
+        event = make_event_attendance(user_id=user_id, event_id=31)
+        self.controller.retrieve_upcoming_events.return_value = [event]
+        context = MagicMock(spec=CallbackContext)
+        context.user_data = {}
+
+        start = MagicMock(spec=Update)
+        start.effective_user = MagicMock(spec=User, id=user_id)
+        start.message = AsyncMock(spec=Message)
+        assert await self.worker().attendance_command(start, context) == ConversationHandler.END
+        event_data = start.message.reply_text.await_args.kwargs["reply_markup"].inline_keyboard[0][0].callback_data
+
+        selection = self.tap(event_data, user_id)
+        assert await self.worker().event_selected_signed(selection, context) == ConversationHandler.END
+        yes_data = self.buttons(selection)[0].callback_data
+
+        assert await self.worker().status_selected_signed(self.tap(yes_data, user_id), context) == ConversationHandler.END
+
+        self.controller.update_attendance.assert_awaited_once()
+        saved = self.controller.update_attendance.await_args.kwargs["events"][0]
+        assert saved.event.id == 31 and saved.attendance.status is True
+        assert context.user_data == {}
+
+    @pytest.mark.asyncio
+    async def test_reason_for_accountable_absence_waits_in_the_conversation(self):
+        user_id = 8
+        event = make_event_attendance(user_id=user_id, event_id=32, is_accountable=True)
+        self.controller.retrieve_upcoming_events.return_value = [event]
+        context = MagicMock(spec=CallbackContext)
+        context.user_data = {}
+
+        no_data = self.codec.encode("attend", "status", 32, 0, user_id=user_id)
+        state = await self.worker().status_selected_signed(self.tap(no_data, user_id), context)
+
+        assert state == INDICATING_ATTENDANCE
+        self.controller.update_attendance.assert_not_awaited()
+
+        message = AsyncMock(spec=Message)
+        message.text = "Work"
+        message.reply_text.return_value = AsyncMock(spec=Message)
+        reason = MagicMock(spec=Update)
+        reason.message = message
+        conversation = self.worker()
+        conversation.registry.put(event.event)
+
+        assert await conversation.attendance_selected(reason, context) == ConversationHandler.END
+        saved = self.controller.update_attendance.await_args.kwargs["events"][0]
+        assert saved.attendance.status is False and saved.attendance.reason == "Work"
+
+    @pytest.mark.asyncio
+    async def test_tap_issued_to_another_user_is_refused(self):
+        data = self.codec.encode("attend", "status", 31, 1, user_id=7)
+        update = self.tap(data, user_id=9)
+        context = MagicMock(spec=CallbackContext)
+        context.user_data = {}
+
+        assert await self.worker().status_selected_signed(update, context) == ConversationHandler.END
+
+        update.callback_query.edit_message_text.assert_awaited_once_with(Key.menu_expired_retry)
+        self.controller.retrieve_upcoming_events.assert_not_awaited()
+        self.controller.update_attendance.assert_not_awaited()
@@ -1,20 +1,22 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from telegram import CallbackQuery, InlineKeyboardMarkup, Message, Update, User
+from telegram import Bot, CallbackQuery, Chat, InlineKeyboardMarkup, Message, Update, User
 from telegram.ext import CallbackContext, ConversationHandler
 
 from command_handlers.conversations.get_team_attendance_conversation import (
     CHOOSING_EVENT,
     GetTeamAttendanceConversation,
 )
+from custom_components.PaginatedText import MESSAGE_LIMIT, text_length
 from controllers.team_attendance_controller import (
     FakeTeamAttendanceController,
     TeamAttendanceControlling,
 )
 from models.models import AccessCategory, Event
 from models.responses.responses import AttendanceResponse, UserAttendance, UserAttendanceResponse
+from services.live_attendance import LiveAttendanceBoard, LiveMessageStore
 
 
 @pytest.fixture
@@ -71,7 +73,8 @@ class TestGetTeamAttendanceConversation:
 
         next_state = await self.conversation.upcoming_events(update, context)
 
-        assert context.user_data["upcoming_events"] == [event]
+        assert context.user_data["upcoming_event_ids"] == [event.id]
+        assert self.conversation.registry.get(event.id) is event
         assert next_state == CHOOSING_EVENT
 
         reply_text_args = update.message.reply_text.await_args
@@ -109,7 +112,8 @@ class TestGetTeamAttendanceConversation:
 
         event = controller.sample_event
         context = MagicMock(spec=CallbackContext)
-        context.user_data = {"upcoming_events": [event]}
+        conversation.registry.put(event)
+        context.user_data = {"upcoming_event_ids": [event.id]}
 
         attendance_response = await controller.retrieve_team_attendance(event_id=event.id)
         monkeypatch.setattr(conversation, "_format_last_updated", lambda: "11-Oct 2:58PM")
@@ -122,7 +126,7 @@ class TestGetTeamAttendanceConversation:
         update = MagicMock(spec=Update)
         update.callback_query = callback_query
 
-        expected_message = conversation._build_attendance_message(event, attendance_response)
+        expected_message = conversation.build_attendance_message(event, attendance_response)
 
         result = await conversation.return_team_attendance(update, context)
 
@@ -130,6 +134,38 @@ class TestGetTeamAttendanceConversation:
         callback_query.edit_message_text.assert_awaited_once_with(text=expected_message)
         assert result == ConversationHandler.END
 
+    @pytest.mark.asyncio
+    async def test_live_board_keeps_the_message_updated(self):
+        controller = FakeTeamAttendanceController()
+        live_board = AsyncMock(spec=LiveAttendanceBoard)
+        live_board.is_tracked.return_value = False
+        conversation = GetTeamAttendanceConversation(controller=controller, live_board=live_board)
+
+        event = controller.sample_event
+        conversation.registry.put(event)
+        context = MagicMock(spec=CallbackContext)
+        context.user_data = {"upcoming_event_ids": [event.id]}
+
+        callback_query = MagicMock(spec=CallbackQuery)
+        callback_query.data = str(event.id)
+        callback_query.answer = AsyncMock()
+        callback_query.edit_message_text = AsyncMock()
+        callback_query.edit_message_reply_markup = AsyncMock()
+        callback_query.message = MagicMock(spec=Message, message_id=77, chat=MagicMock(id=-100, type=Chat.SUPERGROUP))
+        update = MagicMock(spec=Update)
+        update.callback_query = callback_query
+
+        await conversation.return_team_attendance(update, context)
+
+        reply_markup = callback_query.edit_message_text.await_args.kwargs["reply_markup"]
+        callback_query.data = reply_markup.inline_keyboard[0][0].callback_data
+        assert conversation.live_updates_handler.check_update(update)
+
+        await conversation.keep_updated(update, context)
+
+        live_board.track.assert_awaited_once_with(event, chat_id=-100, message_id=77, pin=True)
+        callback_query.edit_message_reply_markup.assert_awaited_once_with(reply_markup=None)
+
 
 @pytest.fixture
 def attendance_response_fixture() -> UserAttendanceResponse:
@@ -191,6 +227,178 @@ class TestMessageFormatting:
             "last updated: 01-Jan 1:00PM",
         ]
 
-        message = conversation._build_attendance_message(event, attendance_response_fixture)
+        message = conversation.build_attendance_message(event, attendance_response_fixture)
 
         assert message.split("\n") == expected_lines
+
+
+def make_roster(size: int) -> UserAttendanceResponse:
+    users = [
+        UserAttendance(
+            name=f"Member Number {index:03d}",
+            telegram_user=f"member{index:03d}",
+            gender="M",
+            access=AccessCategory.MEMBER,
+            attendance=AttendanceResponse(status=True, reason="Coming after work, might be a bit late"),
+        )
+        for index in range(size)
+    ]
+    return UserAttendanceResponse(male=users, female=[], absent=[], unindicated=[])
+
+
+class TestLargeTeamPagination:
+    @pytest.fixture(autouse=True)
+    def _setup(self, monkeypatch):
+        self.controller = AsyncMock(spec=TeamAttendanceControlling)
+        self.conversation = GetTeamAttendanceConversation(controller=self.controller)
+        self.event = Event(
+            id=5,
+            title="Field Training",
+            start=datetime(2025, 10, 11, 13, 30),
+            end=datetime(2025, 10, 11, 15, 0),
+            is_accountable=True,
+            access_category=AccessCategory.MEMBER,
+        )
+        self.conversation.registry.put(self.event)
+        self.controller.retrieve_team_attendance.return_value = make_roster(300)
+        monkeypatch.setattr(self.conversation, "_format_last_updated", lambda: "11-Oct 2:58PM")
+
+    def test_every_page_fits_in_a_message(self):
+        roster = make_roster(300)
+        pages = []
+        while not pages or pages[-1].has_next:
+            pages.append(self.conversation.render_attendance_page(self.event, roster, len(pages)))
+
+        assert len(pages) > 1
+        assert all(text_length(page.text) <= MESSAGE_LIMIT for page in pages)
+        text = "\n".join(page.text for page in pages)
+        assert all(f"Member Number {index:03d}" in text for index in range(300))
+        assert pages[-1].text.endswith("last updated: 11-Oct 2:58PM")
+
+    def test_first_page_does_not_render_the_whole_roster(self, monkeypatch):
+        rendered = []
+        format_user_line = self.conversation._format_user_line
+        monkeypatch.setattr(
+            self.conversation,
+            "_format_user_line",
+            lambda user, **kwargs: rendered.append(user) or format_user_line(user, **kwargs),
+        )
+
+        self.conversation.render_attendance_page(self.event, make_roster(300), 0)
+
+        assert 0 < len(rendered) < 300
+
+    @pytest.mark.asyncio
+    async def test_navigation_buttons_show_the_next_page(self):
+        context = MagicMock(spec=CallbackContext)
+        context.user_data = {"upcoming_event_ids": [self.event.id]}
+        callback_query = MagicMock(spec=CallbackQuery)
+        callback_query.data = str(self.event.id)
+        callback_query.answer = AsyncMock()
+        callback_query.edit_message_text = AsyncMock()
+        update = MagicMock(spec=Update)
+        update.callback_query = callback_query
+
+        await self.conversation.return_team_attendance(update, context)
+        first_page = callback_query.edit_message_text.await_args.kwargs["text"]
+        _, label, following = callback_query.edit_message_text.await_args.kwargs["reply_markup"].inline_keyboard[0]
+        assert label.text == "1"
+
+        callback_query.data = following.callback_data
+        assert self.conversation.pages_handler.check_update(update)
+        await self.conversation.show_page(update, context)
+
+        second_page = callback_query.edit_message_text.await_args.kwargs["text"]
+        assert second_page != first_page
+        assert "Member Number" in second_page
+        previous, label, _ = callback_query.edit_message_text.await_args.kwargs["reply_markup"].inline_keyboard[0]
+        assert label.text == "2"
+        assert previous.callback_data.endswith(":0")
+
+
+    @pytest.mark.asyncio
+    async def test_live_messages_keep_the_navigation_to_every_page(self, tmp_path):
+        bot = MagicMock(spec=Bot)
+        bot.rate_limiter = None
+        bot.edit_message_text = AsyncMock()
+        bot.pin_chat_message = AsyncMock()
+        live_board = LiveAttendanceBoard(
+            bot=bot,
+            controller=self.controller,
+            registry=self.conversation.registry,
+            render=self.conversation.build_live_message,
+            store=LiveMessageStore(tmp_path / "live.json"),
+            debounce=0.01,
+        )
+        self.conversation.live_board = live_board
+        self.event.start = datetime.now() + timedelta(days=1)
+        self.event.end = self.event.start + timedelta(hours=2)
+
+        context = MagicMock(spec=CallbackContext)
+        context.user_data = {"upcoming_event_ids": [self.event.id]}
+        callback_query = MagicMock(spec=CallbackQuery)
+        callback_query.data = str(self.event.id)
+        callback_query.answer = AsyncMock()
+        callback_query.edit_message_text = AsyncMock()
+        callback_query.edit_message_reply_markup = AsyncMock()
+        callback_query.message = MagicMock(spec=Message, message_id=77, chat=MagicMock(id=-100, type=Chat.PRIVATE))
+        update = MagicMock(spec=Update)
+        update.callback_query = callback_query
+
+        await self.conversation.return_team_attendance(update, context)
+        navigation, live = callback_query.edit_message_text.await_args.kwargs["reply_markup"].inline_keyboard
+        callback_query.message.reply_markup = InlineKeyboardMarkup([navigation, live])
+        callback_query.data = live[0].callback_data
+        await self.conversation.keep_updated(update, context)
+        await live_board.wait()
+
+        kept = callback_query.edit_message_reply_markup.await_args.kwargs["reply_markup"]
+        assert kept.inline_keyboard == (tuple(navigation),)
+        edit = bot.edit_message_text.await_args.kwargs
+        assert edit["text"] == self.conversation.render_attendance_page(self.event, make_roster(300), 0).text
+        _, label, following = edit["reply_markup"].inline_keyboard[0]
+        assert label.text == "1"
+
+        # paging the live message does not offer to keep it updated again
+        callback_query.data = following.callback_data
+        await self.conversation.show_page(update, context)
+        (row,) = callback_query.edit_message_text.await_args.kwargs["reply_markup"].inline_keyboard
+        assert row[1].text == "2"
+        await live_board.aclose()
+
+
+class TestRenderCache:
+    def test_only_changed_members_are_formatted_again(self, monkeypatch):
+        conversation = GetTeamAttendanceConversation(controller=AsyncMock())
+        event = Event(
+            id=5,
+            title="Field Training",
+            start=datetime(2025, 10, 11, 13, 30),
+            end=datetime(2025, 10, 11, 15, 0),
+            is_accountable=True,
+            access_category=AccessCategory.MEMBER,
+        )
+        formatted = []
+        format_user_line = conversation._format_user_line
+        monkeypatch.setattr(
+            conversation,
+            "_format_user_line",
+            lambda user, **kwargs: formatted.append(user.name) or format_user_line(user, **kwargs),
+        )
+
+        roster = make_roster(50)
+        first = conversation.build_attendance_message(event, roster, timestamp="now")
+        assert len(formatted) == 50
+
+        formatted.clear()
+        changed = make_roster(50)
+        changed.male[7].attendance = AttendanceResponse(status=True, reason="Bringing cones")
+        second = conversation.build_attendance_message(event, changed, timestamp="now")
+
+        assert formatted == ["Member Number 007"]
+        assert "Member Number 007 (Bringing cones)" in second
+        assert second.replace(" (Bringing cones)", " (Coming after work, might be a bit late)") == first
+
+        formatted.clear()
+        assert conversation.build_attendance_message(event, changed, timestamp="now") == second
+        assert formatted == []
@@ -12,19 +12,21 @@ from command_handlers.conversations.manage_access_conversation import (
     ManageAccessConversation,
 )
 from controllers.manage_access_controller import ManageAccessControlling
+from localization import Key
 from models.enums import AccessCategory
 from models.models import User
+from services.callback_codec import CallbackCodec
 
 
 @pytest.fixture
-def controller() -> MagicMock:
-    controller = MagicMock(spec=ManageAccessControlling)
+def controller() -> AsyncMock:
+    controller = AsyncMock(spec=ManageAccessControlling)
     controller.retrieve_access_categories.return_value = list(AccessCategory)
     return controller
 
 
 @pytest.fixture
-def conversation(controller: MagicMock) -> ManageAccessConversation:
+def conversation(controller: AsyncMock) -> ManageAccessConversation:
     return ManageAccessConversation(controller=controller)
 
 
@@ -46,11 +48,11 @@ async def test_manage_access_entry_shows_categories(conversation, controller):
 
     state = await conversation.show_categories(update, context)
 
-    controller.retrieve_access_categories.assert_called_once()
+    controller.retrieve_access_categories.assert_awaited_once()
     args, kwargs = message.reply_text.await_args
     markup = kwargs["reply_markup"]
     callback_data = [btn.callback_data for row in markup.inline_keyboard for btn in row]
-    expected_data = [f"category:{c.value}" for c in AccessCategory]
+    expected_data = [f"access:category:{c.value}" for c in AccessCategory]
     assert callback_data == expected_data
     assert state == SHOWING_CATEGORIES
 
@@ -61,7 +63,7 @@ async def test_category_selection_retrieves_users(conversation, controller):
     controller.retrieve_users.return_value = users
 
     query = MagicMock(spec=CallbackQuery)
-    query.data = "category:member"
+    query.data = "access:category:member"
     query.answer = AsyncMock()
     query.edit_message_text = AsyncMock(return_value=AsyncMock(spec=Message))
 
@@ -73,13 +75,13 @@ async def test_category_selection_retrieves_users(conversation, controller):
 
     state = await conversation.show_users(update, context)
 
-    controller.retrieve_users.assert_called_once_with(AccessCategory.MEMBER)
+    controller.retrieve_users.assert_awaited_once_with(AccessCategory.MEMBER)
     args, kwargs = query.edit_message_text.await_args
     markup = kwargs["reply_markup"]
     user_callbacks = [btn.callback_data for row in markup.inline_keyboard[:-1] for btn in row]
-    assert user_callbacks == ["user:1", "user:2"]
+    assert user_callbacks == ["access:user:1", "access:user:2"]
     back_callback = markup.inline_keyboard[-1][0].callback_data
-    assert back_callback == "back:categories"
+    assert back_callback == "access:back:categories"
     assert context.user_data["selected_category"] == AccessCategory.MEMBER
     assert state == SHOWING_USERS
 
@@ -92,7 +94,7 @@ async def test_user_selection_shows_access_options_for_regular_and_super_users(c
 
     # Regular user shows all categories
     query = MagicMock(spec=CallbackQuery)
-    query.data = "user:1"
+    query.data = "access:user:1"
     query.answer = AsyncMock()
     query.edit_message_text = AsyncMock()
 
@@ -107,12 +109,12 @@ async def test_user_selection_shows_access_options_for_regular_and_super_users(c
     args, kwargs = query.edit_message_text.await_args
     markup = kwargs["reply_markup"]
     callbacks = [btn.callback_data for row in markup.inline_keyboard[:-1] for btn in row]
-    assert set(callbacks) == {f"access:{c.value}" for c in AccessCategory}
+    assert set(callbacks) == {f"access:level:{c.value}" for c in AccessCategory}
     assert state == SHOWING_ACCESS_OPTIONS
 
     # Super user should only show admin option
     query_admin = MagicMock(spec=CallbackQuery)
-    query_admin.data = "user:2"
+    query_admin.data = "access:user:2"
     query_admin.answer = AsyncMock()
     query_admin.edit_message_text = AsyncMock()
 
@@ -127,7 +129,7 @@ async def test_user_selection_shows_access_options_for_regular_and_super_users(c
     args_admin, kwargs_admin = query_admin.edit_message_text.await_args
     markup_admin = kwargs_admin["reply_markup"]
     callbacks_admin = [btn.callback_data for row in markup_admin.inline_keyboard[:-1] for btn in row]
-    assert callbacks_admin == ["access:admin"]
+    assert callbacks_admin == ["access:level:admin"]
     assert state_admin == SHOWING_ACCESS_OPTIONS
 
 
@@ -135,7 +137,7 @@ async def test_user_selection_shows_access_options_for_regular_and_super_users(c
 async def test_choose_access_shows_confirmation(conversation):
     user = create_user(1, "Alice", AccessCategory.MEMBER)
     query = MagicMock(spec=CallbackQuery)
-    query.data = "access:guest"
+    query.data = "access:level:guest"
     query.answer = AsyncMock()
     query.edit_message_text = AsyncMock()
 
@@ -150,7 +152,7 @@ async def test_choose_access_shows_confirmation(conversation):
     args, kwargs = query.edit_message_text.await_args
     markup = kwargs["reply_markup"]
     callbacks = [btn.callback_data for row in markup.inline_keyboard for btn in row]
-    assert callbacks == ["confirm:set_access", "back:access"]
+    assert callbacks == ["access:confirm", "access:back:access"]
     assert context.user_data["selected_access"] == AccessCategory.GUEST
     assert state == CONFIRMING_ACCESS
 
@@ -173,7 +175,7 @@ async def test_confirmation_sets_access(conversation, controller):
 
     state = await conversation.confirm_access(update, context)
 
-    controller.set_access.assert_called_once_with(user, AccessCategory.ADMIN)
+    controller.set_access.assert_awaited_once_with(user, AccessCategory.ADMIN)
     assert state == ConversationHandler.END
 
 
@@ -204,7 +206,7 @@ async def test_back_navigation_restores_previous_state(conversation, controller)
     args_access, kwargs_access = back_access_query.edit_message_text.await_args
     markup_access = kwargs_access["reply_markup"]
     callbacks_access = [btn.callback_data for row in markup_access.inline_keyboard[:-1] for btn in row]
-    assert set(callbacks_access) == {f"access:{c.value}" for c in AccessCategory}
+    assert set(callbacks_access) == {f"access:level:{c.value}" for c in AccessCategory}
 
     # Back from access options to users list
     back_users_query = MagicMock(spec=CallbackQuery)
@@ -219,5 +221,94 @@ async def test_back_navigation_restores_previous_state(conversation, controller)
     args_users, kwargs_users = back_users_query.edit_message_text.await_args
     markup_users = kwargs_users["reply_markup"]
     user_callbacks = [btn.callback_data for row in markup_users.inline_keyboard[:-1] for btn in row]
-    assert user_callbacks == ["user:1"]
-    assert markup_users.inline_keyboard[-1][0].callback_data == "back:categories"
+    assert user_callbacks == ["access:user:1"]
+    assert markup_users.inline_keyboard[-1][0].callback_data == "access:back:categories"
+
+
+def signed_update(data: str, user_id: int = 42) -> Update:
+    query = MagicMock(spec=CallbackQuery)
+    query.data = data
+    query.answer = AsyncMock()
+    query.edit_message_text = AsyncMock()
+
+    update = MagicMock(spec=Update)
+    update.callback_query = query
+    update.effective_user = MagicMock(id=user_id)
+    return update
+
+
+def markup_of(update: Update):
+    return update.callback_query.edit_message_text.await_args.kwargs["reply_markup"]
+
+
+@pytest.mark.asyncio
+async def test_stateless_flow_runs_each_tap_on_any_worker(controller):
+    user = create_user(7, "Alice", AccessCategory.MEMBER)
+    controller.retrieve_users.return_value = [user]
+
+    def worker() -> ManageAccessConversation:
+        # each tap lands on a worker that has never seen this user
+        return ManageAccessConversation(controller=controller, codec=CallbackCodec(b"shared secret"))
+
+    message = MagicMock(spec=Message)
+    message.reply_text = AsyncMock()
+    start = MagicMock(spec=Update)
+    start.callback_query = None
+    start.message = message
+    start.effective_user = MagicMock(id=42)
+    context = MagicMock(spec=CallbackContext)
+    context.user_data = {}
+
+    assert await worker().show_categories(start, context) == ConversationHandler.END
+    categories = message.reply_text.await_args.kwargs["reply_markup"].inline_keyboard
+    member_data = next(row[0].callback_data for row in categories if row[0].text == "Member")
+
+    users_update = signed_update(member_data)
+    assert await worker().show_users_signed(users_update, context) == ConversationHandler.END
+    controller.retrieve_users.assert_awaited_with(AccessCategory.MEMBER)
+
+    access_update = signed_update(markup_of(users_update).inline_keyboard[0][0].callback_data)
+    assert await worker().show_access_options_signed(access_update, context) == ConversationHandler.END
+    admin_data = next(row[0].callback_data for row in markup_of(access_update).inline_keyboard if row[0].text == "Admin")
+
+    confirm_update = signed_update(admin_data)
+    assert await worker().choose_access_signed(confirm_update, context) == ConversationHandler.END
+    confirm_data = markup_of(confirm_update).inline_keyboard[0][0].callback_data
+
+    assert await worker().confirm_access_signed(signed_update(confirm_data), context) == ConversationHandler.END
+    controller.set_access.assert_awaited_once_with(user, AccessCategory.ADMIN)
+    assert context.user_data == {}
+    assert all(len(data.encode()) <= 64 for data in (member_data, admin_data, confirm_data))
+
+
+@pytest.mark.asyncio
+async def test_stateless_back_buttons_show_the_previous_step(controller):
+    user = create_user(7, "Alice", AccessCategory.MEMBER)
+    controller.retrieve_users.return_value = [user]
+    conversation = ManageAccessConversation(controller=controller, codec=CallbackCodec(b"shared secret"))
+    codec = conversation.codec
+    context = MagicMock(spec=CallbackContext)
+    context.user_data = {}
+
+    confirm_update = signed_update(codec.encode("access", "level", 1, 7, 3, user_id=42))
+    await conversation.choose_access_signed(confirm_update, context)
+    back_data = markup_of(confirm_update).inline_keyboard[-1][0].callback_data
+
+    handler = conversation.conversation_handler
+    router = handler.entry_points[1]
+    assert router.check_update(signed_update(back_data)) == conversation.show_access_options_signed
+    assert codec.decode(back_data, user_id=42) == (1, 7)
+
+
+@pytest.mark.asyncio
+async def test_stateless_taps_with_foreign_or_tampered_data_change_nothing(controller):
+    conversation = ManageAccessConversation(controller=controller, codec=CallbackCodec(b"shared secret"))
+    context = MagicMock(spec=CallbackContext)
+    context.user_data = {}
+    data = conversation.codec.encode("access", "confirm", 1, 7, 3, user_id=42)
+
+    for update in (signed_update(data, user_id=43), signed_update(data[:-2] + "xx"), signed_update("access:confirm:7")):
+        assert await conversation.confirm_access_signed(update, context) == ConversationHandler.END
+        update.callback_query.edit_message_text.assert_awaited_once_with(text=Key.menu_expired_retry)
+
+    controller.set_access.assert_not_awaited()
@@ -16,11 +16,12 @@ from controllers.manage_event_controller import ManageEventControlling
 from custom_components.CalendarKeyboardMarkup import CalendarKeyboardMarkup
 from models.enums import AccessCategory
 from models.models import Event
+from services.broadcast import Broadcaster
 
 
 @pytest.fixture
-def controller() -> MagicMock:
-    controller = MagicMock(spec=ManageEventControlling)
+def controller() -> AsyncMock:
+    controller = AsyncMock(spec=ManageEventControlling)
     controller.retrieve_events.return_value = []
     controller.create_new_event.side_effect = lambda start_datetime: Event(
         id=-1,
@@ -36,7 +37,7 @@ def controller() -> MagicMock:
 
 
 @pytest.fixture
-def conversation(controller: MagicMock) -> ManageEventConversation:
+def conversation(controller: AsyncMock) -> ManageEventConversation:
     return ManageEventConversation(controller=controller)
 
 
@@ -58,7 +59,7 @@ def sample_event() -> Event:
 @pytest.mark.asyncio
 async def test_select_date_shows_calendar(conversation, sample_event):
     query = MagicMock(spec=CallbackQuery)
-    query.data = "set_datetime_start"
+    query.data = "event:date:start"
     query.answer = AsyncMock()
     query.edit_message_text = AsyncMock(return_value=AsyncMock(spec=Message))
 
@@ -75,18 +76,28 @@ async def test_select_date_shows_calendar(conversation, sample_event):
     assert state == SETTING_DATE
 
 
-def test_callback_patterns_accept_event_and_calendar(conversation):
+def callback_update(data: str) -> Update:
+    update = MagicMock(spec=Update)
+    update.callback_query = MagicMock(spec=CallbackQuery)
+    update.callback_query.data = data
+    return update
+
+
+def test_callback_routes_accept_event_and_calendar(conversation):
     handler = conversation.conversation_handler
 
-    choose_handlers = handler.states[CHOOSING_EVENT][0]
-    assert choose_handlers.pattern.match("event:123")
-    assert choose_handlers.pattern.match("event:uuid-123")
+    choose_router = handler.states[CHOOSING_EVENT][0]
+    assert choose_router.check_update(callback_update("event:open:123")) == conversation.selected_event
+    assert choose_router.check_update(callback_update("event:open:uuid-123")) == conversation.selected_event
+    assert choose_router.check_update(callback_update("event:date:new")) == conversation.select_date
+    assert choose_router.check_update(callback_update("event:title")) is None
 
-    date_handlers = handler.states[SETTING_DATE]
-    date_pattern = CalendarKeyboardMarkup.encode_date(date(2024, 5, 1))
-    step_pattern = CalendarKeyboardMarkup.encode_step(2024, 6)
-    assert any(getattr(h, "pattern", None) and h.pattern.match(date_pattern) for h in date_handlers)
-    assert any(getattr(h, "pattern", None) and h.pattern.match(step_pattern) for h in date_handlers)
+    date_router = handler.states[SETTING_DATE][0]
+    date_data = CalendarKeyboardMarkup.encode_date(date(2024, 5, 1))
+    step_data = CalendarKeyboardMarkup.encode_step(2024, 6)
+    assert date_router.check_update(callback_update(date_data)) == conversation.set_time
+    assert date_router.check_update(callback_update(step_data)) == conversation.select_date
+    assert date_router.check_update(callback_update("noop")) is None
 
 
 @pytest.mark.asyncio
@@ -230,7 +241,7 @@ async def test_update_event_datetime_reprompts_on_invalid_text(conversation, sam
 @pytest.mark.asyncio
 async def test_end_date_flow_includes_use_start_button(conversation, sample_event):
     query = MagicMock(spec=CallbackQuery)
-    query.data = "set_datetime_end"
+    query.data = "event:date:end"
     query.answer = AsyncMock()
     query.edit_message_text = AsyncMock(return_value=AsyncMock(spec=Message))
 
@@ -253,7 +264,7 @@ async def test_deadline_presets_and_clear(conversation, sample_event):
     sample_event.start = datetime(2024, 5, 10, 12, 0)
     sample_event.attendance_deadline = datetime(2024, 5, 9, 23, 59)
     query = MagicMock(spec=CallbackQuery)
-    query.data = "set_datetime_deadline"
+    query.data = "event:date:deadline"
     query.answer = AsyncMock()
     query.edit_message_text = AsyncMock(return_value=AsyncMock(spec=Message))
 
@@ -273,7 +284,7 @@ async def test_deadline_presets_and_clear(conversation, sample_event):
     assert any(btn.text.strip() == "9" for btn in flat)
 
     preset_query = MagicMock(spec=CallbackQuery)
-    preset_query.data = "deadline_preset:none"
+    preset_query.data = "event:preset:none"
     preset_query.answer = AsyncMock()
     preset_query.edit_message_text = AsyncMock()
     preset_update = MagicMock(spec=Update)
@@ -298,5 +309,70 @@ async def test_commit_event_updates_controller(conversation, sample_event, contr
 
     state = await conversation.commit_event(update, context)
 
-    controller.update_event.assert_called_once_with(sample_event)
+    controller.update_event.assert_awaited_once_with(sample_event)
     assert state == ConversationHandler.END
+
+
+@pytest.mark.asyncio
+async def test_commit_new_event_announces_it(controller):
+    broadcaster = AsyncMock(spec=Broadcaster)
+    conversation = ManageEventConversation(controller=controller, broadcaster=broadcaster)
+    new_event = await controller.create_new_event(start_datetime=datetime(2025, 10, 11, 13, 30))
+
+    query = MagicMock(spec=CallbackQuery)
+    query.answer = AsyncMock()
+    query.edit_message_text = AsyncMock()
+    update = MagicMock(spec=Update)
+    update.callback_query = query
+    update.effective_chat = MagicMock(id=555)
+
+    context = MagicMock(spec=CallbackContext)
+    context.user_data = {"selected_event": new_event}
+
+    await conversation.commit_event(update, context)
+
+    broadcaster.announce_event.assert_awaited_once_with(new_event, admin_chat_id=555)
+
+
+@pytest.mark.asyncio
+async def test_commit_existing_event_is_not_announced(controller, sample_event):
+    broadcaster = AsyncMock(spec=Broadcaster)
+    conversation = ManageEventConversation(controller=controller, broadcaster=broadcaster)
+
+    query = MagicMock(spec=CallbackQuery)
+    query.answer = AsyncMock()
+    query.edit_message_text = AsyncMock()
+    update = MagicMock(spec=Update)
+    update.callback_query = query
+
+    context = MagicMock(spec=CallbackContext)
+    context.user_data = {"selected_event": sample_event}
+
+    await conversation.commit_event(update, context)
+
+    broadcaster.announce_event.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_edits_stay_private_until_committed(conversation, sample_event):
+    conversation.registry.put(sample_event)
+
+    query = MagicMock(spec=CallbackQuery)
+    query.data = f"event:open:{sample_event.id}"
+    query.answer = AsyncMock()
+    query.edit_message_text = AsyncMock(return_value=AsyncMock(spec=Message))
+    update = MagicMock(spec=Update)
+    update.callback_query = query
+
+    context = MagicMock(spec=CallbackContext)
+    context.user_data = {"upcoming_event_ids": [sample_event.id]}
+
+    await conversation.selected_event(update, context)
+    draft = context.user_data["selected_event"]
+    draft.title = "Scrim"
+
+    assert conversation.registry.get(sample_event.id).title == "Field Training"
+
+    await conversation.commit_event(update, context)
+
+    assert conversation.registry.get(sample_event.id).title == "Scrim"
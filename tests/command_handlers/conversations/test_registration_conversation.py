@@ -62,7 +62,7 @@ class TestRegistrationConversation:
         reply_args = update.message.reply_text.await_args
         args, kwargs = reply_args
         assert isinstance(kwargs["reply_markup"], InlineKeyboardMarkup)
-        assert kwargs["reply_markup"].inline_keyboard[0][0].callback_data == "Male"
+        assert kwargs["reply_markup"].inline_keyboard[0][0].callback_data == "register:gender:Male"
 
     @pytest.mark.asyncio
     async def test_confirm_name_conflict_requests_new_name(self):
@@ -113,7 +113,7 @@ class TestRegistrationConversation:
         assert state == CONFIRMING_NAME
 
         query = MagicMock(spec=CallbackQuery)
-        query.data = "Female"
+        query.data = "register:gender:Female"
         query.answer = AsyncMock()
         query.edit_message_text = AsyncMock()
         update_callback = MagicMock(spec=Update)
@@ -131,7 +131,7 @@ class TestRegistrationConversation:
         update = MagicMock(spec=Update)
         update.effective_user = MagicMock(spec=TgUser, id=5, username="prefilled")
         callback_query = MagicMock(spec=CallbackQuery)
-        callback_query.data = "forward"
+        callback_query.data = "register:forward"
         callback_query.answer = AsyncMock()
         callback_query.edit_message_text = AsyncMock()
         update.callback_query = callback_query
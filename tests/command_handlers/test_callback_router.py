@@ -0,0 +1,80 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram import CallbackQuery, Message, Update
+from telegram.ext import CallbackContext
+
+from command_handlers.callback_router import CallbackRouter
+
+
+def callback_update(data) -> Update:
+    update = MagicMock(spec=Update)
+    update.callback_query = MagicMock(spec=CallbackQuery)
+    update.callback_query.data = data
+    return update
+
+
+@pytest.fixture
+def callbacks():
+    return {"open": AsyncMock(return_value=1), "title": AsyncMock(return_value=2), "step": AsyncMock(return_value=3)}
+
+
+@pytest.fixture
+def router(callbacks) -> CallbackRouter:
+    return CallbackRouter({
+        "event:open": callbacks["open"],
+        "event:title": callbacks["title"],
+        "cal:step": callbacks["step"],
+    })
+
+
+def test_routes_by_namespace_and_verb(router, callbacks):
+    assert router.check_update(callback_update("event:open:42")) is callbacks["open"]
+    assert router.check_update(callback_update("event:title")) is callbacks["title"]
+    assert router.check_update(callback_update("cal:step:2024-06")) is callbacks["step"]
+
+
+def test_unrouted_data_is_not_handled(router):
+    assert router.check_update(callback_update("event:delete:42")) is None
+    assert router.check_update(callback_update("cal:open:42")) is None
+    assert router.check_update(callback_update("noop")) is None
+    assert router.check_update(callback_update("")) is None
+    assert router.check_update(callback_update(None)) is None
+
+
+def test_ignores_updates_without_callback_query(router):
+    update = MagicMock(spec=Update)
+    update.callback_query = None
+    update.message = MagicMock(spec=Message)
+
+    assert router.check_update(update) is None
+    assert router.check_update("event:open:42") is None
+
+
+@pytest.mark.parametrize("route", ["event", "event:", ":open", "event:open:now"])
+def test_rejects_routes_without_namespace_and_verb(route):
+    with pytest.raises(ValueError):
+        CallbackRouter({route: AsyncMock()})
+
+
+@pytest.mark.asyncio
+async def test_handle_update_calls_the_matched_route_and_returns_its_state(router, callbacks):
+    update = callback_update("event:open:42")
+    context = MagicMock(spec=CallbackContext)
+
+    state = await router.handle_update(update, MagicMock(), router.check_update(update), context)
+
+    callbacks["open"].assert_awaited_once_with(update, context)
+    callbacks["title"].assert_not_awaited()
+    assert state == 1
+
+
+def test_encode_and_parse_round_trip():
+    data = CallbackRouter.encode("page", "kaypoh", "7:2")
+
+    assert data == "page:kaypoh:7:2"
+    assert CallbackRouter.parse(data) == ("page", "kaypoh", "7:2")
+    assert CallbackRouter.payload(data) == "7:2"
+    assert CallbackRouter.encode("event", "title") == "event:title"
+    assert CallbackRouter.parse("event:title") == ("event", "title", "")
+    assert CallbackRouter.payload("event:title") == ""
@@ -0,0 +1,140 @@
+import json
+from datetime import date, datetime, timedelta
+
+import httpx
+import pytest
+
+from controllers.attendance_controller import AttendanceController
+from controllers.team_attendance_controller import TeamAttendanceController
+from models.enums import AccessCategory
+from models.models import Attendance, Event
+from models.records import RosterRecord
+from models.responses import AttendanceResponse, EventAttendance, UserAttendance, UserAttendanceResponse
+from services.backend_client import BackendClient
+from services.payload_decoder import PayloadDecoder, StdlibJsonCodec
+
+
+def make_event_attendance(user_id: int, event_id: int = 1) -> EventAttendance:
+    start = datetime(2025, 10, 11, 13, 30)
+    return EventAttendance(
+        event=Event(
+            id=event_id,
+            title="Field Training",
+            start=start,
+            end=start + timedelta(hours=2),
+            is_accountable=True,
+            access_category=AccessCategory.MEMBER,
+        ),
+        attendance=Attendance(event_id=event_id, user_id=user_id, status=True, reason="late"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_retrieve_upcoming_events_decodes_backend_payload():
+    expected = make_event_attendance(user_id=7)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=[expected.model_dump(mode="json")])
+
+    client = BackendClient("http://backend", http2=False, transport=httpx.MockTransport(handler))
+    controller = AttendanceController(client=client)
+
+    events = await controller.retrieve_upcoming_events(user_id=7, from_date=date(2025, 10, 1))
+    await client.aclose()
+
+    assert events == [expected]
+    assert requests[0].url.path == "/users/7/attendance"
+    assert requests[0].url.params["from_date"] == "2025-10-01"
+
+
+@pytest.mark.asyncio
+async def test_update_attendance_posts_attendance_items():
+    event = make_event_attendance(user_id=7, event_id=3)
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(204)
+
+    client = BackendClient("http://backend", http2=False, transport=httpx.MockTransport(handler))
+    controller = AttendanceController(client=client)
+
+    await controller.update_attendance(events=[event])
+    await client.aclose()
+
+    assert bodies == [[{"user_id": 7, "event_id": 3, "status": True, "reason": "late"}]]
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_one_pool_until_closed():
+    client = BackendClient("http://backend", http2=False, transport=httpx.MockTransport(lambda r: httpx.Response(200, json=[])))
+
+    first = client.client
+    await client.get_json("/ping")
+    assert client.client is first
+
+    await client.aclose()
+    assert first.is_closed
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_are_raised():
+    client = BackendClient("http://backend", http2=False, transport=httpx.MockTransport(lambda r: httpx.Response(503)))
+    controller = AttendanceController(client=client, timeout=1.0)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await controller.retrieve_upcoming_events(user_id=1, from_date=date.today())
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_retrieve_team_attendance_decodes_the_roster():
+    member = UserAttendance(
+        name="Aaron",
+        telegram_user="aaron",
+        gender="M",
+        access=AccessCategory.MEMBER,
+        attendance=AttendanceResponse(status=True, reason="late"),
+    )
+    roster = UserAttendanceResponse(male=[member], female=[], absent=[], unindicated=[])
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return httpx.Response(200, json=roster.model_dump(mode="json"))
+
+    client = BackendClient(
+        "http://backend",
+        http2=False,
+        transport=httpx.MockTransport(handler),
+        decoder=PayloadDecoder(),
+    )
+    controller = TeamAttendanceController(client=client)
+
+    result = await controller.retrieve_team_attendance(event_id=3)
+    await client.aclose()
+
+    assert result == RosterRecord.from_model(roster)
+    assert paths == ["/events/3/attendance"]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_encoded_with_the_decoder_codec():
+    codec = StdlibJsonCodec()
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=b'{"ok":true}')
+
+    client = BackendClient(
+        "http://backend", http2=False, transport=httpx.MockTransport(handler), decoder=PayloadDecoder(codec=codec)
+    )
+
+    assert await client.post_json("/attendance", [{"status": None}]) == {"ok": True}
+    await client.aclose()
+
+    assert requests[0].content == b'[{"status":null}]'
+    assert requests[0].headers["Content-Type"] == "application/json"
@@ -0,0 +1,117 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from controllers.attendance_controller import AttendanceControlling
+from controllers.batching import BatchingAttendanceController
+from models.enums import AccessCategory
+from models.models import Attendance, Event
+from models.responses import EventAttendance
+
+
+def make_event_attendance(user_id: int, event_id: int = 1, status: bool = True) -> EventAttendance:
+    start = datetime(2025, 10, 11, 13, 30)
+    return EventAttendance(
+        event=Event(
+            id=event_id,
+            title="Field Training",
+            start=start,
+            end=start + timedelta(hours=2),
+            is_accountable=True,
+            access_category=AccessCategory.MEMBER,
+        ),
+        attendance=Attendance(event_id=event_id, user_id=user_id, status=status),
+    )
+
+
+@pytest.mark.asyncio
+async def test_updates_within_window_are_sent_as_one_batch():
+    backend = AsyncMock(spec=AttendanceControlling)
+    controller = BatchingAttendanceController(backend, max_delay=0.05, max_batch_size=100)
+
+    await asyncio.gather(*(
+        controller.update_attendance(events=[make_event_attendance(user_id)]) for user_id in range(10)
+    ))
+
+    backend.update_attendance.assert_awaited_once()
+    sent = backend.update_attendance.await_args.kwargs["events"]
+    assert [item.attendance.user_id for item in sent] == list(range(10))
+    assert controller.stats() == {"batches_sent": 1, "items_sent": 10, "pending": 0}
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_flushed_without_waiting_for_window():
+    backend = AsyncMock(spec=AttendanceControlling)
+    controller = BatchingAttendanceController(backend, max_delay=60, max_batch_size=3)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(controller.update_attendance(events=[make_event_attendance(i)]) for i in range(3))),
+        timeout=1,
+    )
+
+    backend.update_attendance.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_caller_waits_for_its_batch_to_be_acknowledged():
+    release = asyncio.Event()
+    backend = AsyncMock(spec=AttendanceControlling)
+
+    async def slow_update(events):
+        await release.wait()
+
+    backend.update_attendance.side_effect = slow_update
+    controller = BatchingAttendanceController(backend, max_delay=0, max_batch_size=10)
+
+    task = asyncio.ensure_future(controller.update_attendance(events=[make_event_attendance(1)]))
+    await asyncio.sleep(0.01)
+    assert not task.done()
+
+    release.set()
+    await asyncio.wait_for(task, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_is_raised_to_every_caller_in_batch():
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.update_attendance.side_effect = RuntimeError("backend down")
+    controller = BatchingAttendanceController(backend, max_delay=0.01)
+
+    results = await asyncio.gather(
+        controller.update_attendance(events=[make_event_attendance(1)]),
+        controller.update_attendance(events=[make_event_attendance(2)]),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert controller.stats()["batches_sent"] == 0
+
+
+@pytest.mark.asyncio
+async def test_latest_update_for_same_user_and_event_wins():
+    backend = AsyncMock(spec=AttendanceControlling)
+    controller = BatchingAttendanceController(backend, max_delay=0.01)
+
+    await asyncio.gather(
+        controller.update_attendance(events=[make_event_attendance(1, status=True)]),
+        controller.update_attendance(events=[make_event_attendance(1, status=False)]),
+    )
+
+    sent = backend.update_attendance.await_args.kwargs["events"]
+    assert len(sent) == 1
+    assert sent[0].attendance.status is False
+
+
+@pytest.mark.asyncio
+async def test_aclose_flushes_pending_updates():
+    backend = AsyncMock(spec=AttendanceControlling)
+    controller = BatchingAttendanceController(backend, max_delay=60)
+
+    task = asyncio.ensure_future(controller.update_attendance(events=[make_event_attendance(1)]))
+    await asyncio.sleep(0)
+    await controller.aclose()
+    await task
+
+    backend.update_attendance.assert_awaited_once()
@@ -0,0 +1,174 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from controllers.attendance_controller import AttendanceControlling
+from controllers.caching import (
+    CachedAttendanceController,
+    CachedManageEventController,
+    CachedTeamAttendanceController,
+    UpcomingEventsCache,
+)
+from controllers.manage_event_controller import ManageEventControlling
+from controllers.team_attendance_controller import TeamAttendanceControlling
+from models.enums import AccessCategory
+from models.models import Attendance, Event
+from models.responses import EventAttendance
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_event(event_id: int, start: datetime = datetime(2025, 10, 11, 13, 30)) -> Event:
+    return Event(
+        id=event_id,
+        title="Field Training",
+        start=start,
+        end=start + timedelta(hours=2),
+        is_accountable=True,
+        access_category=AccessCategory.MEMBER,
+    )
+
+
+def make_event_attendance(user_id: int, event_id: int) -> EventAttendance:
+    return EventAttendance(
+        event=make_event(event_id),
+        attendance=Attendance(event_id=event_id, user_id=user_id, status=None),
+    )
+
+
+@pytest.mark.asyncio
+async def test_attendance_events_are_cached_per_user_until_ttl():
+    clock = FakeClock()
+    cache = UpcomingEventsCache(ttl=60, clock=clock)
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.retrieve_upcoming_events.side_effect = lambda user_id, from_date: [make_event_attendance(user_id, 1)]
+    controller = CachedAttendanceController(backend, cache=cache)
+    today = date(2025, 10, 1)
+
+    first = await controller.retrieve_upcoming_events(user_id=1, from_date=today)
+    second = await controller.retrieve_upcoming_events(user_id=1, from_date=today)
+    await controller.retrieve_upcoming_events(user_id=2, from_date=today)
+
+    assert first == second
+    assert backend.retrieve_upcoming_events.await_count == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+    clock.now = 61
+    await controller.retrieve_upcoming_events(user_id=1, from_date=today)
+    assert backend.retrieve_upcoming_events.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_values_are_isolated_from_caller_mutations():
+    cache = UpcomingEventsCache(ttl=60)
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.retrieve_upcoming_events.return_value = [make_event_attendance(1, 1)]
+    controller = CachedAttendanceController(backend, cache=cache)
+
+    first = await controller.retrieve_upcoming_events(user_id=1, from_date=date.today())
+    first[0].attendance.status = True
+    second = await controller.retrieve_upcoming_events(user_id=1, from_date=date.today())
+
+    assert second[0].attendance.status is None
+
+
+@pytest.mark.asyncio
+async def test_update_attendance_invalidates_only_that_users_lists():
+    cache = UpcomingEventsCache(ttl=60)
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.retrieve_upcoming_events.side_effect = lambda user_id, from_date: [make_event_attendance(user_id, 1)]
+    controller = CachedAttendanceController(backend, cache=cache)
+    today = date.today()
+
+    await controller.retrieve_upcoming_events(user_id=1, from_date=today)
+    await controller.retrieve_upcoming_events(user_id=2, from_date=today)
+    await controller.update_attendance(events=[make_event_attendance(1, 1)])
+
+    assert cache.stats()["size"] == 1
+    assert cache.get(cache.make_key("attendance", 2, today)) is not None
+    backend.update_attendance.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_list_fetched_before_an_invalidation_is_not_cached():
+    cache = UpcomingEventsCache(ttl=60)
+    fetching, release = asyncio.Event(), asyncio.Event()
+
+    async def retrieve_upcoming_events(user_id, from_date):
+        fetching.set()
+        await release.wait()
+        return [make_event_attendance(user_id, 1)]
+
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.retrieve_upcoming_events.side_effect = retrieve_upcoming_events
+    controller = CachedAttendanceController(backend, cache=cache)
+    today = date.today()
+
+    stale_read = asyncio.ensure_future(controller.retrieve_upcoming_events(user_id=1, from_date=today))
+    other_read = asyncio.ensure_future(controller.retrieve_upcoming_events(user_id=2, from_date=today))
+    await fetching.wait()
+    await controller.update_attendance(events=[make_event_attendance(1, 1)])
+    release.set()
+    await asyncio.gather(stale_read, other_read)
+
+    assert cache.get(cache.make_key("attendance", 1, today)) is None
+    # the invalidation was for another user
+    assert cache.get(cache.make_key("attendance", 2, today)) is not None
+    assert cache.stats()["stale_puts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_update_event_invalidates_lists_across_controllers():
+    cache = UpcomingEventsCache(ttl=60)
+    old_event = make_event(1, start=datetime(2025, 10, 11, 13, 30))
+
+    manage_backend = AsyncMock(spec=ManageEventControlling)
+    manage_backend.retrieve_events.return_value = [old_event]
+    team_backend = AsyncMock(spec=TeamAttendanceControlling)
+    team_backend.retrieve_upcoming_events.side_effect = lambda user_id, from_date: (
+        [old_event] if from_date <= old_event.start.date() else []
+    )
+
+    manage_controller = CachedManageEventController(manage_backend, cache=cache)
+    team_controller = CachedTeamAttendanceController(team_backend, cache=cache)
+
+    await manage_controller.retrieve_events(from_date=datetime(2025, 10, 1, 9, 0))
+    await manage_controller.retrieve_events(from_date=datetime(2025, 10, 1, 17, 0))
+    await team_controller.retrieve_upcoming_events(user_id=1, from_date=date(2025, 10, 1))
+    # a list starting after the event cannot contain it
+    await team_controller.retrieve_upcoming_events(user_id=1, from_date=date(2025, 12, 1))
+
+    assert manage_backend.retrieve_events.await_count == 1
+    assert cache.stats()["size"] == 3
+
+    await manage_controller.update_event(old_event)
+
+    assert cache.stats()["size"] == 1
+    assert cache.get(cache.make_key("team_attendance", 1, date(2025, 12, 1))) is not None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    cache = UpcomingEventsCache(ttl=60, max_entries=2)
+    backend = AsyncMock(spec=TeamAttendanceControlling)
+    backend.retrieve_upcoming_events.return_value = [make_event(1)]
+    controller = CachedTeamAttendanceController(backend, cache=cache)
+    today = date.today()
+
+    await controller.retrieve_upcoming_events(user_id=1, from_date=today)
+    await controller.retrieve_upcoming_events(user_id=2, from_date=today)
+    await controller.retrieve_upcoming_events(user_id=1, from_date=today)
+    await controller.retrieve_upcoming_events(user_id=3, from_date=today)
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.get(cache.make_key("team_attendance", 2, today)) is None
+    assert cache.get(cache.make_key("team_attendance", 1, today)) is not None
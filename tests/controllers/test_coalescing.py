@@ -0,0 +1,157 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from controllers.attendance_controller import AttendanceControlling
+from controllers.coalescing import (
+    CoalescingTeamAttendanceController,
+    RosterInvalidatingAttendanceController,
+    SingleFlight,
+)
+from controllers.team_attendance_controller import FakeTeamAttendanceController
+
+
+class CountingTeamAttendanceController(FakeTeamAttendanceController):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def retrieve_team_attendance(self, event_id: int):
+        self.calls += 1
+        await self.release.wait()
+        return await super().retrieve_team_attendance(event_id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_backend_call():
+    backend = CountingTeamAttendanceController()
+    controller = CoalescingTeamAttendanceController(backend, freshness=0)
+
+    tasks = [asyncio.ensure_future(controller.retrieve_team_attendance(event_id=1)) for _ in range(20)]
+    await asyncio.sleep(0)
+    backend.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert backend.calls == 1
+    assert all(result is results[0] for result in results)
+    assert controller.single_flight.stats()["coalesced"] == 19
+
+
+@pytest.mark.asyncio
+async def test_different_events_are_not_coalesced():
+    backend = CountingTeamAttendanceController()
+    backend.release.set()
+    controller = CoalescingTeamAttendanceController(backend, freshness=0)
+
+    await asyncio.gather(
+        controller.retrieve_team_attendance(event_id=1),
+        controller.retrieve_team_attendance(event_id=2),
+    )
+
+    assert backend.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_result_is_reused_within_freshness_window():
+    now = [0.0]
+    single_flight = SingleFlight(freshness=2.0, clock=lambda: now[0])
+    calls = []
+
+    async def fetch():
+        calls.append(now[0])
+        return len(calls)
+
+    assert await single_flight.do(1, fetch) == 1
+    now[0] = 1.5
+    assert await single_flight.do(1, fetch) == 1
+    now[0] = 2.5
+    assert await single_flight.do(1, fetch) == 2
+    assert single_flight.stats()["fresh_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_but_not_kept():
+    single_flight = SingleFlight(freshness=10.0)
+    attempts = 0
+
+    async def failing():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("backend down")
+
+    results = await asyncio.gather(
+        single_flight.do(1, failing),
+        single_flight.do(1, failing),
+        return_exceptions=True,
+    )
+    assert attempts == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    with pytest.raises(RuntimeError):
+        await single_flight.do(1, failing)
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    backend = CountingTeamAttendanceController()
+    controller = CoalescingTeamAttendanceController(backend, freshness=0)
+
+    first = asyncio.ensure_future(controller.retrieve_team_attendance(event_id=1))
+    second = asyncio.ensure_future(controller.retrieve_team_attendance(event_id=1))
+    await asyncio.sleep(0)
+    first.cancel()
+    backend.release.set()
+
+    result = await second
+    assert result.male
+    assert backend.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_forget_starts_a_new_call_without_failing_current_waiters():
+    single_flight = SingleFlight(freshness=10.0)
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        call = calls
+        if call == 1:
+            await release.wait()
+        return call
+
+    before = asyncio.ensure_future(single_flight.do(1, fetch))
+    await asyncio.sleep(0)
+    single_flight.forget(1)
+    after = await single_flight.do(1, fetch)
+    release.set()
+
+    assert await before == 1
+    assert after == 2
+    # the forgotten call does not overwrite the newer result
+    assert await single_flight.do(1, fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_attendance_writes_forget_the_rosters_they_change():
+    backend = CountingTeamAttendanceController()
+    backend.release.set()
+    single_flight = SingleFlight(freshness=10.0)
+    team_attendance = CoalescingTeamAttendanceController(backend, single_flight=single_flight)
+    attendance = RosterInvalidatingAttendanceController(AsyncMock(spec=AttendanceControlling), single_flight)
+
+    await team_attendance.retrieve_team_attendance(event_id=3)
+    await team_attendance.retrieve_team_attendance(event_id=3)
+    assert backend.calls == 1
+
+    await attendance.update_attendance(events=[SimpleNamespace(event=SimpleNamespace(id=3))])
+    await team_attendance.retrieve_team_attendance(event_id=3)
+
+    assert backend.calls == 2
+    attendance.controller.update_attendance.assert_awaited_once()
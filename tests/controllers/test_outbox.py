@@ -0,0 +1,304 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from controllers.attendance_controller import AttendanceControlling
+from controllers.outbox import OutboxAttendanceController
+from models.enums import AccessCategory
+from models.models import Attendance, Event
+from models.responses import EventAttendance
+from services.outbox import AppendOnlyOutbox
+
+# kept aside so polling is unaffected when a test patches asyncio.sleep
+real_sleep = asyncio.sleep
+
+
+def make_event_attendance(user_id: int, event_id: int = 1, status: bool = True) -> EventAttendance:
+    start = datetime(2025, 10, 11, 13, 30)
+    return EventAttendance(
+        event=Event(
+            id=event_id,
+            title="Field Training",
+            start=start,
+            end=start + timedelta(hours=2),
+            is_accountable=True,
+            access_category=AccessCategory.MEMBER,
+        ),
+        attendance=Attendance(event_id=event_id, user_id=user_id, status=status),
+    )
+
+
+async def wait_until_drained(controller: OutboxAttendanceController, timeout: float = 1.0):
+    async def drained():
+        while len(controller.outbox):
+            await real_sleep(0.01)
+    await asyncio.wait_for(drained(), timeout)
+
+
+def test_outbox_recovers_pending_entries_after_reopen(tmp_path):
+    path = tmp_path / "attendance.outbox"
+    outbox = AppendOnlyOutbox(path)
+    first = outbox.append({"n": 1})
+    outbox.append({"n": 2})
+    outbox.append({"n": 3})
+    outbox.ack([first.seq])
+    outbox.close()
+
+    # simulate a crash halfway through writing a record
+    with path.open("a", encoding="utf-8") as file:
+        file.write('{"op": "put", "se')
+
+    reopened = AppendOnlyOutbox(path)
+    assert [entry.payload["n"] for entry in reopened.pending()] == [2, 3]
+
+    # the torn line is rewritten away, so new appends stay readable
+    reopened.append({"n": 4})
+    reopened.close()
+    assert [entry.payload["n"] for entry in AppendOnlyOutbox(path).pending()] == [2, 3, 4]
+
+
+def test_outbox_compacts_acknowledged_entries(tmp_path):
+    path = tmp_path / "attendance.outbox"
+    outbox = AppendOnlyOutbox(path, compact_after=2)
+    entries = [outbox.append({"n": n}) for n in range(3)]
+
+    outbox.ack([entries[0].seq, entries[1].seq])
+    outbox.close()
+
+    assert len(path.read_text().splitlines()) == 1
+    assert [entry.payload["n"] for entry in AppendOnlyOutbox(path).pending()] == [2]
+
+
+@pytest.mark.asyncio
+async def test_update_returns_before_delivery_and_replays_in_order(tmp_path):
+    delivered = []
+    release = asyncio.Event()
+
+    async def slow_update(events):
+        await release.wait()
+        delivered.extend(item.attendance.user_id for item in events)
+
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.update_attendance.side_effect = slow_update
+    controller = OutboxAttendanceController(backend, AppendOnlyOutbox(tmp_path / "attendance.outbox"))
+
+    for user_id in range(3):
+        await controller.update_attendance(events=[make_event_attendance(user_id)])
+    assert delivered == []
+    assert controller.stats()["pending"] == 3
+
+    release.set()
+    await wait_until_drained(controller)
+    await controller.aclose()
+
+    assert delivered == [0, 1, 2]
+    assert controller.stats()["delivered"] == 3
+
+
+@pytest.mark.asyncio
+async def test_latest_update_per_user_and_event_wins(tmp_path):
+    backend = AsyncMock(spec=AttendanceControlling)
+    outbox = AppendOnlyOutbox(tmp_path / "attendance.outbox")
+    for status in (True, False, True, False):
+        outbox.append(make_event_attendance(user_id=1, status=status).model_dump(mode="json"))
+
+    controller = OutboxAttendanceController(backend, outbox)
+    await controller.start()
+    await wait_until_drained(controller)
+    await controller.aclose()
+
+    backend.update_attendance.assert_awaited_once()
+    sent = backend.update_attendance.await_args.kwargs["events"]
+    assert len(sent) == 1
+    assert sent[0].attendance.status is False
+
+
+@pytest.mark.asyncio
+async def test_entries_survive_restart_and_are_replayed(tmp_path):
+    path = tmp_path / "attendance.outbox"
+    failing = AsyncMock(spec=AttendanceControlling)
+    failing.update_attendance.side_effect = ConnectionError("backend down")
+    controller = OutboxAttendanceController(failing, AppendOnlyOutbox(path), retry_base_delay=10)
+
+    await controller.update_attendance(events=[make_event_attendance(1), make_event_attendance(2)])
+    await controller.aclose()
+
+    backend = AsyncMock(spec=AttendanceControlling)
+    restarted = OutboxAttendanceController(backend, AppendOnlyOutbox(path))
+    await restarted.start()
+    await wait_until_drained(restarted)
+    await restarted.aclose()
+
+    sent = backend.update_attendance.await_args.kwargs["events"]
+    assert [item.attendance.user_id for item in sent] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_retries_with_capped_backoff_until_delivered(tmp_path, monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr("controllers.outbox.asyncio.sleep", fake_sleep)
+    backend = AsyncMock(spec=AttendanceControlling)
+    # an outage far longer than a handful of attempts
+    backend.update_attendance.side_effect = [ConnectionError("backend down")] * 20 + [None]
+    controller = OutboxAttendanceController(
+        backend,
+        AppendOnlyOutbox(tmp_path / "attendance.outbox"),
+        retry_base_delay=1,
+        retry_max_delay=5,
+    )
+
+    await controller.update_attendance(events=[make_event_attendance(1)])
+    await wait_until_drained(controller)
+    await controller.aclose()
+
+    assert backend.update_attendance.await_count == 21
+    assert delays == [1, 2, 4] + [5] * 17
+    assert controller.stats() == {"pending": 0, "delivered": 1, "dead_lettered": 0}
+
+
+@pytest.mark.asyncio
+async def test_rejected_items_are_moved_to_the_dead_letter_log(tmp_path):
+    path = tmp_path / "attendance.outbox"
+    rejection = httpx.HTTPStatusError(
+        "unknown event", request=httpx.Request("POST", "http://backend/attendance"), response=httpx.Response(422)
+    )
+    delivered = []
+
+    async def update(events):
+        if any(item.event.id == 2 for item in events):
+            raise rejection
+        delivered.extend(item.event.id for item in events)
+
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.update_attendance.side_effect = update
+    controller = OutboxAttendanceController(backend, AppendOnlyOutbox(path))
+
+    await controller.update_attendance(events=[make_event_attendance(1, event_id=event_id) for event_id in (1, 2, 3)])
+    await wait_until_drained(controller)
+    await controller.aclose()
+
+    assert delivered == [1, 3]
+    assert controller.stats() == {"pending": 0, "delivered": 2, "dead_lettered": 1}
+    dead = AppendOnlyOutbox(path).dead_letters()
+    assert [record["payload"]["event"]["id"] for record in dead] == [2]
+    assert "unknown event" in dead[0]["reason"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [408, 429, 503])
+async def test_timeouts_rate_limits_and_server_errors_are_retried(tmp_path, monkeypatch, status):
+    monkeypatch.setattr("controllers.outbox.asyncio.sleep", lambda delay: real_sleep(0))
+    failure = httpx.HTTPStatusError(
+        "retry later", request=httpx.Request("POST", "http://backend/attendance"), response=httpx.Response(status)
+    )
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.update_attendance.side_effect = [failure, failure, None]
+    controller = OutboxAttendanceController(backend, AppendOnlyOutbox(tmp_path / "attendance.outbox"))
+
+    await controller.update_attendance(events=[make_event_attendance(1)])
+    await wait_until_drained(controller)
+    await controller.aclose()
+
+    assert backend.update_attendance.await_count == 3
+    assert controller.stats()["dead_lettered"] == 0
+
+
+@pytest.mark.asyncio
+async def test_item_failing_with_server_errors_is_dead_lettered_after_max_attempts(tmp_path, monkeypatch):
+    monkeypatch.setattr("controllers.outbox.asyncio.sleep", lambda delay: real_sleep(0))
+    path = tmp_path / "attendance.outbox"
+    server_error = httpx.HTTPStatusError(
+        "boom", request=httpx.Request("POST", "http://backend/attendance"), response=httpx.Response(500)
+    )
+    attempts = []
+    delivered = []
+
+    async def update(events):
+        attempts.append([item.event.id for item in events])
+        if any(item.event.id == 1 for item in events):
+            raise server_error
+        delivered.extend(item.event.id for item in events)
+
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.update_attendance.side_effect = update
+    controller = OutboxAttendanceController(backend, AppendOnlyOutbox(path), max_batch_size=1, max_attempts=3)
+
+    await controller.update_attendance(events=[make_event_attendance(1, event_id=event_id) for event_id in (1, 2)])
+    await wait_until_drained(controller)
+    await controller.aclose()
+
+    # the failing item gets its attempts, then later entries keep flowing
+    assert attempts == [[1], [1], [1], [2]]
+    assert delivered == [2]
+    assert controller.stats() == {"pending": 0, "delivered": 1, "dead_lettered": 1}
+    assert [record["payload"]["event"]["id"] for record in AppendOnlyOutbox(path).dead_letters()] == [1]
+
+
+@pytest.mark.asyncio
+async def test_entries_that_no_longer_validate_are_dead_lettered(tmp_path):
+    path = tmp_path / "attendance.outbox"
+    outbox = AppendOnlyOutbox(path)
+    outbox.append({"event": {"id": 1}, "attendance": {}})
+    outbox.append(make_event_attendance(user_id=2).model_dump(mode="json"))
+    backend = AsyncMock(spec=AttendanceControlling)
+
+    controller = OutboxAttendanceController(backend, outbox)
+    await controller.start()
+    await wait_until_drained(controller)
+    await controller.aclose()
+
+    sent = backend.update_attendance.await_args.kwargs["events"]
+    assert [item.attendance.user_id for item in sent] == [2]
+    assert [record["payload"] for record in AppendOnlyOutbox(path).dead_letters()] == [
+        {"event": {"id": 1}, "attendance": {}}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replay_survives_outbox_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr("controllers.outbox.asyncio.sleep", lambda delay: real_sleep(0))
+    outbox = AppendOnlyOutbox(tmp_path / "attendance.outbox")
+    ack = outbox.ack
+    failures = [OSError("disk full")]
+
+    def flaky_ack(seqs):
+        if failures:
+            raise failures.pop()
+        ack(seqs)
+
+    monkeypatch.setattr(outbox, "ack", flaky_ack)
+    backend = AsyncMock(spec=AttendanceControlling)
+    controller = OutboxAttendanceController(backend, outbox)
+
+    await controller.update_attendance(events=[make_event_attendance(1)])
+    await wait_until_drained(controller)
+
+    assert not controller._replayer.done()
+    await controller.aclose()
+    # delivered again after the failed ack, harmless as updates are absolute
+    assert backend.update_attendance.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_overlay_pending_writes(tmp_path):
+    stale = make_event_attendance(user_id=1, status=True)
+    backend = AsyncMock(spec=AttendanceControlling)
+    backend.retrieve_upcoming_events.return_value = [stale]
+    outbox = AppendOnlyOutbox(tmp_path / "attendance.outbox")
+    outbox.append(make_event_attendance(user_id=1, status=False).model_dump(mode="json"))
+    outbox.append(make_event_attendance(user_id=2, status=True).model_dump(mode="json"))
+
+    # not started, so the writes stay pending
+    controller = OutboxAttendanceController(backend, outbox)
+    events = await controller.retrieve_upcoming_events(user_id=1, from_date=date(2025, 10, 1))
+    await controller.aclose()
+
+    assert events[0].attendance.status is False
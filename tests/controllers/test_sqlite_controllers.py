@@ -0,0 +1,164 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from telegram import User as TelegramUser
+
+from controllers.attendance_controller import SqliteAttendanceController
+from controllers.manage_access_controller import SqliteManageAccessController
+from controllers.manage_event_controller import SqliteManageEventController
+from controllers.registration_controller import SqliteRegistrationController
+from controllers.team_attendance_controller import SqliteTeamAttendanceController
+from models.enums import AccessCategory, Gender, UserRecordStatus
+from models.models import Attendance, Event, User
+from models.responses import EventAttendance
+from services.sqlite_database import SqliteDatabase
+
+
+@pytest.fixture
+def database(tmp_path) -> SqliteDatabase:
+    return SqliteDatabase(tmp_path / "attendance.db")
+
+
+def make_event(title: str, start: datetime, access: AccessCategory = AccessCategory.GUEST) -> Event:
+    return Event(
+        id=-1,
+        title=title,
+        start=start,
+        end=start + timedelta(hours=2),
+        is_accountable=True,
+        access_category=access,
+    )
+
+
+async def seed_users(database: SqliteDatabase):
+    registration = SqliteRegistrationController(database)
+    users = [
+        User(id=1, name="Alice", telegram_user="alice", gender=Gender.FEMALE, access_category=AccessCategory.MEMBER),
+        User(id=2, name="Bob", telegram_user="bob", gender=Gender.MALE, access_category=AccessCategory.MEMBER),
+        User(id=3, name="Carl", telegram_user="carl", gender=Gender.MALE, access_category=AccessCategory.MEMBER),
+        User(id=4, name="Gina", telegram_user="gina", gender=Gender.FEMALE, access_category=AccessCategory.GUEST),
+        User(id=5, name="Pete", telegram_user=None, gender=Gender.MALE, access_category=AccessCategory.PUBLIC),
+    ]
+    for user in users:
+        await registration.submit_user_registration(user)
+
+
+@pytest.mark.asyncio
+async def test_database_uses_wal_and_indexes(database):
+    journal_mode = await database.fetchone("PRAGMA journal_mode")
+    indexes = {row["name"] for row in await database.fetchall("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    await database.aclose()
+
+    assert journal_mode[0] == "wal"
+    assert {"idx_events_start", "idx_users_access_category"} <= indexes
+
+
+@pytest.mark.asyncio
+async def test_manage_event_create_update_and_retrieve(database):
+    controller = SqliteManageEventController(database)
+
+    event = await controller.create_new_event(start_datetime=datetime(2025, 10, 11, 13, 30))
+    await controller.update_event(event)
+    assert event.id > 0
+
+    event.title = "Scrim"
+    await controller.update_event(event)
+    past = make_event("Old", datetime(2024, 1, 1, 9, 0))
+    await controller.update_event(past)
+
+    events = await controller.retrieve_events(from_date=datetime(2025, 1, 1))
+    await database.aclose()
+
+    assert [e.title for e in events] == ["Scrim"]
+    assert events[0].start == datetime(2025, 10, 11, 13, 30)
+
+
+@pytest.mark.asyncio
+async def test_attendance_respects_access_and_upserts(database):
+    await seed_users(database)
+    events = SqliteManageEventController(database)
+    guest_event = make_event("Training", datetime(2025, 10, 11, 13, 30), AccessCategory.GUEST)
+    member_event = make_event("Meeting", datetime(2025, 10, 12, 20, 0), AccessCategory.MEMBER)
+    await events.update_event(guest_event)
+    await events.update_event(member_event)
+
+    controller = SqliteAttendanceController(database)
+
+    guest_view = await controller.retrieve_upcoming_events(user_id=4, from_date=date(2025, 10, 1))
+    assert [item.event.title for item in guest_view] == ["Training"]
+    assert guest_view[0].attendance.status is None
+
+    member_view = await controller.retrieve_upcoming_events(user_id=1, from_date=date(2025, 10, 1))
+    assert [item.event.title for item in member_view] == ["Training", "Meeting"]
+
+    selected = member_view[0]
+    selected.attendance.status = False
+    selected.attendance.reason = "sick"
+    await controller.update_attendance(events=[selected])
+    selected.attendance.status = True
+    selected.attendance.reason = "late"
+    await controller.update_attendance(events=[selected])
+
+    refreshed = await controller.retrieve_upcoming_events(user_id=1, from_date=date(2025, 10, 1))
+    await database.aclose()
+
+    assert refreshed[0].attendance.status is True
+    assert refreshed[0].attendance.reason == "late"
+
+
+@pytest.mark.asyncio
+async def test_team_attendance_groups_roster(database):
+    await seed_users(database)
+    event = make_event("Training", datetime(2025, 10, 11, 13, 30))
+    await SqliteManageEventController(database).update_event(event)
+
+    attendance = SqliteAttendanceController(database)
+    await attendance.update_attendance(events=[
+        EventAttendance(event=event, attendance=Attendance(event_id=event.id, user_id=1, status=True)),
+        EventAttendance(event=event, attendance=Attendance(event_id=event.id, user_id=2, status=True, reason="late")),
+        EventAttendance(event=event, attendance=Attendance(event_id=event.id, user_id=4, status=False, reason="away")),
+    ])
+
+    response = await SqliteTeamAttendanceController(database).retrieve_team_attendance(event_id=event.id)
+    await database.aclose()
+
+    assert [u.name for u in response.male] == ["Bob"]
+    assert response.male[0].attendance.reason == "late"
+    assert [u.name for u in response.female] == ["Alice"]
+    assert [u.name for u in response.absent] == ["Gina"]
+    # members who have not responded are unindicated; public users are not on the roster
+    assert [u.name for u in response.unindicated] == ["Carl"]
+
+
+@pytest.mark.asyncio
+async def test_manage_access_lists_and_updates_users(database):
+    await seed_users(database)
+    controller = SqliteManageAccessController(database)
+
+    members = await controller.retrieve_users(AccessCategory.MEMBER)
+    assert [u.name for u in members] == ["Alice", "Bob", "Carl"]
+
+    await controller.set_access(members[0], AccessCategory.ADMIN)
+    admins = await controller.retrieve_users(AccessCategory.ADMIN)
+    await database.aclose()
+
+    assert [u.name for u in admins] == ["Alice"]
+
+
+@pytest.mark.asyncio
+async def test_registration_record_status(database):
+    await seed_users(database)
+    controller = SqliteRegistrationController(database)
+
+    def telegram_user(user_id: int, username: str | None) -> MagicMock:
+        return MagicMock(spec=TelegramUser, id=user_id, username=username)
+
+    assert await controller.check_user_record(telegram_user(99, "new")) == UserRecordStatus.NEW
+    assert await controller.check_user_record(telegram_user(5, "pete")) == UserRecordStatus.NEW
+    assert await controller.check_user_record(telegram_user(1, "alice")) == UserRecordStatus.EXISTS
+    assert await controller.check_user_record(telegram_user(1, "alice_new")) == UserRecordStatus.UPDATED
+    assert await controller.check_user_record(telegram_user(1, "alice_new")) == UserRecordStatus.EXISTS
+    assert await controller.check_name_conflict("Bob")
+    assert not await controller.check_name_conflict("Zed")
+    await database.aclose()
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+from controllers.manage_access_controller import SyncManageAccessControlling, ThreadPoolManageAccessController
+from controllers.manage_event_controller import SyncManageEventControlling, ThreadPoolManageEventController
+from models.enums import AccessCategory
+from models.models import Event, User
+
+
+class SlowEventController(SyncManageEventControlling):
+    def __init__(self):
+        self.updated: List[Event] = []
+        self.threads = set()
+
+    def retrieve_events(self, from_date: datetime) -> List[Event]:
+        self.threads.add(threading.get_ident())
+        time.sleep(0.2)
+        return []
+
+    def create_new_event(self, start_datetime: datetime) -> Event:
+        return Event(
+            id=-1,
+            title="New",
+            start=start_datetime,
+            end=start_datetime + timedelta(hours=1),
+            is_accountable=False,
+            access_category=AccessCategory.GUEST,
+        )
+
+    def update_event(self, event: Event) -> None:
+        self.updated.append(event)
+
+
+class InMemoryAccessController(SyncManageAccessControlling):
+    def __init__(self):
+        self.users = [User(id=1, name="Alice", access_category=AccessCategory.MEMBER)]
+
+    def retrieve_access_categories(self) -> List[AccessCategory]:
+        return list(AccessCategory)
+
+    def retrieve_users(self, category: AccessCategory) -> List[User]:
+        return [user for user in self.users if user.access_category == category]
+
+    def set_access(self, user: User, access: AccessCategory) -> None:
+        user.access_category = access
+
+
+@pytest.mark.asyncio
+async def test_blocking_event_controller_does_not_block_loop():
+    sync_controller = SlowEventController()
+    controller = ThreadPoolManageEventController(sync_controller)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    events, _ = await asyncio.gather(controller.retrieve_events(from_date=datetime.now()), ticker())
+
+    assert events == []
+    assert ticks == 10
+    assert threading.get_ident() not in sync_controller.threads
+
+
+@pytest.mark.asyncio
+async def test_event_adapter_forwards_arguments():
+    sync_controller = SlowEventController()
+    controller = ThreadPoolManageEventController(sync_controller)
+    start = datetime(2025, 10, 11, 13, 30)
+
+    event = await controller.create_new_event(start_datetime=start)
+    await controller.update_event(event)
+
+    assert event.start == start
+    assert sync_controller.updated == [event]
+
+
+@pytest.mark.asyncio
+async def test_access_adapter_forwards_arguments():
+    sync_controller = InMemoryAccessController()
+    controller = ThreadPoolManageAccessController(sync_controller)
+
+    assert await controller.retrieve_access_categories() == list(AccessCategory)
+    users = await controller.retrieve_users(AccessCategory.MEMBER)
+    await controller.set_access(users[0], AccessCategory.ADMIN)
+
+    assert sync_controller.users[0].access_category == AccessCategory.ADMIN
@@ -1,8 +1,18 @@
 from datetime import date
 
+import pytest
+from telegram import InlineKeyboardButton
+
 from custom_components.CalendarKeyboardMarkup import CalendarKeyboardMarkup
 
 
+@pytest.fixture(autouse=True)
+def empty_cache():
+    CalendarKeyboardMarkup.clear_cache()
+    yield
+    CalendarKeyboardMarkup.clear_cache()
+
+
 def test_calendar_build_includes_navigation_and_days():
     markup = CalendarKeyboardMarkup.build(year=2024, month=2)
 
@@ -19,8 +29,8 @@ def test_calendar_build_includes_navigation_and_days():
     assert day_buttons[0].text == "1"
 
     prev_button, _, next_button = keyboard[-1]
-    assert prev_button.callback_data == "step:2024-01"
-    assert next_button.callback_data == "step:2024-03"
+    assert prev_button.callback_data == "cal:step:2024-01"
+    assert next_button.callback_data == "cal:step:2024-03"
 
 
 def test_calendar_callbacks_decode():
@@ -53,3 +63,46 @@ def test_calendar_respects_date_range_and_disables_navigation():
     assert prev_btn.callback_data == "noop"
     assert next_btn.text.strip() == ""
     assert next_btn.callback_data == "noop"
+
+
+def test_month_markup_is_memoized_and_immutable():
+    start = date(2024, 5, 10)
+    markup = CalendarKeyboardMarkup.build(year=2024, month=6, start_date=start)
+
+    assert CalendarKeyboardMarkup.build(year=2024, month=6, start_date=start) is markup
+    assert CalendarKeyboardMarkup.build(year=2024, month=6) is not markup
+    with pytest.raises(AttributeError):
+        markup.inline_keyboard = ()
+    assert CalendarKeyboardMarkup.cache_stats()["hits"] == 1
+
+
+def test_extra_rows_are_part_of_the_cached_markup():
+    extra = [[InlineKeyboardButton("Use start date", callback_data="use_start_date")]]
+    markup = CalendarKeyboardMarkup.build(year=2024, month=6, extra_rows=extra)
+
+    assert markup.inline_keyboard[-1][0].callback_data == "use_start_date"
+    assert CalendarKeyboardMarkup.build(year=2024, month=6, extra_rows=extra) is markup
+    assert CalendarKeyboardMarkup.build(year=2024, month=6) is not markup
+
+
+def test_prefetched_neighbours_are_cache_hits():
+    start = date(2024, 5, 10)
+    CalendarKeyboardMarkup.build(year=2024, month=5, start_date=start)
+    CalendarKeyboardMarkup.prefetch(2024, 5, start_date=start)
+
+    # April is before the range and is not rendered
+    assert CalendarKeyboardMarkup.cache_stats()["prefetched"] == 1
+    next_step = CalendarKeyboardMarkup.build(year=2024, month=5, start_date=start).inline_keyboard[-1][-1]
+    year, month = CalendarKeyboardMarkup.parse_step(next_step.callback_data)
+    CalendarKeyboardMarkup.build(year=year, month=month, start_date=start)
+
+    stats = CalendarKeyboardMarkup.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_least_recently_used_months_are_evicted(monkeypatch):
+    monkeypatch.setattr(CalendarKeyboardMarkup, "cache_size", 3)
+    for month in range(1, 6):
+        CalendarKeyboardMarkup.build(year=2024, month=month)
+
+    assert CalendarKeyboardMarkup.cache_stats()["entries"] == 3
@@ -0,0 +1,80 @@
+import re
+
+from custom_components.PaginatedText import Page, PaginatedText, text_length
+
+
+def sections_of(*sizes, width=10):
+    return [[f"{index:0{width}d}" for index in range(size)] for size in sizes]
+
+
+def test_short_text_is_a_single_page_without_navigation():
+    [page] = list(PaginatedText.pages([["Title"], ["a", "b"]]))
+
+    assert page == Page(0, "Title\n\na\nb", False)
+    assert PaginatedText.build("kaypoh", 1, page) is None
+
+
+def test_pages_stay_within_the_limit_and_keep_every_line():
+    sections = sections_of(3, 40, 25, 1)
+
+    pages = list(PaginatedText.pages(sections, limit=100))
+
+    assert all(text_length(page.text) <= 100 for page in pages)
+    assert [page.has_next for page in pages] == [True] * (len(pages) - 1) + [False]
+    lines = [line for page in pages for line in page.text.split("\n") if line]
+    assert lines == [line for section in sections for line in section]
+
+
+def test_section_that_fits_moves_to_the_next_page_instead_of_splitting():
+    # 6 lines of 10 characters fill 65 of 100, the next section of 4 lines would not fit
+    pages = list(PaginatedText.pages(sections_of(6, 4), limit=100))
+
+    assert pages[0].text.split("\n") == sections_of(6)[0]
+    assert pages[1].text.split("\n") == sections_of(4)[0]
+
+
+def test_emoji_count_twice_towards_the_limit():
+    assert text_length("👦🏻") == 4
+    pages = list(PaginatedText.pages([["👦🏻" * 20]] * 3, limit=100))
+
+    assert all(text_length(page.text) <= 100 for page in pages)
+    assert len(pages) == 3
+
+
+def test_overlong_line_is_split():
+    pages = list(PaginatedText.pages([["x" * 250]], limit=100))
+
+    assert "".join(page.text for page in pages) == "x" * 250
+    assert all(text_length(page.text) <= 100 for page in pages)
+
+
+def test_requested_page_does_not_consume_later_sections():
+    consumed = []
+
+    def sections():
+        for index in range(100):
+            consumed.append(index)
+            yield [f"section {index}"]
+
+    page = PaginatedText.page(sections(), 1, limit=50)
+
+    assert page.number == 1 and page.has_next
+    assert len(consumed) < 10
+
+
+def test_page_past_the_end_returns_the_last_page():
+    page = PaginatedText.page(sections_of(30), 99, limit=100)
+
+    assert not page.has_next
+    assert page.number == len(list(PaginatedText.pages(sections_of(30), limit=100))) - 1
+
+
+def test_navigation_callback_round_trip():
+    page = Page(1, "text", True)
+    markup = PaginatedText.build("kaypoh", -12, page)
+    previous, label, following = markup.inline_keyboard[0]
+
+    assert label.text == "2"
+    assert PaginatedText.parse_page(previous.callback_data) == ("kaypoh", "-12", 0)
+    assert PaginatedText.parse_page(following.callback_data) == ("kaypoh", "-12", 2)
+    assert re.match(PaginatedText.pattern("kaypoh"), following.callback_data)
@@ -0,0 +1,216 @@
+import json
+import os
+import pickle
+
+import pytest
+
+from localization.catalog import build_catalog
+from localization.locale_store import (
+    CurrentLocaleKeyAccessor,
+    LocaleKeyAccessor,
+    LocaleStore,
+    compile_template,
+    use_locale,
+)
+from localization.reloader import LocaleReloader
+
+
+@pytest.fixture
+def store(tmp_path) -> LocaleStore:
+    catalog = {
+        "greeting": "Hi {name}{reason}",
+        "braces": "{{literal}} {name} \"quoted\" \\ {name}",
+        "positional": "{0} and {1}",
+        "spec": "{rate:.1f} msg/s",
+        "plain": "No fields",
+        "multi": ["Line {n}", "Line two"],
+        "menu": {"title": "Menu for {name}"},
+    }
+    (tmp_path / "en.json").write_text(json.dumps(catalog), encoding="utf-8")
+    return LocaleStore(locale_directory=tmp_path)
+
+
+@pytest.mark.parametrize(
+    "source, args, kwargs",
+    [
+        ("Hi {name}{reason}", (), {"name": "Aaron", "reason": " (late)"}),
+        ("{{literal}} {name} \"quoted\" \\ {name}", (), {"name": 3}),
+        ("{0} and {1}", ("a", "b"), {}),
+        ("{rate:.1f} msg/s", (), {"rate": 2.345}),
+        ("{user.name}", (), {"user": type("U", (), {"name": "Ben"})()}),
+        ("{name}", (), {"name": "x", "unused": 1}),
+    ],
+)
+def test_compiled_template_matches_str_format(source, args, kwargs):
+    assert compile_template(source)(*args, **kwargs) == source.format(*args, **kwargs)
+
+
+def test_missing_field_raises_like_str_format():
+    with pytest.raises(KeyError, match="reason"):
+        compile_template("Hi {name}{reason}")(name="Aaron")
+
+
+def test_accessor_resolves_and_caches_keys(store):
+    key = LocaleKeyAccessor(store)
+
+    assert key.greeting.format(name="Aaron", reason="") == "Hi Aaron"
+    assert key.multi.is_multiline
+    assert key.multi.format(n=1) == "Line 1\nLine two"
+    assert key.menu.title.format(name="Ben") == "Menu for Ben"
+    assert key.plain.format() == "No fields"
+    assert "greeting" in vars(key)
+    assert key.greeting is key.greeting
+    assert key.for_locale("en") is key.for_locale("en")
+    with pytest.raises(AttributeError):
+        key.__deepcopy__
+
+
+def test_localized_text_survives_pickling(store):
+    text = pickle.loads(pickle.dumps(LocaleKeyAccessor(store).greeting))
+
+    assert text.key == "greeting"
+    assert text.format(name="Aaron", reason="!") == "Hi Aaron!"
+
+
+def test_up_to_date_catalog_is_loaded_instead_of_json(tmp_path, monkeypatch):
+    locale_file = tmp_path / "en.json"
+    locale_file.write_text(json.dumps({"greeting": "Hi {name}", "menu": {"title": ["A", "B"]}}), encoding="utf-8")
+    build_catalog(locale_file)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("JSON read although the catalog is up to date")
+
+    read_bytes = type(locale_file).read_bytes
+
+    def read_catalog_only(path):
+        if path.suffix == ".json":
+            fail()
+        return read_bytes(path)
+
+    monkeypatch.setattr(json, "loads", fail)
+    monkeypatch.setattr(type(locale_file), "read_bytes", read_catalog_only)
+    store = LocaleStore(locale_directory=tmp_path)
+
+    assert store.translate("greeting", name="Ben") == "Hi Ben"
+    assert store.is_multiline("menu.title")
+
+
+def test_stale_catalog_is_ignored(tmp_path):
+    locale_file = tmp_path / "en.json"
+    locale_file.write_text(json.dumps({"greeting": "Hi"}), encoding="utf-8")
+    build_catalog(locale_file)
+    locale_file.write_text(json.dumps({"greeting": "Hello"}), encoding="utf-8")
+
+    assert LocaleStore(locale_directory=tmp_path).translate("greeting") == "Hello"
+
+
+def test_catalog_is_ignored_once_its_json_is_touched(tmp_path):
+    locale_file = tmp_path / "en.json"
+    locale_file.write_text(json.dumps({"greeting": "Hi"}), encoding="utf-8")
+    build_catalog(locale_file)
+    # same size, e.g. a one-letter edit
+    locale_file.write_text(json.dumps({"greeting": "Ho"}), encoding="utf-8")
+    os.utime(locale_file, ns=(0, 1))
+
+    assert LocaleStore(locale_directory=tmp_path).translate("greeting") == "Ho"
+
+
+@pytest.mark.asyncio
+async def test_edited_locale_is_swapped_in_without_restart(store, tmp_path):
+    key = LocaleKeyAccessor(store)
+    assert key.plain == "No fields"
+
+    locale_file = tmp_path / "en.json"
+    catalog = json.loads(locale_file.read_text(encoding="utf-8"))
+    catalog["plain"] = "Still no fields"
+    locale_file.write_text(json.dumps(catalog), encoding="utf-8")
+    os.utime(locale_file, ns=(0, 1))
+
+    reloader = LocaleReloader(store)
+    await reloader.reload()
+
+    assert key.plain == "Still no fields"
+    assert reloader.reloads == 1
+
+    # nothing changed since
+    await reloader.reload()
+    assert reloader.reloads == 1
+
+
+def test_broken_edit_keeps_the_previous_catalog(store, tmp_path):
+    (tmp_path / "en.json").write_text("{\"plain\": ", encoding="utf-8")
+
+    assert store.reload() == []
+    assert store.translate("plain") == "No fields"
+
+
+@pytest.fixture
+def locales(tmp_path) -> LocaleStore:
+    locales = {
+        "en": {"greeting": "Hi", "farewell": "Bye", "menu": {"title": "Menu"}},
+        "pt": {"greeting": "Olá", "farewell": "Tchau"},
+        "pt_br": {"greeting": "Oi"},
+        "de": {"greeting": "Hallo"},
+        "fr": {"greeting": "Salut"},
+    }
+    for locale, catalog in locales.items():
+        (tmp_path / f"{locale}.json").write_text(json.dumps(catalog), encoding="utf-8")
+    return LocaleStore(locale_directory=tmp_path, max_locales=2)
+
+
+@pytest.mark.parametrize(
+    "language_code, locale",
+    [("pt-BR", "pt_br"), ("pt-PT", "pt"), ("PT", "pt"), ("de-AT", "de"), ("ja", "en"), (None, "en"), ("", "en")],
+)
+def test_language_codes_resolve_to_the_closest_locale(locales, language_code, locale):
+    assert locales.resolve_locale(language_code) == locale
+
+
+def test_missing_keys_come_from_the_merged_fallbacks(locales):
+    assert locales.fallback_chain("pt_br") == ["pt_br", "pt", "en"]
+    assert locales.translate("greeting", locale="pt_br") == "Oi"
+    assert locales.translate("farewell", locale="pt_br") == "Tchau"
+    assert locales.translate("menu.title", locale="pt_br") == "Menu"
+    assert locales.translate("greeting", locale="ja") == "Hi"
+
+    # one merged catalog per locale, a miss is a single dict lookup
+    catalog = locales._translations["pt_br"]
+    assert catalog["farewell"].locale == "pt"
+    assert catalog["menu.title"].locale == "en"
+
+
+def test_catalogs_load_lazily_into_a_bounded_lru(locales):
+    assert list(locales._translations) == ["en"]
+
+    for locale in ["de", "fr", "de", "pt"]:
+        locales.translate("greeting", locale=locale)
+
+    # the default locale is kept, fr was the least recently used
+    assert list(locales._translations) == ["en", "de", "pt"]
+    assert locales.stats()["evictions"] == 1
+    assert locales.translate("greeting", locale="fr") == "Salut"
+    assert list(locales._translations) == ["en", "pt", "fr"]
+
+
+def test_key_follows_the_locale_of_the_current_context(locales):
+    key = CurrentLocaleKeyAccessor(locales)
+
+    use_locale("de")
+    assert key.greeting == "Hallo"
+    assert key.menu.title == "Menu"
+    use_locale(None)
+    assert key.greeting == "Hi"
+    assert "greeting" not in vars(key)
+
+
+def test_evicted_locale_is_dropped_from_accessors(locales):
+    key = CurrentLocaleKeyAccessor(locales)
+    german = key.for_locale("de")
+    assert german.greeting == "Hallo"
+
+    locales.translate("greeting", locale="fr")
+    locales.translate("greeting", locale="pt")
+
+    assert "de" not in key._locales
+    assert "greeting" not in vars(german)
+    assert german.greeting == "Hallo"
@@ -0,0 +1,121 @@
+import dataclasses
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.enums import AccessCategory, Gender
+from models.models import Attendance, Event, User
+from models.records import (
+    EventAttendanceRecord,
+    EventRecord,
+    RosterRecord,
+    UserAttendanceRecord,
+    UserRecord,
+    to_record,
+)
+from models.responses.responses import AttendanceResponse, EventAttendance, UserAttendance, UserAttendanceResponse
+
+
+def make_event(**overrides) -> Event:
+    start = datetime(2025, 10, 11, 13, 30)
+    fields = dict(
+        id=7,
+        title="Field Training",
+        description="Bring both jerseys",
+        start=start,
+        end=start + timedelta(hours=2),
+        attendance_deadline=start - timedelta(days=1),
+        is_accountable=True,
+        access_category=AccessCategory.MEMBER,
+    )
+    fields.update(overrides)
+    return Event(**fields)
+
+
+def make_member(name: str, status, reason=None, access=AccessCategory.MEMBER) -> UserAttendance:
+    return UserAttendance(
+        name=name,
+        telegram_user=name.lower(),
+        gender="M",
+        access=access,
+        attendance=AttendanceResponse(status=status, reason=reason),
+    )
+
+
+@pytest.mark.parametrize("model", [
+    User(id=1, name="Aaron", telegram_user="@aaron", gender=Gender.MALE),
+    User(id=2, name="Bea"),
+    make_event(),
+    make_event(id=-1, description=None, attendance_deadline=None),
+    Attendance(event_id=7, user_id=1),
+    Attendance(event_id=7, user_id=1, status=False, reason="Work"),
+    EventAttendance(event=make_event(), attendance=Attendance(event_id=7, user_id=1, status=True)),
+    make_member("Aaron", True, "Late 2pm"),
+    UserAttendanceResponse(
+        male=[make_member("Aaron", True)],
+        female=[],
+        absent=[make_member("Ben", False, "Away")],
+        unindicated=[make_member("Carl", None, access=AccessCategory.GUEST)],
+    ),
+])
+def test_conversion_is_lossless(model):
+    record = to_record(model)
+    restored = record.to_model()
+
+    assert type(restored) is type(model)
+    assert restored == model
+    assert restored.model_dump() == model.model_dump()
+    assert to_record(restored) == record
+
+
+def test_records_are_slotted_and_immutable():
+    record = EventRecord.from_model(make_event())
+
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.title = "Scrim"
+
+
+def test_restored_event_keeps_reconciling_start_changes():
+    event = EventRecord.from_model(make_event()).to_model()
+
+    event.start = event.end + timedelta(hours=1)
+    assert event.end == event.start + timedelta(hours=2)
+
+    event.start = event.attendance_deadline
+    assert event.attendance_deadline is None
+
+
+def test_restored_models_are_independent_copies():
+    record = EventAttendanceRecord.from_model(
+        EventAttendance(event=make_event(), attendance=Attendance(event_id=7, user_id=1))
+    )
+
+    first, second = record.to_model(), record.to_model()
+    first.attendance.status = True
+    first.event.title = "Scrim"
+
+    assert second.attendance.status is None
+    assert second.event.title == "Field Training"
+    assert record.event.title == "Field Training"
+
+
+def test_records_keep_the_read_helpers_of_their_models():
+    member = UserAttendanceRecord.from_model(make_member("Aaron", True))
+    user = UserRecord.from_model(User(id=2, name="Bea"))
+    event = EventRecord.from_model(make_event())
+
+    assert member.telegram_handle == "@aaron"
+    assert user.telegram_handle == "(not yet set on telegram)"
+    assert event.is_attendance_locked(now=event.start)
+    assert not event.is_attendance_locked(now=event.attendance_deadline - timedelta(minutes=1))
+
+
+def test_roster_groups_are_tuples():
+    roster = RosterRecord.from_model(
+        UserAttendanceResponse(male=[make_member("Aaron", True)], female=[], absent=[], unindicated=[])
+    )
+
+    assert roster.male[0].attendance.status is True
+    assert roster.female == ()
+    assert hash(roster) == hash(RosterRecord.from_model(roster.to_model()))
@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram import Bot
+from telegram.error import Forbidden
+
+from controllers.manage_access_controller import ManageAccessControlling
+from models.enums import AccessCategory, Gender
+from models.models import Event, User
+from services.broadcast import BroadcastJob, BroadcastStore, Broadcaster
+
+ADMIN_CHAT_ID = 999
+
+
+def make_event(access: AccessCategory = AccessCategory.GUEST) -> Event:
+    start = datetime(2025, 10, 11, 13, 30)
+    return Event(
+        id=1,
+        title="Field Training",
+        start=start,
+        end=start + timedelta(hours=2),
+        is_accountable=True,
+        access_category=access,
+    )
+
+
+def make_users(ids) -> list[User]:
+    return [
+        User(id=user_id, name=f"User {user_id}", telegram_user=None, gender=Gender.MALE, access_category=AccessCategory.MEMBER)
+        for user_id in ids
+    ]
+
+
+@pytest.fixture
+def bot() -> MagicMock:
+    bot = MagicMock(spec=Bot)
+    bot.rate_limiter = None
+    bot.send_message = AsyncMock(return_value=SimpleNamespace(message_id=42))
+    bot.edit_message_text = AsyncMock()
+    return bot
+
+
+@pytest.fixture
+def recipients() -> AsyncMock:
+    roster = {
+        AccessCategory.GUEST: make_users([1, 2]),
+        AccessCategory.MEMBER: make_users([3, 4, 5]),
+        AccessCategory.ADMIN: make_users([ADMIN_CHAT_ID]),
+    }
+    controller = AsyncMock(spec=ManageAccessControlling)
+    controller.retrieve_users.side_effect = lambda category: roster.get(category, [])
+    return controller
+
+
+def sent_chat_ids(bot: MagicMock) -> list[int]:
+    return [
+        call.kwargs["chat_id"]
+        for call in bot.send_message.await_args_list
+        if call.kwargs["chat_id"] != ADMIN_CHAT_ID
+    ]
+
+
+@pytest.mark.asyncio
+async def test_announcement_reaches_roster_in_batches(bot, recipients, tmp_path):
+    store = BroadcastStore(tmp_path / "broadcasts.json")
+    broadcaster = Broadcaster(bot, recipients, store, batch_size=2, batch_interval=0)
+
+    job = await broadcaster.announce_event(make_event(AccessCategory.MEMBER), admin_chat_id=ADMIN_CHAT_ID)
+    await broadcaster.wait()
+
+    # guests cannot attend member events and the admin is not announced to
+    assert job.recipients == [3, 4, 5]
+    assert sorted(sent_chat_ids(bot)) == [3, 4, 5]
+    assert store.load() == []
+
+    # one progress message for the admin, edited after every batch
+    assert bot.edit_message_text.await_count == 2
+    final_text = bot.edit_message_text.await_args.kwargs["text"]
+    assert "3" in final_text and "Field Training" in final_text
+
+
+@pytest.mark.asyncio
+async def test_failed_recipients_are_counted_not_retried(bot, recipients, tmp_path):
+    async def send_message(chat_id, text, **kwargs):
+        if chat_id == 2:
+            raise Forbidden("bot was blocked by the user")
+        return SimpleNamespace(message_id=42)
+
+    bot.send_message.side_effect = send_message
+    broadcaster = Broadcaster(bot, recipients, BroadcastStore(tmp_path / "broadcasts.json"), batch_interval=0)
+
+    job = await broadcaster.announce_event(make_event(), admin_chat_id=ADMIN_CHAT_ID)
+    await broadcaster.wait()
+
+    assert job.sent == 4
+    assert job.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_interrupted_broadcast_resumes_from_cursor(bot, recipients, tmp_path):
+    path = tmp_path / "broadcasts.json"
+    release = asyncio.Event()
+
+    async def slow_send(chat_id, text, **kwargs):
+        if chat_id != ADMIN_CHAT_ID and chat_id > 2:
+            await release.wait()
+        return SimpleNamespace(message_id=42)
+
+    bot.send_message.side_effect = slow_send
+    broadcaster = Broadcaster(bot, recipients, BroadcastStore(path), batch_size=2, batch_interval=0)
+    await broadcaster.announce_event(make_event(), admin_chat_id=ADMIN_CHAT_ID)
+
+    async def first_batch_saved():
+        while not path.exists() or BroadcastStore(path).load()[0].cursor < 2:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(first_batch_saved(), 1)
+    await broadcaster.aclose()
+
+    [saved] = BroadcastStore(path).load()
+    assert saved.cursor == 2
+
+    resumed_bot = MagicMock(spec=Bot)
+    resumed_bot.rate_limiter = None
+    resumed_bot.send_message = AsyncMock(return_value=SimpleNamespace(message_id=43))
+    resumed_bot.edit_message_text = AsyncMock()
+    restarted = Broadcaster(resumed_bot, recipients, BroadcastStore(path), batch_size=2, batch_interval=0)
+    await restarted.resume()
+    await restarted.wait()
+
+    assert sorted(sent_chat_ids(resumed_bot)) == [3, 4, 5]
+    # the existing progress message keeps being edited
+    assert resumed_bot.edit_message_text.await_args.kwargs["message_id"] == 42
+    assert BroadcastStore(path).load() == []
+
+
+def test_store_round_trip(tmp_path):
+    store = BroadcastStore(tmp_path / "broadcasts.json")
+    job = BroadcastJob(title="Scrim", text="hi", recipients=[1, 2, 3], cursor=1, admin_chat_id=ADMIN_CHAT_ID)
+
+    store.save([job])
+
+    assert store.load() == [job]
@@ -0,0 +1,101 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram import CallbackQuery, Update
+
+from command_handlers.callback_router import CallbackRouter
+from services.callback_codec import CALLBACK_DATA_LIMIT, CallbackCodec, InvalidCallbackData
+
+
+class Clock:
+    def __init__(self, now: float = 1_760_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def codec(clock) -> CallbackCodec:
+    return CallbackCodec(b"secret", max_age=3600, clock=clock)
+
+
+def test_round_trips_fields_for_the_same_user(codec):
+    data = codec.encode("access", "confirm", 2, 123456789, 3, user_id=42)
+
+    assert data.startswith("access:confirm:")
+    assert codec.decode(data, user_id=42) == (2, 123456789, 3)
+
+
+def test_round_trips_negative_and_large_ids_within_the_limit(codec):
+    fields = (-1, -(2 ** 40), 2 ** 53, 0)
+    data = codec.encode("attend", "status", *fields, user_id=-1001234567890)
+
+    assert len(data.encode("utf-8")) <= CALLBACK_DATA_LIMIT
+    assert codec.decode(data, user_id=-1001234567890) == fields
+
+
+def test_routes_like_plain_callback_data(codec):
+    handler = AsyncMock()
+    router = CallbackRouter({"access:user": handler})
+    update = MagicMock(spec=Update)
+    update.callback_query = MagicMock(spec=CallbackQuery)
+    update.callback_query.data = codec.encode("access", "user", 1, 7, user_id=42)
+
+    assert router.check_update(update) is handler
+
+
+def test_rejects_data_issued_to_another_user(codec):
+    data = codec.encode("access", "confirm", 2, 7, 3, user_id=42)
+
+    with pytest.raises(InvalidCallbackData):
+        codec.decode(data, user_id=43)
+
+
+def test_rejects_a_token_moved_to_another_verb(codec):
+    token = CallbackRouter.payload(codec.encode("access", "level", 2, 7, 0, user_id=42))
+
+    with pytest.raises(InvalidCallbackData):
+        codec.decode(f"access:confirm:{token}", user_id=42)
+
+
+def test_rejects_tampered_and_malformed_tokens(codec):
+    data = codec.encode("access", "confirm", 2, 7, 3, user_id=42)
+    tampered = data[:-1] + ("A" if data[-1] != "A" else "B")
+
+    for bad in (tampered, "access:confirm:", "access:confirm:!!!!", "access:confirm:AAAA", "noop"):
+        with pytest.raises(InvalidCallbackData):
+            codec.decode(bad, user_id=42)
+
+
+def test_rejects_expired_tokens(codec, clock):
+    data = codec.encode("attend", "event", 5, user_id=42)
+
+    clock.now += 3600
+    assert codec.decode(data, user_id=42) == (5,)
+
+    clock.now += 120
+    with pytest.raises(InvalidCallbackData):
+        codec.decode(data, user_id=42)
+
+
+def test_tokens_of_another_secret_are_rejected(codec, clock):
+    other = CallbackCodec(b"other secret", clock=clock)
+
+    with pytest.raises(InvalidCallbackData):
+        codec.decode(other.encode("attend", "event", 5, user_id=42), user_id=42)
+
+
+def test_requires_a_secret():
+    with pytest.raises(ValueError):
+        CallbackCodec(b"")
+
+
+def test_refuses_data_longer_than_telegram_allows(codec):
+    with pytest.raises(ValueError):
+        codec.encode("a" * 40, "verb", *range(2 ** 60, 2 ** 60 + 4), user_id=42)
@@ -0,0 +1,72 @@
+import pickle
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+from command_handlers.conversations.attendance_conversation import MarkAttendanceConversation
+from command_handlers.conversations.get_team_attendance_conversation import GetTeamAttendanceConversation
+from command_handlers.conversations.manage_event_conversation import ManageEventConversation
+from models.enums import AccessCategory
+from models.models import Event
+from services.event_registry import EventRegistry
+
+
+def make_event(event_id: int) -> Event:
+    start = datetime(2025, 10, 11, 13, 30)
+    return Event(
+        id=event_id,
+        title="Field Training",
+        description="Bring discs " * 20,
+        start=start,
+        end=start + timedelta(hours=2),
+        is_accountable=True,
+        access_category=AccessCategory.MEMBER,
+    )
+
+
+def test_least_recently_used_events_are_evicted():
+    registry = EventRegistry(max_entries=2)
+    registry.put_many([make_event(1), make_event(2)])
+
+    registry.get(1)
+    registry.put(make_event(3))
+
+    assert 1 in registry and 3 in registry
+    assert 2 not in registry
+    assert registry.get_many([1, 2, 3]) == [make_event(1), make_event(3)]
+
+
+def test_saved_event_replaces_previous_version():
+    registry = EventRegistry()
+    registry.put(make_event(1))
+
+    updated = make_event(1)
+    updated.title = "Scrim"
+    registry.put(updated)
+
+    assert len(registry) == 1
+    assert registry.get(1) is updated
+
+
+def test_per_user_state_holds_ids_instead_of_events():
+    registry = EventRegistry()
+    events = [make_event(event_id) for event_id in range(10)]
+
+    users_with_copies = [{"upcoming_events": [event.model_copy() for event in events]} for _ in range(100)]
+    users_with_ids = [{"upcoming_event_ids": registry.put_many(events)} for _ in range(100)]
+
+    copied_bytes = sum(len(pickle.dumps(user_data)) for user_data in users_with_copies)
+    id_bytes = sum(len(pickle.dumps(user_data)) for user_data in users_with_ids)
+
+    assert len(registry) == 10
+    assert id_bytes * 20 < copied_bytes
+
+
+def test_conversations_share_a_registry_that_is_still_empty():
+    registry = EventRegistry()
+    conversations = [
+        MarkAttendanceConversation(controller=AsyncMock(), registry=registry),
+        GetTeamAttendanceConversation(controller=AsyncMock(), registry=registry),
+        ManageEventConversation(controller=AsyncMock(), registry=registry),
+    ]
+
+    assert all(conversation.registry is registry for conversation in conversations)
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram import Bot
+from telegram.error import BadRequest
+
+from controllers.team_attendance_controller import TeamAttendanceControlling
+from models.enums import AccessCategory
+from models.models import Event
+from models.responses.responses import AttendanceResponse, UserAttendance, UserAttendanceResponse
+from services.event_registry import EventRegistry
+from services.live_attendance import LiveAttendanceBoard, LiveMessageStore
+
+CHAT_ID = -100
+
+
+def make_event(event_id: int = 1) -> Event:
+    start = datetime.now() + timedelta(days=1)
+    return Event(
+        id=event_id,
+        title="Field Training",
+        start=start,
+        end=start + timedelta(hours=2),
+        is_accountable=True,
+        access_category=AccessCategory.MEMBER,
+    )
+
+
+def make_attendance(names) -> UserAttendanceResponse:
+    attending = [
+        UserAttendance(
+            name=name,
+            telegram_user=name.lower(),
+            gender="M",
+            access=AccessCategory.MEMBER,
+            attendance=AttendanceResponse(status=True, reason=None),
+        )
+        for name in names
+    ]
+    return UserAttendanceResponse(male=attending, female=[], absent=[], unindicated=[])
+
+
+def render(event: Event, attendance: UserAttendanceResponse, timestamp: Optional[str]) -> Tuple[str, None]:
+    names = ", ".join(user.name for user in attendance.male)
+    return f"{event.title}: {names} ({'now' if timestamp is None else timestamp})", None
+
+
+@pytest.fixture
+def bot() -> MagicMock:
+    bot = MagicMock(spec=Bot)
+    bot.rate_limiter = None
+    bot.edit_message_text = AsyncMock()
+    bot.pin_chat_message = AsyncMock()
+    return bot
+
+
+@pytest.fixture
+def controller() -> AsyncMock:
+    controller = AsyncMock(spec=TeamAttendanceControlling)
+    controller.retrieve_team_attendance.return_value = make_attendance(["Aaron"])
+    return controller
+
+
+@pytest.fixture
+def board(bot, controller, tmp_path) -> LiveAttendanceBoard:
+    return LiveAttendanceBoard(
+        bot=bot,
+        controller=controller,
+        registry=EventRegistry(),
+        render=render,
+        store=LiveMessageStore(tmp_path / "live.json"),
+        debounce=0.01,
+    )
+
+
+@pytest.mark.asyncio
+async def test_changes_within_the_debounce_are_coalesced(board, bot, controller):
+    event = make_event()
+    await board.track(event, chat_id=CHAT_ID, message_id=7, pin=True)
+    for _ in range(50):
+        board.attendance_changed(event.id)
+    await board.wait()
+
+    assert controller.retrieve_team_attendance.await_count == 1
+    assert bot.edit_message_text.await_count == 1
+    assert bot.edit_message_text.await_args.kwargs["text"] == "Field Training: Aaron (now)"
+    bot.pin_chat_message.assert_awaited_once_with(chat_id=CHAT_ID, message_id=7, disable_notification=True)
+    assert board.stats()["coalesced"] == 50
+
+
+@pytest.mark.asyncio
+async def test_unchanged_attendance_is_not_edited(board, bot, controller):
+    event = make_event()
+    await board.track(event, chat_id=CHAT_ID, message_id=7)
+    await board.wait()
+
+    board.attendance_changed(event.id)
+    await board.wait()
+    assert bot.edit_message_text.await_count == 1
+    assert board.stats()["unchanged"] == 1
+
+    controller.retrieve_team_attendance.return_value = make_attendance(["Aaron", "Ben"])
+    board.attendance_changed(event.id)
+    await board.wait()
+    assert bot.edit_message_text.await_count == 2
+    assert bot.edit_message_text.await_args.kwargs["text"] == "Field Training: Aaron, Ben (now)"
+
+
+@pytest.mark.asyncio
+async def test_deleted_message_stops_updating(board, bot):
+    bot.edit_message_text.side_effect = BadRequest("Message to edit not found")
+    event = make_event()
+    await board.track(event, chat_id=CHAT_ID, message_id=7)
+    await board.wait()
+
+    board.attendance_changed(event.id)
+    await board.wait()
+
+    assert bot.edit_message_text.await_count == 1
+    assert board.stats()["messages"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tracked_messages_survive_a_restart(board, bot, controller, tmp_path):
+    event = make_event()
+    await board.track(event, chat_id=CHAT_ID, message_id=7)
+    await board.wait()
+    await board.aclose()
+
+    restarted_bot = MagicMock(spec=Bot)
+    restarted_bot.rate_limiter = None
+    restarted_bot.edit_message_text = AsyncMock()
+    restarted = LiveAttendanceBoard(
+        bot=restarted_bot,
+        controller=controller,
+        registry=EventRegistry(),
+        render=render,
+        store=LiveMessageStore(tmp_path / "live.json"),
+        debounce=0.01,
+    )
+    await restarted.resume()
+
+    controller.retrieve_team_attendance.return_value = make_attendance(["Aaron", "Ben"])
+    restarted.attendance_changed(event.id)
+    await restarted.wait()
+
+    assert restarted_bot.edit_message_text.await_args.kwargs["message_id"] == 7
+
+
+@pytest.mark.asyncio
+async def test_ended_event_is_dropped(board, bot, controller):
+    event = make_event()
+    event.start = datetime.now() - timedelta(hours=3)
+    event.end = datetime.now() - timedelta(hours=1)
+    await board.track(event, chat_id=CHAT_ID, message_id=7)
+    await board.wait()
+
+    controller.retrieve_team_attendance.assert_not_awaited()
+    assert board.stats()["messages"] == 0
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import pytest
+from pydantic import ValidationError
+
+from models.enums import AccessCategory
+from models.models import Attendance, Event
+from models.responses import AttendanceResponse, EventAttendance, UserAttendance, UserAttendanceResponse
+from services.payload_decoder import (
+    OrjsonCodec,
+    PayloadDecoder,
+    StdlibJsonCodec,
+    default_json_codec,
+    type_adapter,
+)
+
+
+def make_roster() -> UserAttendanceResponse:
+    def member(name: str, status: Optional[bool], reason: Optional[str] = None) -> UserAttendance:
+        return UserAttendance(
+            name=name,
+            telegram_user=name.lower(),
+            gender="M",
+            access=AccessCategory.MEMBER,
+            attendance=AttendanceResponse(status=status, reason=reason),
+        )
+
+    return UserAttendanceResponse(
+        male=[member("Aaron", True, "Late 2pm")],
+        female=[],
+        absent=[member("Ben", False, "Work")],
+        unindicated=[member("Carl", None)],
+    )
+
+
+def make_event_attendance() -> EventAttendance:
+    start = datetime(2025, 10, 11, 13, 30)
+    return EventAttendance(
+        event=Event(
+            id=7,
+            title="Field Training",
+            start=start,
+            end=start + timedelta(hours=2),
+            attendance_deadline=start - timedelta(days=1),
+            is_accountable=True,
+            access_category=AccessCategory.MEMBER,
+        ),
+        attendance=Attendance(event_id=7, user_id=1, status=True, reason="late"),
+    )
+
+
+@pytest.fixture
+def decoder() -> PayloadDecoder:
+    return PayloadDecoder()
+
+
+def test_decodes_a_roster_from_bytes(decoder):
+    roster = make_roster()
+
+    decoded = decoder.decode(roster.model_dump_json().encode(), UserAttendanceResponse)
+
+    assert decoded == roster
+    assert decoded.absent[0].access is AccessCategory.MEMBER
+
+
+def test_decodes_lists_of_nested_models_with_datetimes(decoder):
+    items = [make_event_attendance()]
+    body = type_adapter(List[EventAttendance]).dump_json(items)
+
+    decoded = decoder.decode(body, List[EventAttendance])
+
+    assert decoded == items
+    assert isinstance(decoded[0].event.start, datetime)
+
+
+def test_malformed_payloads_are_rejected(decoder):
+    with pytest.raises(ValidationError):
+        decoder.decode(b'{"status":"maybe","reason":null}', AttendanceResponse)
+
+
+def test_adapters_are_built_once():
+    assert type_adapter(List[EventAttendance]) is type_adapter(List[EventAttendance])
+
+
+@pytest.mark.parametrize("codec", [StdlibJsonCodec(), default_json_codec()], ids=["stdlib", "default"])
+def test_codecs_round_trip(codec):
+    payload = [{"event_id": 7, "user_id": 1, "status": None, "reason": "Late, 2pm"}]
+
+    assert codec.loads(codec.dumps(payload)) == payload
+    assert PayloadDecoder(codec=codec).codec is codec
+
+
+def test_default_codec_prefers_orjson():
+    pytest.importorskip("orjson")
+
+    assert isinstance(default_json_codec(), OrjsonCodec)
@@ -0,0 +1,25 @@
+from services.render_cache import RenderCache
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = RenderCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert len(cache) == 2
+
+
+def test_get_or_render_renders_once():
+    cache = RenderCache()
+    rendered = []
+
+    for _ in range(3):
+        assert cache.get_or_render(("line", 1), lambda: rendered.append(1) or "Aaron") == "Aaron"
+
+    assert rendered == [1]
+    assert cache.stats() == {"entries": 1, "hits": 2, "misses": 1}